@@ -0,0 +1 @@
+"""Micro benchmarks of the hot paths of the application."""
@@ -0,0 +1,106 @@
+"""Benchmark of the HTTP API, without PostgreSQL or Redis.
+
+The application runs with the in-memory repositories and cache
+(`DB_BACKEND=memory`, `CACHE_BACKEND=memory`) and is driven in process through
+`httpx.ASGITransport`, so the numbers cover the routers, the service layer,
+validation and serialization, and can be compared between commits offline.
+
+Login verifies a bcrypt hash on the hashing pool, so it runs far fewer iterations.
+
+Usage:
+    python -m benchmarks.bench_api [--iterations N] [--users N]
+
+"""
+
+import argparse
+import asyncio
+import itertools
+import os
+
+from benchmarks.utils import Result, ameasure
+
+os.environ.setdefault("DB_BACKEND", "memory")
+os.environ.setdefault("CACHE_BACKEND", "memory")
+os.environ.setdefault("PG_DSN", "postgresql+asyncpg://bench@localhost/bench")
+os.environ.setdefault("SECRET_KEY", "bench-secret")
+os.environ.setdefault("ALGORITHM", "HS256")
+
+PASSWORD = "password"
+LOGIN_ITERATIONS = 20
+
+
+def new_user(number: int, hashed_password: str) -> dict:
+    """Build the body of a user creation request."""
+    return {
+        "name": "Bench",
+        "email": f"bench{number}@test.com",
+        "username": f"bench{number}",
+        "hashed_password": hashed_password,
+    }
+
+
+async def run(iterations: int, users: int) -> list[Result]:
+    """Seed the in-memory backends and measure every endpoint.
+
+    Args:
+        iterations (int): The number of measured requests per endpoint.
+        users (int): The number of users created before measuring.
+
+    Returns:
+        list[Result]: The results, one per endpoint.
+    """
+    import httpx
+
+    from src.main import app
+    from src.utils.hasher import Hasher
+
+    hashed_password = Hasher.get_password_hash(PASSWORD)
+    numbers = itertools.count()
+    results = []
+
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+
+            async def request(method: str, url: str, **kwargs: object) -> httpx.Response:
+                response = await client.request(method, url, **kwargs)
+                if response.status_code != 200:
+                    raise RuntimeError(f"{method} {url} > {response.status_code} {response.text}")
+                return response
+
+            async def create() -> httpx.Response:
+                return await request("POST", "/users", json=new_user(next(numbers), hashed_password))
+
+            seeded = [(await create()).json() for _ in range(users + iterations)]
+            user_id = seeded[0]["user_id"]
+            doomed = iter(seeded[users:])
+            login = {"username": seeded[0]["username"], "password": PASSWORD}
+            tokens = (await request("POST", "/auth/login", data=login)).json()
+
+            cases = [
+                ("create", create, iterations),
+                ("get", lambda: request("GET", f"/users/{user_id}/"), iterations),
+                ("list", lambda: request("GET", "/users", params={"limit": 50}), iterations),
+                ("update", lambda: request("PATCH", f"/users/{user_id}/", json={"name": "Updated"}), iterations),
+                ("delete", lambda: request("DELETE", f"/users/{next(doomed)['user_id']}/"), iterations),
+                ("login", lambda: request("POST", "/auth/login", data=login), min(iterations, LOGIN_ITERATIONS)),
+                ("refresh", lambda: request("POST", "/auth/refresh", json=tokens), iterations),
+            ]
+            for name, call, count in cases:
+                results.append(await ameasure(name, call, count, warmup=0))
+    Hasher.shutdown_pool()
+    return results
+
+
+def main() -> None:
+    """Parse the arguments, run the benchmark and print one line per endpoint."""
+    parser = argparse.ArgumentParser(description="Benchmark the HTTP API on the in-memory backends.")
+    parser.add_argument("--iterations", type=int, default=1_000)
+    parser.add_argument("--users", type=int, default=1_000)
+    args = parser.parse_args()
+    for result in asyncio.run(run(args.iterations, args.users)):
+        print(result)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+"""Benchmark of token issuance and verification.
+
+Compares `get_tokens` and `jwt_decode` with the python-jose and PyJWT backends,
+with and without the verified tokens cache.
+
+Usage:
+    SECRET_KEY=... ALGORITHM=HS256 python -m benchmarks.bench_jwt [--iterations N]
+
+"""
+
+import argparse
+import time
+
+from benchmarks.utils import measure
+from settings import settings
+from src.utils import jwt
+from src.utils.jwt import TokenEngine, get_tokens, jwt_decode
+
+
+def main() -> None:
+    """Run the benchmark and print one line per case."""
+    parser = argparse.ArgumentParser(description="Benchmark JWT issuance and verification.")
+    parser.add_argument("--iterations", type=int, default=10_000)
+    args = parser.parse_args()
+
+    backends = ["jose"] + (["pyjwt"] if jwt.pyjwt is not None else [])
+    for backend in backends:
+        for cache_size in (0, settings.auth.jwt_cache_size):
+            jwt._token_engine = TokenEngine(
+                settings.auth.secret_key,
+                settings.auth.algorithm,
+                backend=backend,
+                cache_size=cache_size,
+            )
+            token = jwt.jwt_encode({"sub": "bench", "exp": int(time.time()) + 3600})
+            label = f"{backend}, cache {'on' if cache_size else 'off'}"
+            if not cache_size:
+                print(measure(f"get_tokens ({backend})", lambda: get_tokens("bench"), args.iterations))
+            print(measure(f"jwt_decode ({label})", lambda: jwt_decode(token), args.iterations))
+
+
+if __name__ == "__main__":
+    main()
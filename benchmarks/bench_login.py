@@ -0,0 +1,46 @@
+"""Benchmark of the login lookup.
+
+Compares the ORM lookup (`find_one` validated into `SAuthUser`) with the
+asyncpg lookup (`find_auth_record` into `SAuthUser` without validation).
+Needs a database with a user named `--username`.
+
+Usage:
+    python -m benchmarks.bench_login --username misha [--iterations N]
+
+"""
+
+import argparse
+import asyncio
+
+from benchmarks.utils import ameasure
+from src.database import engine
+from src.repositories.users import UsersRepository
+from src.schemas.users import SAuthUser
+
+
+async def run(username: str, iterations: int) -> None:
+    """Run the benchmark and print one line per case."""
+    repo = UsersRepository()
+
+    async def orm() -> SAuthUser:
+        return SAuthUser.model_validate(await repo.find_one({"username": username}))
+
+    async def raw() -> SAuthUser:
+        return SAuthUser.model_construct(**(await repo.find_auth_record(username)).as_dict())
+
+    print(await ameasure("login lookup (orm)", orm, iterations))
+    print(await ameasure("login lookup (asyncpg)", raw, iterations))
+    await engine.dispose()
+
+
+def main() -> None:
+    """Parse the arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(description="Benchmark the login lookup.")
+    parser.add_argument("--username", required=True)
+    parser.add_argument("--iterations", type=int, default=2_000)
+    args = parser.parse_args()
+    asyncio.run(run(args.username, args.iterations))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,28 @@
+"""Benchmark of the metrics recording overhead.
+
+Usage:
+    python -m benchmarks.bench_metrics [--iterations N]
+
+"""
+
+import argparse
+
+from benchmarks.utils import measure
+from src.metrics import Counter, Histogram
+
+
+def main() -> None:
+    """Run the benchmark and print one line per case."""
+    parser = argparse.ArgumentParser(description="Benchmark metrics recording.")
+    parser.add_argument("--iterations", type=int, default=100_000)
+    args = parser.parse_args()
+
+    histogram = Histogram("bench_seconds", "Benchmark.", ("method", "route", "status"))
+    counter = Counter("bench_total", "Benchmark.", ("result",))
+    labels = ("GET", "/users", "200")
+    print(measure("histogram observe", lambda: histogram.labels(*labels).observe(0.004), args.iterations))
+    print(measure("counter inc", lambda: counter.labels("hit").inc(), args.iterations))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""Benchmark of the serialization of user pages.
+
+Compares the FastAPI response pipeline (validation into `SUserPage` from the
+attributes of the instances, then the stdlib JSON encoder) with the trusted
+construction of the users router encoded by `ORJSONResponse`.
+
+Usage:
+    python -m benchmarks.bench_serialization [--iterations N]
+
+"""
+
+import argparse
+import json
+import uuid
+
+from fastapi.responses import ORJSONResponse
+from pydantic import TypeAdapter
+
+from benchmarks.utils import measure
+from src.models.users import Role, UserOrm
+from src.schemas.users import SUser, SUserPage
+from src.utils.responses import trusted_many
+
+
+def make_users(count: int) -> list[UserOrm]:
+    """Build detached user instances, as loaded from the database."""
+    return [
+        UserOrm(user_id=uuid.uuid4(), name="Misha", email=f"user{i}@test.com", username=f"user{i}", role=Role.USER)
+        for i in range(count)
+    ]
+
+
+def main() -> None:
+    """Run the benchmark and print one line per case."""
+    parser = argparse.ArgumentParser(description="Benchmark the serialization of user pages.")
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+
+    adapter = TypeAdapter(SUserPage)
+
+    for count in (1, 100, 10_000):
+        users = make_users(count)
+        iterations = max(10, args.iterations * 100 // max(count, 100))
+
+        def validated() -> bytes:
+            page = adapter.validate_python({"items": users, "next_cursor": None}, from_attributes=True)
+            return json.dumps(adapter.dump_python(page, mode="json")).encode()
+
+        def trusted() -> bytes:
+            return ORJSONResponse({"items": trusted_many(SUser, users), "next_cursor": None}).body
+
+        print(measure(f"page of {count} users (validated)", validated, iterations, warmup=2))
+        print(measure(f"page of {count} users (trusted)", trusted, iterations, warmup=2))
+
+
+if __name__ == "__main__":
+    main()
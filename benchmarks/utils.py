@@ -0,0 +1,96 @@
+"""Helpers shared by the benchmarks.
+
+Every benchmark measures a callable over a fixed number of iterations after a
+warm-up and reports its throughput together with the median and tail latency.
+
+"""
+
+import statistics
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+
+
+@dataclass
+class Result:
+    """The outcome of a benchmark.
+
+    Attributes:
+        name (str): The name of the benchmark.
+        iterations (int): The number of measured calls.
+        ops_per_sec (float): The number of calls per second.
+        p50_us (float): The median latency in microseconds.
+        p99_us (float): The 99th percentile latency in microseconds.
+    """
+
+    name: str
+    iterations: int
+    ops_per_sec: float
+    p50_us: float
+    p99_us: float
+
+    def __str__(self: "Result") -> str:
+        """Format the result as one aligned report line."""
+        return (
+            f"{self.name:<40} {self.ops_per_sec:>12,.0f} ops/s"
+            f"   p50 {self.p50_us:>9.1f} us   p99 {self.p99_us:>9.1f} us"
+        )
+
+
+def _result(name: str, timings: list[float], elapsed: float) -> Result:
+    """Summarize the timings of the calls in seconds."""
+    percentiles = statistics.quantiles(timings, n=100)
+    return Result(name, len(timings), len(timings) / elapsed, percentiles[49] * 1e6, percentiles[98] * 1e6)
+
+
+def measure(name: str, func: Callable[[], object], iterations: int = 10_000, warmup: int = 100) -> Result:
+    """Measure a synchronous callable.
+
+    Args:
+        name (str): The name of the benchmark.
+        func (Callable[[], object]): The callable to measure.
+        iterations (int): The number of measured calls.
+        warmup (int): The number of calls made before measuring.
+
+    Returns:
+        Result: The throughput and latency of the callable.
+    """
+    for _ in range(warmup):
+        func()
+    timings = []
+    clock = time.perf_counter
+    started = clock()
+    for _ in range(iterations):
+        start = clock()
+        func()
+        timings.append(clock() - start)
+    return _result(name, timings, clock() - started)
+
+
+async def ameasure(
+    name: str,
+    func: Callable[[], Awaitable[object]],
+    iterations: int = 1_000,
+    warmup: int = 10,
+) -> Result:
+    """Measure an asynchronous callable, awaiting one call at a time.
+
+    Args:
+        name (str): The name of the benchmark.
+        func (Callable[[], Awaitable[object]]): The callable to measure.
+        iterations (int): The number of measured calls.
+        warmup (int): The number of calls made before measuring.
+
+    Returns:
+        Result: The throughput and latency of the callable.
+    """
+    for _ in range(warmup):
+        await func()
+    timings = []
+    clock = time.perf_counter
+    started = clock()
+    for _ in range(iterations):
+        start = clock()
+        await func()
+        timings.append(clock() - start)
+    return _result(name, timings, clock() - started)
@@ -1,20 +1,196 @@
-"""Provides a logger object with the specified name.
+"""Provides the logging setup of the application and logger objects.
+
+Logging is configured once, from `logger.json`, the first time a logger is
+requested. The root logger only holds a `StructuredQueueHandler`: a call to a
+logger merges the message with its arguments and enqueues the record, and a
+`QueueListener` thread writes it to the console and to the rotating file, so
+no file I/O happens on the event loop.
+
+The rotating file receives one JSON object per line, formatted by
+`JsonFormatter`. Levels are set per logger in `logger.json` and can be
+overridden with `LOG_LEVELS`. DEBUG records are sampled by `DebugSampler`.
 
 Module:
     logger
 
 Attributes:
-    name (str): The name of the logger.
+    STANDARD_ATTRIBUTES (frozenset[str]): The attributes every log record has, the others come from `extra`.
 """
 
+import atexit
 import json
 import logging
 import logging.config
+import logging.handlers
 import os
+import threading
+from collections import Counter
+
+import orjson
+
+from settings import settings
+
+STANDARD_ATTRIBUTES = frozenset(
+    [*logging.LogRecord("", logging.NOTSET, "", 0, "", (), None).__dict__, "message", "asctime", "sampled"]
+)
+
+_configured = False
+_listeners: list[logging.handlers.QueueListener] = []
+_lock = threading.Lock()
+
+
+class JsonFormatter(logging.Formatter):
+    """Format a record as a JSON object, with its `extra` attributes as fields."""
+
+    def format(self: "JsonFormatter", record: logging.LogRecord) -> str:
+        """Format a record.
+
+        Args:
+            record (logging.LogRecord): The record.
+
+        Returns:
+            str: The record as a JSON object on one line.
+        """
+        entry = {
+            "time": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "function": record.funcName,
+            "line": record.lineno,
+            "message": record.getMessage(),
+        }
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        if sampled := getattr(record, "sampled", None):
+            entry["sampled"] = sampled
+        for key, value in record.__dict__.items():
+            if key not in STANDARD_ATTRIBUTES:
+                entry[key] = value
+        return orjson.dumps(entry, default=str).decode()
+
+    def formatTime(self: "JsonFormatter", record: logging.LogRecord, datefmt: str | None = None) -> str:  # noqa: N802
+        """Format the creation time of a record in ISO 8601, with milliseconds."""
+        return f"{super().formatTime(record, datefmt or '%Y-%m-%dT%H:%M:%S')}.{int(record.msecs):03d}"
+
+
+class DebugSampler(logging.Filter):
+    """
+    Keep one DEBUG record out of `every` per call site.
+
+    The first record of a call site is always kept. Kept records carry the
+    sampling factor in their `sampled` attribute, so volumes can be estimated
+    from the logs. Records above DEBUG are never dropped.
+    """
+
+    def __init__(self: "DebugSampler", every: int = 1) -> None:
+        """Initialize a new instance of the `DebugSampler` class.
+
+        Args:
+            every (int): The sampling factor. 1 keeps every record.
+        """
+        super().__init__()
+        self.every = max(1, every)
+        self.counts: Counter = Counter()
+
+    def filter(self: "DebugSampler", record: logging.LogRecord) -> bool:
+        """Tell whether a record is kept.
+
+        Args:
+            record (logging.LogRecord): The record.
+
+        Returns:
+            bool: True if the record is kept.
+        """
+        if record.levelno > logging.DEBUG or self.every == 1:
+            return True
+        site = (record.name, record.lineno)
+        count = self.counts[site]
+        self.counts[site] = count + 1
+        if count % self.every:
+            return False
+        record.sampled = self.every
+        return True
+
+
+class StructuredQueueHandler(logging.handlers.QueueHandler):
+    """
+    A queue handler keeping the exception of a record apart from its message.
+
+    `QueueHandler` appends the traceback to the message; this handler keeps it
+    in `exc_text`, where the formatters of the listener find it.
+    """
+
+    def prepare(self: "StructuredQueueHandler", record: logging.LogRecord) -> logging.LogRecord:
+        """Make a record safe to hand over to the listener thread.
+
+        Args:
+            record (logging.LogRecord): The record.
+
+        Returns:
+            logging.LogRecord: A copy of the record, its message merged with its arguments.
+        """
+        record = logging.makeLogRecord(record.__dict__)
+        record.msg = record.message = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = record.exc_text or logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+def _parse_levels(levels: str) -> dict[str, str]:
+    """Parse `name=LEVEL` pairs separated by commas, `root` naming the root logger."""
+    pairs = (pair.split("=", 1) for pair in levels.split(",") if pair.strip())
+    return {("" if name.strip() == "root" else name.strip()): level.strip().upper() for name, level in pairs}
+
+
+def setup_logging(config: dict | None = None) -> list[logging.handlers.QueueListener]:
+    """Configure logging and start the queue listeners, once.
+
+    Args:
+        config (dict | None): The `dictConfig` configuration, by default read from `settings.log.log_config`.
+
+    Returns:
+        list[logging.handlers.QueueListener]: The listeners writing the records of the queue handlers.
+    """
+    global _configured
+    with _lock:
+        if _configured:
+            return _listeners
+        if config is None:
+            with open(settings.log.log_config) as f:
+                config = json.load(f)
+        if "debug_sampling" in config.get("filters", {}):
+            config["filters"]["debug_sampling"]["every"] = settings.log.log_debug_sample
+        for name, level in _parse_levels(settings.log.log_levels).items():
+            config.setdefault("loggers", {}).setdefault(name, {})["level"] = level
+        logging.config.dictConfig(config)
+        _configured = True
+
+        for name in config.get("handlers", {}):
+            handler = logging.getHandlerByName(name)
+            if isinstance(handler, logging.handlers.QueueHandler) and handler.listener is not None:
+                handler.listener.start()
+                _listeners.append(handler.listener)
+        return _listeners
+
+
+def shutdown_logging() -> None:
+    """Stop the queue listeners once the queued records are written, so logging can be set up again."""
+    global _configured
+    with _lock:
+        while _listeners:
+            _listeners.pop().stop()
+        _configured = False
+
+
+atexit.register(shutdown_logging)
 
 
 def get_logger(name: str) -> logging.Logger:
-    """Return a logger object with the specified name.
+    """Return a logger object with the specified name, setting logging up on the first call.
 
     Args:
         name (str): The name of the logger.
@@ -28,8 +204,5 @@ def get_logger(name: str) -> logging.Logger:
     if not os.path.exists("log"):
         raise FileNotFoundError("Log directory 'log' does not exist. Please create it before using get_logger.")
 
-    with open("logger.json") as f:
-        config = json.load(f)
-        config["loggers"][name] = config["loggers"]
-    logging.config.dictConfig(config)
+    setup_logging()
     return logging.getLogger(name)
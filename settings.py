@@ -9,7 +9,12 @@ and are typically loaded from environment variables.
 Attributes:
     AuthSettings (class): Settings for authentication.
     DBSettings (class): Settings for database connection.
+    CacheSettings (class): Settings for the application caches.
+    HasherSettings (class): Settings for the password hashing pool.
     SmtpSettings (class): Settings for email credentials.
+    OutboxSettings (class): Settings for the outbox delivery worker.
+    LogSettings (class): Settings for logging.
+    ProfileSettings (class): Settings for the request profiler.
 
 """
 
@@ -37,6 +42,14 @@ class AuthSettings(SettingsConfig):
         algorithm (str): The algorithm used to sign and verify JWTs.
         access_token_expires_minutes (int): The number of minutes an access token is valid.
         refresh_token_expires_minutes (int): The number of minutes a refresh token is valid.
+        jwt_backend (str): The JWT library, `jose`, `pyjwt`, or `auto` to prefer PyJWT when it is installed.
+        jwt_cache_size (int): The number of recently verified tokens kept with their claims. 0 disables the cache.
+        jwt_cache_ttl (float): The upper bound in seconds a verified token stays cached, below its `exp`.
+        jwt_keys_file (str | None): The manifest of the asymmetric signing keys. When unset, tokens are
+            signed with `secret_key` and `algorithm`.
+        jwks_max_age (int): Seconds clients may cache the published key set.
+        jwt_keys_reload_interval (float): The minimum number of seconds between two checks of the key manifest
+            for changes.
 
     """
 
@@ -44,6 +57,12 @@ class AuthSettings(SettingsConfig):
     algorithm: str = Field("", json_schema_extra={"env": "ALGORITHM"})
     access_token_expires_minutes: int = Field(2, json_schema_extra={"env": "ACCESS_TOKEN_EXPIRES_MINUTES"})
     refresh_token_expires_minutes: int = Field(8, json_schema_extra={"env": "REFRESH_TOKEN_EXPIRES_MINUTES"})
+    jwt_backend: str = Field("auto", json_schema_extra={"env": "JWT_BACKEND"})
+    jwt_cache_size: int = Field(1024, json_schema_extra={"env": "JWT_CACHE_SIZE"})
+    jwt_cache_ttl: float = Field(60.0, json_schema_extra={"env": "JWT_CACHE_TTL"})
+    jwt_keys_file: str | None = Field(None, json_schema_extra={"env": "JWT_KEYS_FILE"})
+    jwks_max_age: int = Field(300, json_schema_extra={"env": "JWKS_MAX_AGE"})
+    jwt_keys_reload_interval: float = Field(5.0, json_schema_extra={"env": "JWT_KEYS_RELOAD_INTERVAL"})
 
 
 class DBSettings(SettingsConfig):
@@ -52,11 +71,35 @@ class DBSettings(SettingsConfig):
     Attributes:
         db_url (str): The URL of the database.
         pg_dsn (str): The PostgreSQL dsn (Data Source Name).
+        db_pool_size (int): The number of connections kept open in the pool.
+        db_max_overflow (int): The number of connections opened beyond the pool size under load.
+        db_pool_timeout (float): Seconds to wait for a free connection before giving up.
+        db_pool_recycle (int): Seconds after which a connection is replaced, or -1 to keep connections forever.
+        db_pool_pre_ping (bool): Whether to check that a connection is alive before handing it out.
+        db_statement_cache_size (int): The number of prepared statements asyncpg keeps per connection.
+        db_prepared_statement_cache_size (int): The number of prepared statements SQLAlchemy keeps per connection.
+        db_warmup_connections (int): The number of connections opened and primed on startup.
+        db_backend (str): The storage of the repositories, `postgres`, or `memory` to keep
+            the rows in the process for tests and benchmarks.
+        db_slow_query_ms (float): Statements taking at least this many milliseconds are logged.
+        db_repeated_query_threshold (int): Statements executed at least this many times within one request
+            are reported as a likely N+1 query pattern.
 
     """
 
     db_url: str = Field("", json_schema_extra={"env": "DB_URL"})
     pg_dsn: str = Field("", json_schema_extra={"env": "PG_DSN"})
+    db_pool_size: int = Field(10, json_schema_extra={"env": "DB_POOL_SIZE"})
+    db_max_overflow: int = Field(10, json_schema_extra={"env": "DB_MAX_OVERFLOW"})
+    db_pool_timeout: float = Field(10.0, json_schema_extra={"env": "DB_POOL_TIMEOUT"})
+    db_pool_recycle: int = Field(1800, json_schema_extra={"env": "DB_POOL_RECYCLE"})
+    db_pool_pre_ping: bool = Field(True, json_schema_extra={"env": "DB_POOL_PRE_PING"})
+    db_statement_cache_size: int = Field(500, json_schema_extra={"env": "DB_STATEMENT_CACHE_SIZE"})
+    db_prepared_statement_cache_size: int = Field(500, json_schema_extra={"env": "DB_PREPARED_STATEMENT_CACHE_SIZE"})
+    db_warmup_connections: int = Field(5, json_schema_extra={"env": "DB_WARMUP_CONNECTIONS"})
+    db_backend: str = Field("postgres", json_schema_extra={"env": "DB_BACKEND"})
+    db_slow_query_ms: float = Field(200.0, json_schema_extra={"env": "DB_SLOW_QUERY_MS"})
+    db_repeated_query_threshold: int = Field(5, json_schema_extra={"env": "DB_REPEATED_QUERY_THRESHOLD"})
 
 
 class RedisSettings(SettingsConfig):
@@ -64,12 +107,71 @@ class RedisSettings(SettingsConfig):
 
     Attributes:
         redis_dsn (str): The Redis dsn (Data Source Name).
+        redis_max_connections (int): The maximum number of connections in the async connection pool.
+        redis_pool_timeout (float): Seconds to wait for a free pooled connection before giving up.
+        redis_socket_timeout (float): Seconds to wait for a reply on an established connection.
+        redis_socket_connect_timeout (float): Seconds to wait while opening a new connection.
+        redis_command_timeout (float): Default upper bound in seconds for a single cache call.
+        redis_health_check_interval (int): Seconds of idleness after which a connection is pinged before use.
 
     Redis DSN has the following format:
     redis[+transport]://[[user]:[password]@]host[:port][/database][?param1=value1&...].
     """
 
     redis_dsn: str = Field("", json_schema_extra={"env": "REDIS_DSN"})
+    redis_max_connections: int = Field(50, json_schema_extra={"env": "REDIS_MAX_CONNECTIONS"})
+    redis_pool_timeout: float = Field(1.0, json_schema_extra={"env": "REDIS_POOL_TIMEOUT"})
+    redis_socket_timeout: float = Field(1.0, json_schema_extra={"env": "REDIS_SOCKET_TIMEOUT"})
+    redis_socket_connect_timeout: float = Field(1.0, json_schema_extra={"env": "REDIS_SOCKET_CONNECT_TIMEOUT"})
+    redis_command_timeout: float = Field(0.5, json_schema_extra={"env": "REDIS_COMMAND_TIMEOUT"})
+    redis_health_check_interval: int = Field(30, json_schema_extra={"env": "REDIS_HEALTH_CHECK_INTERVAL"})
+
+
+class CacheSettings(SettingsConfig):
+    """Settings for the application caches.
+
+    Attributes:
+        cache_local_maxsize (int): The maximum number of entries in the in-process cache of each worker.
+        cache_local_ttl (float): Seconds an entry lives in the in-process cache.
+        cache_user_ttl (int): Seconds a user entry lives in Redis.
+        cache_invalidation_channel (str): The Redis pub/sub channel used to evict entries in every worker.
+        cache_prefix (str): The prefix of every cache key, shared by all keys of the application.
+        cache_version (int): The version of the cached payloads. Bump it to abandon all existing entries.
+        cache_login_ttl (int): Seconds a login credentials entry lives in Redis.
+        cache_ttl_jitter (float): The fraction by which TTLs are randomly spread to avoid synchronized expiry.
+        cache_maxmemory (str | None): The Redis `maxmemory` budget applied on startup, e.g. `256mb`.
+        cache_maxmemory_policy (str): The Redis eviction policy applied together with the memory budget.
+        cache_backend (str): The shared cache tier, `redis`, or `memory` to keep it in the process
+            for tests and benchmarks.
+
+    """
+
+    cache_local_maxsize: int = Field(10_000, json_schema_extra={"env": "CACHE_LOCAL_MAXSIZE"})
+    cache_local_ttl: float = Field(30.0, json_schema_extra={"env": "CACHE_LOCAL_TTL"})
+    cache_user_ttl: int = Field(300, json_schema_extra={"env": "CACHE_USER_TTL"})
+    cache_invalidation_channel: str = Field("cache:invalidate", json_schema_extra={"env": "CACHE_INVALIDATION_CHANNEL"})
+    cache_prefix: str = Field("pss", json_schema_extra={"env": "CACHE_PREFIX"})
+    cache_version: int = Field(1, json_schema_extra={"env": "CACHE_VERSION"})
+    cache_login_ttl: int = Field(600, json_schema_extra={"env": "CACHE_LOGIN_TTL"})
+    cache_ttl_jitter: float = Field(0.1, json_schema_extra={"env": "CACHE_TTL_JITTER"})
+    cache_maxmemory: str | None = Field(None, json_schema_extra={"env": "CACHE_MAXMEMORY"})
+    cache_maxmemory_policy: str = Field("volatile-lru", json_schema_extra={"env": "CACHE_MAXMEMORY_POLICY"})
+    cache_backend: str = Field("redis", json_schema_extra={"env": "CACHE_BACKEND"})
+
+
+class HasherSettings(SettingsConfig):
+    """Settings for the password hashing process pool.
+
+    Attributes:
+        hasher_workers (int | None): The number of worker processes. Defaults to the number of CPUs.
+        hasher_max_queue (int): The number of hashing jobs allowed to wait for a free worker.
+        hasher_retry_after (int): Seconds suggested to clients in `Retry-After` when the pool is saturated.
+
+    """
+
+    hasher_workers: int | None = Field(None, json_schema_extra={"env": "HASHER_WORKERS"})
+    hasher_max_queue: int = Field(64, json_schema_extra={"env": "HASHER_MAX_QUEUE"})
+    hasher_retry_after: int = Field(1, json_schema_extra={"env": "HASHER_RETRY_AFTER"})
 
 
 class SmtpSettings(SettingsConfig):
@@ -84,12 +186,81 @@ class SmtpSettings(SettingsConfig):
         email_password (str): The password of the email account.
         email_host (str): The host of the email server.
         email_port (int): The port of the email server.
+        email_use_tls (bool): Whether to connect with implicit TLS, as on port 465.
+        email_start_tls (bool): Whether to upgrade a plain connection with STARTTLS.
+        email_timeout (float): Seconds to wait for the email server on every operation.
+        email_pool_size (int): The maximum number of open connections, which also caps concurrent sends.
     """
 
     email_user: str = Field("", json_schema_extra={"env": "EMAIL_USER"})
     email_password: str = Field("", json_schema_extra={"env": "EMAIL_PASSWORD"})
     email_host: str = Field("", json_schema_extra={"env": "EMAIL_HOST"})
     email_port: int = Field(465, json_schema_extra={"env": "EMAIL_PORT"})
+    email_use_tls: bool = Field(True, json_schema_extra={"env": "EMAIL_USE_TLS"})
+    email_start_tls: bool = Field(False, json_schema_extra={"env": "EMAIL_START_TLS"})
+    email_timeout: float = Field(10.0, json_schema_extra={"env": "EMAIL_TIMEOUT"})
+    email_pool_size: int = Field(4, json_schema_extra={"env": "EMAIL_POOL_SIZE"})
+
+
+class OutboxSettings(SettingsConfig):
+    """Settings for the outbox delivery worker.
+
+    Attributes:
+        outbox_batch_size (int): The maximum number of messages claimed per poll.
+        outbox_max_attempts (int): The number of failed attempts after which a message is dead-lettered.
+        outbox_base_delay (float): Seconds before the first retry. The delay doubles with every attempt.
+        outbox_max_delay (float): The upper bound in seconds of the delay between two attempts.
+        outbox_poll_interval (float): Seconds to wait before polling again when the outbox is drained.
+        outbox_lease (float): Seconds a claimed message stays invisible to other workers.
+
+    """
+
+    outbox_batch_size: int = Field(100, json_schema_extra={"env": "OUTBOX_BATCH_SIZE"})
+    outbox_max_attempts: int = Field(8, json_schema_extra={"env": "OUTBOX_MAX_ATTEMPTS"})
+    outbox_base_delay: float = Field(5.0, json_schema_extra={"env": "OUTBOX_BASE_DELAY"})
+    outbox_max_delay: float = Field(3600.0, json_schema_extra={"env": "OUTBOX_MAX_DELAY"})
+    outbox_poll_interval: float = Field(1.0, json_schema_extra={"env": "OUTBOX_POLL_INTERVAL"})
+    outbox_lease: float = Field(300.0, json_schema_extra={"env": "OUTBOX_LEASE"})
+
+
+class LogSettings(SettingsConfig):
+    """Settings for logging.
+
+    Attributes:
+        log_config (str): The `logging.config.dictConfig` configuration file.
+        log_levels (str): Levels overriding the configuration, as `name=LEVEL` pairs separated by commas,
+            e.g. `root=WARNING,src.services.users=DEBUG`.
+        log_debug_sample (int): One DEBUG record out of this many is kept per call site. 1 keeps them all.
+
+    """
+
+    log_config: str = Field("logger.json", json_schema_extra={"env": "LOG_CONFIG"})
+    log_levels: str = Field("", json_schema_extra={"env": "LOG_LEVELS"})
+    log_debug_sample: int = Field(100, json_schema_extra={"env": "LOG_DEBUG_SAMPLE"})
+
+
+class ProfileSettings(SettingsConfig):
+    """Settings for the request profiler.
+
+    Attributes:
+        profile_enabled (bool): Whether requests can be profiled at all. When False the profiler middleware
+            is not installed.
+        profile_sample_rate (float): The fraction of requests profiled.
+        profile_routes (str): Route templates whose requests are all profiled, separated by commas,
+            e.g. `/auth/login,/users/{user_id}/`.
+        profile_interval (float): Seconds between two samples of a profiled request.
+        profile_max_stacks (int): The number of distinct stacks recorded before new ones are truncated.
+        profile_token (str): The token of `GET /debug/profile`, also profiling a request sent with it in
+            `X-Profile-Token`. When empty the endpoint answers 404.
+
+    """
+
+    profile_enabled: bool = Field(False, json_schema_extra={"env": "PROFILE_ENABLED"})
+    profile_sample_rate: float = Field(0.01, json_schema_extra={"env": "PROFILE_SAMPLE_RATE"})
+    profile_routes: str = Field("", json_schema_extra={"env": "PROFILE_ROUTES"})
+    profile_interval: float = Field(0.005, json_schema_extra={"env": "PROFILE_INTERVAL"})
+    profile_max_stacks: int = Field(10_000, json_schema_extra={"env": "PROFILE_MAX_STACKS"})
+    profile_token: str = Field("", json_schema_extra={"env": "PROFILE_TOKEN"})
 
 
 class Settings(SettingsConfig):
@@ -98,14 +269,24 @@ class Settings(SettingsConfig):
     Attributes:
         db (DBSettings): The settings for the database connection.
         redis (RedisSettings): The settings for Redis connection.
+        cache (CacheSettings): The settings for the application caches.
         auth (AuthSettings): The settings for authentication.
+        hasher (HasherSettings): The settings for the password hashing pool.
         email (SmtpSettings): The settings for email sending.
+        outbox (OutboxSettings): The settings for the outbox delivery worker.
+        log (LogSettings): The settings for logging.
+        profile (ProfileSettings): The settings for the request profiler.
     """
 
     db: DBSettings = DBSettings()
     redis: RedisSettings = RedisSettings()
+    cache: CacheSettings = CacheSettings()
     auth: AuthSettings = AuthSettings()
+    hasher: HasherSettings = HasherSettings()
     smtp: SmtpSettings = SmtpSettings()
+    outbox: OutboxSettings = OutboxSettings()
+    log: LogSettings = LogSettings()
+    profile: ProfileSettings = ProfileSettings()
 
 
 settings = Settings()
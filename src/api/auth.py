@@ -6,24 +6,29 @@ Attributes:
     router (APIRouter): The APIRouter instance for authentication.
 """
 
-import json
-
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
 from jose import ExpiredSignatureError, JWTError
 
 from logger import get_logger
-from src.api.dependencies import users_service
-from src.cache import Cache
-from src.error import InternalServerError
-from src.schemas.auth import SToken
+from src.api.dependencies import unit_of_work, users_service
+from src.api.negotiation import NegotiatedResponse, NegotiatedRoute
+from src.error import InternalServerError, NotFoundError
+from src.schemas.auth import SRefreshToken, SToken
 from src.schemas.users import SUser
 from src.services.users import UsersService
-from src.utils.jwt import get_tokens, jwt_decode
+from src.utils.jwt import REFRESH_TOKEN_TYPE, get_tokens, jwt_decode
+from src.utils.unitofwork import UnitOfWork
 
 logger = get_logger(__name__)
 
-router = APIRouter(prefix="/auth", tags=["Auth"])
+router = APIRouter(
+    prefix="/auth",
+    tags=["Auth"],
+    dependencies=[Depends(unit_of_work)],
+    route_class=NegotiatedRoute,
+    default_response_class=NegotiatedResponse,
+)
 
 
 @router.post("/login", response_model=SToken)
@@ -43,27 +48,20 @@ async def login_for_access_token(
 
     Raises:
         HTTPException: If the username or password is incorrect.
+        ServiceUnavailableError: If the password hashing pool is saturated.
 
     """
     try:
-        user_from_cache = Cache.get(form_data.username)
-        logger.debug(form_data.username, form_data.password)
-        if user_from_cache:
-            logger.debug(f"user from cache > {user_from_cache}")
-            user = SUser.model_validate(json.loads(user_from_cache))
-        else:
-            user = await users_service.get_auth_user(username=form_data.username, password=form_data.password)
-            if not user:
-                raise HTTPException(
-                    status_code=status.HTTP_401_UNAUTHORIZED,
-                    detail={
-                        "status": status.HTTP_401_UNAUTHORIZED,
-                        "detail": "Incorrect username or password",
-                    },
-                    headers={"WWW-Authenticate": "Bearer"},
-                )
-            logger.debug(f"user from db > {user}")
-            Cache.set(form_data.username, user.model_dump_json())
+        user = await users_service.get_auth_user(username=form_data.username, password=form_data.password)
+        if not user:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail={
+                    "status": status.HTTP_401_UNAUTHORIZED,
+                    "detail": "Incorrect username or password",
+                },
+                headers={"WWW-Authenticate": "Bearer"},
+            )
         return get_tokens(user.username)
     except HTTPException as e:
         logger.error(e)
@@ -74,11 +72,11 @@ async def login_for_access_token(
 
 
 @router.post("/refresh", response_model=SToken)
-async def refresh_token(refresh_token: SToken) -> SToken:
+async def refresh_token(refresh_token: SRefreshToken) -> SToken:
     """Refresh a token using a refresh token.
 
     Args:
-        refresh_token (SToken): The refresh token to be refreshed.
+        refresh_token (SRefreshToken): The refresh token to be refreshed.
 
     Returns:
         SToken: A new token with a new access and refresh token.
@@ -87,24 +85,41 @@ async def refresh_token(refresh_token: SToken) -> SToken:
         HTTPException: If the refresh token is invalid or expired.
 
     """
-    payload = jwt_decode(refresh_token)
+    invalid = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail={"status": status.HTTP_401_UNAUTHORIZED, "detail": "Invalid refresh token"},
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+    try:
+        payload = jwt_decode(refresh_token.refresh_token)
+    except JWTError as e:
+        logger.error(e)
+        raise invalid
     username = payload.get("sub")
+    if payload.get("typ") != REFRESH_TOKEN_TYPE or not isinstance(username, str) or not username:
+        logger.error("refresh rejected > not a refresh token")
+        raise invalid
 
     return get_tokens(username)
 
 
 @router.get("/verify-email/")
-async def verify_email(token: str, users_service: UsersService = Depends(users_service)) -> SUser | None:
+async def verify_email(
+    token: str,
+    users_service: UsersService = Depends(users_service),
+    uow: UnitOfWork = Depends(unit_of_work),
+) -> SUser | None:
     """Verify an email using a token.
 
     Args:
         token (str): The token to verify the email.
 
     Returns:
-        SUser or None: The verified user, or None if the token is invalid.
+        SUser: The verified user.
 
     Raises:
         HTTPException: If the token is expired.
+        NotFoundError: If no user has the email of the token.
 
     """
     try:
@@ -113,7 +128,13 @@ async def verify_email(token: str, users_service: UsersService = Depends(users_s
         if not user_email:
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid token")
         user = await users_service.update_user(filter_by={"email": user_email}, data={"email_verified": True})
+        if user is None:
+            raise NotFoundError("User not found")
+        await uow.commit()
         return user
+    except HTTPException as e:
+        logger.error(e)
+        raise e
     except ExpiredSignatureError as e:
         logger.error(e)
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Signature expired")
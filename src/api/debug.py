@@ -0,0 +1,50 @@
+"""Debug API router.
+
+This module serves the profile recorded by the sampling profiler of this
+worker, as collapsed stacks ready for flamegraph tools, e.g.
+`curl -H "X-Profile-Token: $PROFILE_TOKEN" :8000/debug/profile | flamegraph.pl > profile.svg`.
+
+Attributes:
+    router (APIRouter): The APIRouter instance for the debug endpoints.
+"""
+
+import secrets
+
+from fastapi import APIRouter, Header
+from fastapi.responses import PlainTextResponse
+
+from settings import settings
+from src.error import ForbiddenError, NotFoundError
+from src.profiler import profiler
+
+router = APIRouter(prefix="/debug", tags=["Debug"])
+
+
+@router.get("/profile", response_class=PlainTextResponse)
+async def get_profile(
+    route: str | None = None,
+    reset: bool = False,
+    token: str = Header("", alias="X-Profile-Token"),
+) -> PlainTextResponse:
+    """Get the profile of the requests sampled by this worker.
+
+    Args:
+        route (str | None): Only return the stacks of this label, e.g. `POST /auth/login`.
+        reset (bool): Forget the samples once they are returned.
+        token (str): The profile token.
+
+    Returns:
+        PlainTextResponse: One `label;frame;...;frame count` line per collapsed stack.
+
+    Raises:
+        NotFoundError: If no profile token is configured.
+        ForbiddenError: If the token is not the profile token.
+    """
+    if not settings.profile.profile_token:
+        raise NotFoundError()
+    if not secrets.compare_digest(token.encode(), settings.profile.profile_token.encode()):
+        raise ForbiddenError("Invalid profile token")
+    body = profiler.collapsed(route)
+    if reset:
+        profiler.reset()
+    return PlainTextResponse(body)
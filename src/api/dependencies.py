@@ -1,15 +1,61 @@
 """Module that provides dependencies for the API."""
 
+from collections.abc import AsyncIterator
+
+from settings import settings
+from src.repositories.memory import InMemoryOutboxRepository, InMemoryUsersRepository
+from src.repositories.outbox import OutboxRepository
 from src.repositories.users import UsersRepository
+from src.services.importer import UsersImporter
 from src.services.users import UsersService
+from src.utils.unitofwork import UnitOfWork
+
+REPOSITORIES = {
+    "postgres": (UsersRepository, OutboxRepository),
+    "memory": (InMemoryUsersRepository, InMemoryOutboxRepository),
+}
+
+_users_repository, _outbox_repository = REPOSITORIES[settings.db.db_backend]
+_users_service = UsersService(_users_repository, _outbox_repository)
 
 
 def users_service() -> UsersService:
     """
-    Create a new `UsersService` instance using the `UsersRepository` and return it.
+    Return the `UsersService` instance shared by all requests.
+
+    The service and its repositories hold no request state, so they are
+    built once instead of on every request. The repositories are selected
+    by `settings.db.db_backend`.
+
+    Returns:
+        `UsersService`: The shared instance of the `UsersService` class.
+
+    """
+    return _users_service
+
+
+def users_importer() -> UsersImporter:
+    """
+    Return a new `UsersImporter` instance.
 
     Returns:
-        `UsersService`: A new instance of the `UsersService` class.
+        `UsersImporter`: An importer of users into the repository of `settings.db.db_backend`.
+
+    """
+    return UsersImporter(_users_repository)
+
+
+async def unit_of_work() -> AsyncIterator[UnitOfWork]:
+    """
+    Scope one session and one transaction to the request.
+
+    Repository calls made while handling the request share the session.
+    Writes are committed only by an explicit `await uow.commit()`; anything
+    left uncommitted is rolled back when the request ends.
+
+    Yields:
+        `UnitOfWork`: The unit of work of the request.
 
     """
-    return UsersService(UsersRepository)
+    async with UnitOfWork() as uow:
+        yield uow
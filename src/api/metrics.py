@@ -0,0 +1,90 @@
+"""Metrics API router.
+
+This module exposes the metrics of the application in the Prometheus text
+format and registers the collectors reading the state of the connection
+pools, the caches, the repository statement cache and the password hashing
+pool at scrape time.
+
+Attributes:
+    router (APIRouter): The APIRouter instance for the metrics endpoint.
+"""
+
+from collections.abc import Iterable
+
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from src.cache import Cache, local_cache
+from src.database import engine
+from src.metrics import Counter, Gauge, registry
+from src.utils.hasher import Hasher
+from src.utils.statements import statement_cache
+
+router = APIRouter(tags=["Metrics"])
+
+
+@registry.register_collector
+def collect_pools() -> Iterable[Gauge | Counter]:
+    """Describe the database, Redis and hashing pools.
+
+    Returns:
+        Iterable[Gauge | Counter]: The metric families of the pools.
+    """
+    pool = engine.pool
+    db = Gauge("db_pool_connections", "Database pool connections.", ("state",))
+    db.labels("size").set(pool.size())
+    db.labels("checked_out").set(pool.checkedout())
+    db.labels("checked_in").set(pool.checkedin())
+    db.labels("overflow").set(max(0, pool.overflow()))
+
+    redis = Gauge("redis_pool_connections", "Redis pool connections.", ("state",))
+    for state, value in Cache.pool_stats().items():
+        redis.labels(state).set(value)
+
+    stats = Hasher.stats()
+    hasher = Gauge("hasher_jobs", "Password hashing jobs and workers.", ("state",))
+    for state in ("workers", "in_flight", "queued"):
+        hasher.labels(state).set(stats[state] or 0)
+    rejected = Counter("hasher_rejected_total", "Password hashing jobs rejected because the pool was saturated.")
+    rejected.inc(stats["rejected"])
+    return db, redis, hasher, rejected
+
+
+@registry.register_collector
+def collect_local_cache() -> Iterable[Gauge | Counter]:
+    """Describe the in-process cache.
+
+    Returns:
+        Iterable[Gauge | Counter]: The metric families of the cache.
+    """
+    lookups = Counter("local_cache_requests_total", "In-process cache lookups.", ("result",))
+    lookups.labels("hit").inc(local_cache.hits)
+    lookups.labels("miss").inc(local_cache.misses)
+    entries = Gauge("local_cache_entries", "In-process cache entries, including expired ones not evicted yet.")
+    entries.set(len(local_cache))
+    return lookups, entries
+
+
+@registry.register_collector
+def collect_statement_cache() -> Iterable[Gauge | Counter]:
+    """Describe the statement templates cache of the repositories.
+
+    Returns:
+        Iterable[Gauge | Counter]: The metric families of the cache.
+    """
+    lookups = Counter("statement_cache_requests_total", "Repository statement template lookups.", ("result",))
+    lookups.labels("hit").inc(statement_cache.hits)
+    lookups.labels("miss").inc(statement_cache.misses)
+    entries = Gauge("statement_cache_entries", "Repository statement templates.")
+    entries.set(len(statement_cache))
+    return lookups, entries
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics() -> PlainTextResponse:
+    """Get the metrics of this worker in the Prometheus text format.
+
+    Returns:
+        PlainTextResponse: The metrics.
+    """
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
@@ -0,0 +1,141 @@
+"""MessagePack content negotiation.
+
+The routers of the API use `NegotiatedRoute` as their route class and
+`NegotiatedResponse` as their default response class. A request whose
+`Content-Type` is `application/msgpack` has its body decoded from MessagePack
+before FastAPI validates it, and a request whose `Accept` header lists
+`application/msgpack` gets its response encoded as MessagePack. JSON remains
+the default in both directions. Error responses are always JSON.
+
+Attributes:
+    MSGPACK (str): The MessagePack media type.
+    JSON (str): The JSON media type.
+    response_format (ContextVar[str]): The media type negotiated for the response of the current request.
+"""
+
+import datetime
+import enum
+import uuid
+from collections.abc import Awaitable, Callable
+from contextvars import ContextVar
+from typing import Any
+
+import msgpack
+from fastapi.responses import ORJSONResponse
+from fastapi.routing import APIRoute
+from starlette.background import BackgroundTask
+from starlette.requests import Request
+from starlette.responses import Response
+
+MSGPACK = "application/msgpack"
+JSON = "application/json"
+
+response_format: ContextVar[str] = ContextVar("response_format", default=JSON)
+
+
+def _default(value: object) -> object:
+    """Convert the values MessagePack does not support natively, like the JSON encoder does."""
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, (datetime.datetime, datetime.date)):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not MessagePack serializable")
+
+
+def accepts_msgpack(accept: str) -> bool:
+    """Tell whether an `Accept` header lists MessagePack.
+
+    Args:
+        accept (str): The value of the header.
+
+    Returns:
+        bool: True if MessagePack is accepted.
+    """
+    for media_range in accept.split(","):
+        media_type, _, params = media_range.partition(";")
+        if media_type.strip().lower() == MSGPACK:
+            return params.replace(" ", "") not in ("q=0", "q=0.0")
+    return False
+
+
+class MsgPackRequest(Request):
+    """A request whose body is MessagePack, decoded when FastAPI reads it as JSON."""
+
+    async def json(self: "MsgPackRequest") -> Any:  # noqa: ANN401
+        """Decode the body from MessagePack.
+
+        Returns:
+            Any: The decoded body.
+        """
+        if not hasattr(self, "_json"):
+            self._json = msgpack.unpackb(await self.body())
+        return self._json
+
+
+class NegotiatedResponse(ORJSONResponse):
+    """
+    A response encoded as MessagePack or as JSON, as negotiated for the current request.
+
+    The format is read from `response_format` when the response is built, so
+    routes and FastAPI build it like any other response.
+    """
+
+    def __init__(
+        self: "NegotiatedResponse",
+        content: Any,  # noqa: ANN401
+        status_code: int = 200,
+        headers: dict[str, str] | None = None,
+        media_type: str | None = None,
+        background: BackgroundTask | None = None,
+    ) -> None:
+        """Initialize a new instance of the `NegotiatedResponse` class.
+
+        Args:
+            content (Any): The content of the response.
+            status_code (int): The status code of the response.
+            headers (dict[str, str] | None): The headers of the response.
+            media_type (str | None): The media type, or None to use the negotiated one.
+            background (BackgroundTask | None): A task to run after the response is sent.
+        """
+        super().__init__(content, status_code, headers, media_type or response_format.get(), background)
+        self.headers["Vary"] = "Accept"
+
+    def render(self: "NegotiatedResponse", content: Any) -> bytes:  # noqa: ANN401
+        """Encode the content in the media type of the response.
+
+        Args:
+            content (Any): The content of the response.
+
+        Returns:
+            bytes: The body of the response.
+        """
+        if self.media_type == MSGPACK:
+            return msgpack.packb(content, default=_default)
+        return super().render(content)
+
+
+class NegotiatedRoute(APIRoute):
+    """A route decoding MessagePack request bodies and negotiating the format of its response."""
+
+    def get_route_handler(self: "NegotiatedRoute") -> Callable[[Request], Awaitable[Response]]:
+        """Wrap the handler of the route with the content negotiation.
+
+        Returns:
+            Callable[[Request], Awaitable[Response]]: The route handler.
+        """
+        handler = super().get_route_handler()
+
+        async def negotiated_handler(request: Request) -> Response:
+            if request.headers.get("content-type", "").split(";")[0].strip().lower() == MSGPACK:
+                headers = [(key, value) for key, value in request.scope["headers"] if key != b"content-type"]
+                scope = {**request.scope, "headers": [*headers, (b"content-type", JSON.encode())]}
+                request = MsgPackRequest(scope, request.receive)
+            token = response_format.set(MSGPACK if accepts_msgpack(request.headers.get("accept", "")) else JSON)
+            try:
+                return await handler(request)
+            finally:
+                response_format.reset(token)
+
+        return negotiated_handler
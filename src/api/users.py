@@ -2,22 +2,42 @@
 
 This module contains the API routes related to user management.
 
+Users are read from our own database, so the routes build their responses
+from the returned rows without validating them again and encode them with
+orjson, or with MessagePack when the client asks for it. Their `response_model`
+only documents the responses.
+
 """
 
 import uuid
+from typing import Literal
 
-from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, Request, status
+from fastapi.responses import StreamingResponse
 
 from logger import get_logger
-from src.api.dependencies import users_service
-from src.error import InternalServerError
-from src.schemas.users import SCreateUser, SUpdateUser, SUser
-from src.services.email import EmailService
+from src.api.dependencies import unit_of_work, users_importer, users_service
+from src.api.negotiation import NegotiatedResponse, NegotiatedRoute
+from src.error import InternalServerError, NotFoundError
+from src.models.users import Role
+from src.schemas.users import SBulkCreateResult, SCreateUser, SImportReport, SUpdateUser, SUser, SUserPage
+from src.services.importer import ImportHeaderError, UsersImporter
 from src.services.users import UsersService
+from src.utils.export import EXPORT_MEDIA_TYPES
+from src.utils.pagination import InvalidCursorError
+from src.utils.responses import trusted, trusted_many
+from src.utils.unitofwork import UnitOfWork
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+MAX_BULK_SIZE = 5000
 
 router = APIRouter(
     prefix="/users",
     tags=["Users"],
+    dependencies=[Depends(unit_of_work)],
+    route_class=NegotiatedRoute,
+    default_response_class=NegotiatedResponse,
 )
 
 logger = get_logger(__name__)
@@ -25,17 +45,20 @@ logger = get_logger(__name__)
 
 @router.post("", response_model=SUser)
 async def create_new_user(
-    background_tasks: BackgroundTasks,
     body: SCreateUser,
     users_service: UsersService = Depends(users_service),
-) -> SUser:
+    uow: UnitOfWork = Depends(unit_of_work),
+) -> NegotiatedResponse:
     """Create a new user.
 
+    The verification email is queued in the outbox together with the user
+    and sent by the `email-worker` process, outside of the request.
+
     Args:
         body (SCreateUser): The user data to be created.
 
     Returns:
-        SUser: The newly created user.
+        NegotiatedResponse: The newly created user, as `SUser`.
 
     Raises:
         HTTPException: If there is an error during the user creation.
@@ -43,8 +66,40 @@ async def create_new_user(
     """
     try:
         user = await users_service.add_user(user=body)
-        background_tasks.add_task(EmailService.send_email, body.username, body.email)
-        return user
+        await uow.commit()
+        return NegotiatedResponse(trusted(SUser, user))
+    except HTTPException as e:
+        raise e
+    except Exception as e:
+        logger.error(e)
+        raise InternalServerError
+
+
+@router.post("/bulk", response_model=SBulkCreateResult)
+async def create_new_users(
+    body: list[SCreateUser] = Body(..., min_length=1, max_length=MAX_BULK_SIZE),
+    users_service: UsersService = Depends(users_service),
+    uow: UnitOfWork = Depends(unit_of_work),
+) -> NegotiatedResponse:
+    """Create many users at once.
+
+    Rows conflicting on `email` or `username` are reported in `errors`
+    and do not prevent the other rows from being created.
+
+    Args:
+        body (list[SCreateUser]): The users to be created.
+
+    Returns:
+        NegotiatedResponse: The created users and the rejected rows, as `SBulkCreateResult`.
+
+    Raises:
+        HTTPException: If there is an error during the user creation.
+
+    """
+    try:
+        result = await users_service.add_users(users=body)
+        await uow.commit()
+        return NegotiatedResponse({"created": trusted_many(SUser, result["created"]), "errors": result["errors"]})
     except HTTPException as e:
         raise e
     except Exception as e:
@@ -52,11 +107,40 @@ async def create_new_user(
         raise InternalServerError
 
 
+@router.post("/import", response_model=SImportReport)
+async def import_users(request: Request, importer: UsersImporter = Depends(users_importer)) -> SImportReport:
+    """Import users from a CSV file streamed as the request body.
+
+    The body is parsed and validated row by row while it is being uploaded
+    and valid rows are loaded in batches through PostgreSQL COPY, so the
+    file is never buffered as a whole. Progress is logged after each batch.
+
+    Args:
+        request (Request): The request whose body is the CSV file.
+        importer (UsersImporter): The importer of the users.
+
+    Returns:
+        SImportReport: The outcome of the import.
+
+    Raises:
+        HTTPException: If the CSV header is invalid or there is an error during the import.
+
+    """
+    try:
+        return await importer.run(request.stream())
+    except ImportHeaderError as e:
+        logger.error(e)
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except Exception as e:
+        logger.error(e)
+        raise InternalServerError
+
+
 @router.get("/{user_id}/", response_model=SUser)
 async def get_user_by_id(
     user_id: uuid.UUID,
     users_service: UsersService = Depends(users_service),
-) -> SUser:
+) -> NegotiatedResponse:
     """Get user by ID.
 
     This function retrieves a user by their unique ID.
@@ -65,15 +149,18 @@ async def get_user_by_id(
         filter_by: user_id (uuid.UUID): The UUID of the user.
 
     Returns:
-        SUser: The user object.
+        NegotiatedResponse: The user, as `SUser`.
 
     Raises:
         HTTPException: If there is an error during the user retrieval.
+        NotFoundError: If no user has this id.
 
     """
     try:
         user = await users_service.get_user(filter_by={"user_id": user_id})
-        return user
+        if user is None:
+            raise NotFoundError("User not found")
+        return NegotiatedResponse(trusted(SUser, user))
     except HTTPException as e:
         logger.error(e)
         raise e
@@ -82,26 +169,45 @@ async def get_user_by_id(
         raise InternalServerError
 
 
-@router.get("", response_model=list[SUser])
+@router.get("", response_model=SUserPage)
 async def get_all_users(
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
+    role: Role | None = None,
+    disabled: bool | None = None,
+    email_verified: bool | None = None,
     users_service: UsersService = Depends(users_service),
-) -> list[SUser]:
-    """Get all users.
+) -> NegotiatedResponse:
+    """Get a page of users.
 
-    Retrieves all users from the database and returns them as a list of SUser objects.
+    Users are ordered by registration time and paginated with an opaque cursor:
+    pass the `next_cursor` of a page as `cursor` to get the following one.
 
     Args:
+        limit (int): The maximum number of users in the page.
+        cursor (str | None): The cursor of the page to retrieve, or None for the first page.
+        role (Role | None): Only return users with this role.
+        disabled (bool | None): Only return users with this disabled flag.
+        email_verified (bool | None): Only return users with this email verification flag.
         users_service (UsersService): An instance of the UsersService class.
 
     Returns:
-        list[SUser]: A list of SUser objects representing all users in the database.
+        NegotiatedResponse: The users of the page and the cursor of the next page, as `SUserPage`.
 
     Raises:
-        HTTPException: If there is an error during the user retrieval.
+        HTTPException: If the cursor is invalid or there is an error during the user retrieval.
     """
+    filter_by = {"role": role, "disabled": disabled, "email_verified": email_verified}
     try:
-        users = await users_service.get_all_users()
-        return users
+        page = await users_service.get_users_page(
+            limit=limit,
+            cursor=cursor,
+            filter_by={key: value for key, value in filter_by.items() if value is not None},
+        )
+        return NegotiatedResponse({"items": trusted_many(SUser, page["items"]), "next_cursor": page["next_cursor"]})
+    except InvalidCursorError as e:
+        logger.error(e)
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
     except HTTPException as e:
         logger.error(e)
         raise e
@@ -110,29 +216,73 @@ async def get_all_users(
         raise InternalServerError
 
 
+@router.get("/export")
+async def export_users(
+    fmt: Literal["ndjson", "csv"] = Query("ndjson", alias="format"),
+    columns: str | None = Query(None, description="Comma separated user fields, all fields by default."),
+    gzip: bool = False,
+    users_service: UsersService = Depends(users_service),
+) -> StreamingResponse:
+    """Stream every user as NDJSON or CSV.
+
+    The export is read through a server-side cursor and flushed in chunks,
+    so it runs in constant memory whatever the size of the user table.
+
+    Args:
+        fmt (str): The output format, either `ndjson` or `csv`.
+        columns (str | None): Comma separated names of the `SUser` fields to export.
+        gzip (bool): Whether to gzip the response body.
+        users_service (UsersService): An instance of the UsersService class.
+
+    Returns:
+        StreamingResponse: The streamed export.
+
+    Raises:
+        HTTPException: If an unknown column is requested.
+    """
+    selected = [column.strip() for column in columns.split(",")] if columns else list(SUser.model_fields)
+    unknown = [column for column in selected if column not in SUser.model_fields]
+    if unknown:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Unknown columns: {', '.join(unknown)}")
+    headers = {"Content-Disposition": f'attachment; filename="users.{fmt}"'}
+    if gzip:
+        headers["Content-Encoding"] = "gzip"
+    return StreamingResponse(
+        users_service.export_users(selected, fmt=fmt, compress=gzip),
+        media_type=EXPORT_MEDIA_TYPES[fmt],
+        headers=headers,
+    )
+
+
 @router.patch("/{user_id}/", response_model=SUser)
 async def update_user(
     user_id: uuid.UUID,
     body: SUpdateUser,
     users_service: UsersService = Depends(users_service),
-) -> SUser:
+    uow: UnitOfWork = Depends(unit_of_work),
+) -> NegotiatedResponse:
     """Update a user.
 
     Args:
         user_id (uuid.UUID): The unique id of the user to be updated.
         body (SUpdateUser): The data to update the user with.
         users_service (UsersService): An instance of the UsersService class.
+        uow (UnitOfWork): The unit of work of the request.
 
     Returns:
-        SUser: The updated user.
+        NegotiatedResponse: The updated user, as `SUser`.
 
     Raises:
         HTTPException: If there is an error during the user update.
+        NotFoundError: If no user has this id.
 
     """
     try:
         user = await users_service.update_user({"user_id": user_id}, data=body)
-        return user
+        if user is None:
+            raise NotFoundError("User not found")
+        await uow.commit()
+        return NegotiatedResponse(trusted(SUser, user))
     except HTTPException as e:
         logger.error(e)
         raise e
@@ -145,23 +295,29 @@ async def update_user(
 async def delete_user(
     user_id: uuid.UUID,
     users_service: UsersService = Depends(users_service),
-) -> SUser:
+    uow: UnitOfWork = Depends(unit_of_work),
+) -> NegotiatedResponse:
     """Delete a user specified by the `user_id` parameter.
 
     Args:
         user_id (uuid.UUID): The UUID of the user to delete.
         users_service (UsersService): An instance of the UsersService class.
+        uow (UnitOfWork): The unit of work of the request.
 
     Returns:
-        SUser: The deleted user object.
+        NegotiatedResponse: The deleted user, as `SUser`.
 
     Raises:
         HTTPException: If there is an error during the user deletion.
+        NotFoundError: If no user has this id.
 
     """
     try:
         user = await users_service.delete_user(user_id=user_id)
-        return user
+        if user is None:
+            raise NotFoundError("User not found")
+        await uow.commit()
+        return NegotiatedResponse(trusted(SUser, user))
     except HTTPException as e:
         logger.error(e)
         raise e
@@ -0,0 +1,43 @@
+"""Well-known API router.
+
+This module publishes the public keys that verify the tokens issued by `/auth`,
+so other services can verify them locally instead of calling this server.
+
+Attributes:
+    router (APIRouter): The APIRouter instance for well-known endpoints.
+"""
+
+import hashlib
+import json
+
+from fastapi import APIRouter, Request, Response, status
+
+from settings import settings
+from src.utils.jwt import get_token_engine
+
+router = APIRouter(prefix="/.well-known", tags=["Well-known"])
+
+
+@router.get("/jwks.json")
+async def get_jwks(request: Request) -> Response:
+    """Get the JSON Web Key Set of the keys trusted to verify tokens.
+
+    The set includes upcoming keys before they start signing, so a client
+    refreshing it within `max-age` always knows the key of a new token.
+    The response carries an `ETag`, so revalidating an unchanged set is answered
+    with `304 Not Modified`.
+
+    Args:
+        request (Request): The incoming request.
+
+    Returns:
+        Response: The key set, or an empty `304` response if the client has the current one.
+    """
+    body = json.dumps(get_token_engine().jwks(), separators=(",", ":")).encode()
+    headers = {
+        "Cache-Control": f"public, max-age={settings.auth.jwks_max_age}",
+        "ETag": f'"{hashlib.sha256(body).hexdigest()[:32]}"',
+    }
+    if request.headers.get("if-none-match") == headers["ETag"]:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=body, media_type="application/jwk-set+json", headers=headers)
@@ -1,21 +1,245 @@
 """Cache is a simple wrapper around Redis to provide string and JSON caching.
 
 This class provides methods to set and get string and JSON values in Redis.
+The asynchronous methods (prefixed with ``a``) run on a pooled ``redis.asyncio``
+client and never block the event loop. The synchronous methods are kept as a
+thin compatibility shim around a lazily created ``redis.Redis`` client.
 
 Attributes:
-    _redis_client (Redis | None): The Redis client.
+    _redis_client (Redis | None): The synchronous Redis client.
+    _async_client (AsyncRedis | None): The asynchronous Redis client.
+    local_cache (LocalCache): The in-process cache tier shared by the services of a worker.
 
     Note:
-        The Redis client is lazily initialized.
+        The synchronous Redis client is lazily initialized, the asynchronous
+        one is opened and closed by the application lifespan.
 
 """
 
-from typing import Type
-
-from redis import Redis
+import asyncio
+import json
+import random
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable
+from typing import Any, Type
+
+from redis import Redis, RedisError
+from redis.asyncio import BlockingConnectionPool
+from redis.asyncio import Redis as AsyncRedis
 from redis.commands.json.path import Path
 
+from logger import get_logger
 from settings import settings
+from src.metrics import CACHE_REQUESTS, REDIS_COMMAND_DURATION, REDIS_COMMAND_ERRORS
+
+logger = get_logger(__name__)
+
+
+class LocalCache:
+    """
+    LocalCache is a bounded in-process LRU cache whose entries expire after a TTL.
+
+    It is the first tier in front of Redis: a hit never leaves the process.
+    Entries are evicted in least recently used order once `maxsize` is reached
+    and are dropped lazily when they are read after their TTL.
+
+    Attributes:
+        maxsize (int): The maximum number of entries.
+        ttl (float): Seconds an entry lives after it was set.
+        hits (int): The number of lookups served from the cache.
+        misses (int): The number of lookups that found no live entry.
+        generation (int): The number of `delete` and `clear` calls, so a reader can
+            tell whether an invalidation happened while it was loading a value.
+
+    """
+
+    def __init__(self: "LocalCache", maxsize: int, ttl: float) -> None:
+        """Initialize an empty cache.
+
+        Args:
+            maxsize (int): The maximum number of entries.
+            ttl (float): Seconds an entry lives after it was set.
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.generation = 0
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+
+    def __len__(self: "LocalCache") -> int:
+        """Return the number of entries, including expired ones not evicted yet."""
+        return len(self._entries)
+
+    def get(self: "LocalCache", key: str) -> Any:  # noqa: ANN401
+        """Get a live entry and mark it as recently used.
+
+        Args:
+            key (str): The key to lookup.
+
+        Returns:
+            Any: The cached value, or None if the key is missing or expired.
+        """
+        entry = self._entries.get(key)
+        if entry is None or entry[0] < time.monotonic():
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def set(self: "LocalCache", key: str, value: Any, ttl: float | None = None) -> None:  # noqa: ANN401
+        """Store an entry, evicting the least recently used one when the cache is full.
+
+        Args:
+            key (str): The key of the value.
+            value (Any): The value to be stored.
+            ttl (float | None): Seconds the entry lives, capped at the TTL of the cache.
+        """
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def delete(self: "LocalCache", *keys: str) -> None:
+        """Remove entries if they are present.
+
+        Args:
+            keys (str): The keys to be removed.
+        """
+        self.generation += 1
+        for key in keys:
+            self._entries.pop(key, None)
+
+    def clear(self: "LocalCache") -> None:
+        """Remove every entry."""
+        self.generation += 1
+        self._entries.clear()
+
+
+local_cache = LocalCache(settings.cache.cache_local_maxsize, settings.cache.cache_local_ttl)
+
+
+class MemoryPubSub:
+    """The subscription of a `MemoryRedis` client, with the subset of the `PubSub` API used by `Cache`."""
+
+    def __init__(self: "MemoryPubSub", client: "MemoryRedis") -> None:
+        """Initialize a subscription without channels.
+
+        Args:
+            client (MemoryRedis): The client publishing the messages.
+        """
+        self.client = client
+        self.messages: asyncio.Queue = asyncio.Queue()
+        self.channels: set[str] = set()
+
+    async def __aenter__(self: "MemoryPubSub") -> "MemoryPubSub":
+        """Register the subscription on the client."""
+        self.client.subscriptions.add(self)
+        return self
+
+    async def __aexit__(self: "MemoryPubSub", *exc_info: object) -> None:
+        """Unregister the subscription from the client."""
+        self.client.subscriptions.discard(self)
+
+    async def subscribe(self: "MemoryPubSub", *channels: str) -> None:
+        """Subscribe to channels."""
+        self.channels.update(channels)
+
+    async def get_message(
+        self: "MemoryPubSub",
+        ignore_subscribe_messages: bool = False,
+        timeout: float = 0.0,
+    ) -> dict | None:
+        """Wait up to `timeout` seconds for a published message."""
+        try:
+            return await asyncio.wait_for(self.messages.get(), timeout)
+        except TimeoutError:
+            return None
+
+
+class MemoryJson:
+    """The RedisJSON commands of a `MemoryRedis` client used by `Cache`."""
+
+    def __init__(self: "MemoryJson", client: "MemoryRedis") -> None:
+        """Bind the commands to a client."""
+        self.client = client
+
+    async def set(self: "MemoryJson", key: str, path: object, value: dict) -> bool:
+        """Store a JSON document at the root path."""
+        self.client.data[key] = (None, json.dumps(value))
+        return True
+
+    async def get(self: "MemoryJson", key: str) -> dict | None:
+        """Read a JSON document stored at the root path."""
+        value = await self.client.get(key)
+        return None if value is None else json.loads(value)
+
+
+class MemoryRedis:
+    """
+    A dict-backed stand-in for the asynchronous Redis client, used with `CACHE_BACKEND=memory`.
+
+    It implements the commands `Cache` uses, with expiration and pub/sub within
+    the process, so the service layer runs without a Redis server in tests and
+    benchmarks. Values are stored as strings, like Redis with `decode_responses`.
+
+    Attributes:
+        data (dict[str, tuple[float | None, str]]): The values and their expiry deadlines, by key.
+        subscriptions (set[MemoryPubSub]): The open subscriptions.
+    """
+
+    def __init__(self: "MemoryRedis") -> None:
+        """Initialize an empty store."""
+        self.data: dict[str, tuple[float | None, str]] = {}
+        self.subscriptions: set[MemoryPubSub] = set()
+
+    async def get(self: "MemoryRedis", key: str) -> str | None:
+        """Get the value of a key, or None if it is missing or expired."""
+        entry = self.data.get(key)
+        if entry is None:
+            return None
+        if entry[0] is not None and entry[0] < time.monotonic():
+            del self.data[key]
+            return None
+        return entry[1]
+
+    async def set(self: "MemoryRedis", key: str, value: str | int | float, ex: int | None = None) -> bool:
+        """Set the value of a key, expiring after `ex` seconds when given."""
+        self.data[key] = (None if ex is None else time.monotonic() + ex, str(value))
+        return True
+
+    async def delete(self: "MemoryRedis", *keys: str) -> int:
+        """Delete keys and return how many existed."""
+        return sum(self.data.pop(key, None) is not None for key in keys)
+
+    async def publish(self: "MemoryRedis", channel: str, message: str) -> int:
+        """Deliver a message to the subscriptions of a channel and return their number."""
+        receivers = [pubsub for pubsub in self.subscriptions if channel in pubsub.channels]
+        for pubsub in receivers:
+            pubsub.messages.put_nowait({"type": "message", "channel": channel, "data": message})
+        return len(receivers)
+
+    def pubsub(self: "MemoryRedis") -> MemoryPubSub:
+        """Open a subscription."""
+        return MemoryPubSub(self)
+
+    def json(self: "MemoryRedis") -> MemoryJson:
+        """Get the RedisJSON commands."""
+        return MemoryJson(self)
+
+    async def config_set(self: "MemoryRedis", name: str, value: str) -> bool:
+        """Accept a configuration change, which has no effect in memory."""
+        return True
+
+    async def aclose(self: "MemoryRedis") -> None:
+        """Drop every value and subscription."""
+        self.data.clear()
+        self.subscriptions.clear()
 
 
 class Cache:
@@ -25,14 +249,281 @@ class Cache:
     This class provides methods to set and get string and JSON values in Redis.
 
     Attributes:
-        _redis_client (Redis | None): The Redis client.
+        _redis_client (Redis | None): The synchronous Redis client.
+        _async_client (AsyncRedis | MemoryRedis | None): The asynchronous Redis client.
+        _pool (BlockingConnectionPool | None): The connection pool of the asynchronous client.
 
     Note:
-        The Redis client is lazily initialized.
+        The asynchronous methods are best effort: a call that times out or fails
+        with a Redis error is logged and treated as a cache miss, so a slow or
+        unavailable Redis degrades to the database path instead of failing requests.
 
     """
 
     _redis_client = None
+    _async_client: AsyncRedis | MemoryRedis | None = None
+    _pool: BlockingConnectionPool | None = None
+
+    @classmethod
+    async def connect(cls: Type["Cache"]) -> AsyncRedis:
+        """Open the asynchronous Redis client and its connection pool.
+
+        The pool is configured from `settings.redis`. With `settings.cache.cache_backend`
+        set to `memory`, a `MemoryRedis` client is used instead and no pool is opened.
+        Calling this method again while the client is open returns the existing client.
+
+        Returns:
+            AsyncRedis: The asynchronous Redis client.
+        """
+        if cls._async_client is None and settings.cache.cache_backend == "memory":
+            cls._async_client = MemoryRedis()
+        elif cls._async_client is None:
+            cls._pool = BlockingConnectionPool.from_url(
+                settings.redis.redis_dsn,
+                max_connections=settings.redis.redis_max_connections,
+                timeout=settings.redis.redis_pool_timeout,
+                socket_timeout=settings.redis.redis_socket_timeout,
+                socket_connect_timeout=settings.redis.redis_socket_connect_timeout,
+                health_check_interval=settings.redis.redis_health_check_interval,
+                decode_responses=True,
+            )
+            cls._async_client = AsyncRedis(connection_pool=cls._pool)
+        return cls._async_client
+
+    @classmethod
+    async def apply_memory_budget(cls: Type["Cache"]) -> None:
+        """Apply the configured `maxmemory` budget and eviction policy to Redis.
+
+        Every key written by the application has a TTL, so a `volatile-*` policy
+        evicts cache entries only and keeps eviction predictable under memory pressure.
+        Nothing is changed when no budget is configured. Managed Redis deployments
+        that forbid `CONFIG SET` are reported and otherwise ignored.
+
+        Returns:
+            None: This function does not return anything.
+        """
+        if not settings.cache.cache_maxmemory:
+            return
+        try:
+            await cls._async_client.config_set("maxmemory", settings.cache.cache_maxmemory)
+            await cls._async_client.config_set("maxmemory-policy", settings.cache.cache_maxmemory_policy)
+        except RedisError as e:
+            logger.warning(f"redis memory budget was not applied > {e!r}")
+
+    @staticmethod
+    def key(namespace: str, *parts: object) -> str:
+        """Build a namespaced and versioned cache key.
+
+        Args:
+            namespace (str): The kind of entry, e.g. `user` or `auth`.
+            parts (object): The parts identifying the entry within the namespace.
+
+        Returns:
+            str: A key of the form `<prefix>:v<version>:<namespace>:<part>:...`.
+        """
+        return ":".join([settings.cache.cache_prefix, f"v{settings.cache.cache_version}", namespace, *map(str, parts)])
+
+    @staticmethod
+    def ttl(seconds: int) -> int:
+        """Spread a TTL randomly by `settings.cache.cache_ttl_jitter`.
+
+        Entries written together, e.g. during a login storm, then expire at
+        different moments instead of falling back to the database at once.
+
+        Args:
+            seconds (int): The nominal TTL in seconds.
+
+        Returns:
+            int: The jittered TTL in seconds, at least one second.
+        """
+        jitter = seconds * settings.cache.cache_ttl_jitter
+        return max(1, round(seconds + random.uniform(-jitter, jitter)))
+
+    @classmethod
+    async def disconnect(cls: Type["Cache"]) -> None:
+        """Close the asynchronous Redis client and release all pooled connections.
+
+        Returns:
+            None: This function does not return anything.
+        """
+        if cls._async_client is not None:
+            await cls._async_client.aclose()
+            if cls._pool is not None:
+                await cls._pool.disconnect()
+            cls._async_client = None
+            cls._pool = None
+
+    @classmethod
+    def pool_stats(cls: Type["Cache"]) -> dict[str, int]:
+        """Return the usage statistics of the asynchronous connection pool.
+
+        Returns:
+            dict[str, int]: The maximum, created, idle and in-use connection counts.
+        """
+        if cls._pool is None:
+            return {"max_connections": 0, "created": 0, "available": 0, "in_use": 0}
+        available = len(cls._pool._available_connections)
+        in_use = len(cls._pool._in_use_connections)
+        return {
+            "max_connections": cls._pool.max_connections,
+            "created": available + in_use,
+            "available": available,
+            "in_use": in_use,
+        }
+
+    @classmethod
+    async def _execute(
+        cls: Type["Cache"],
+        name: str,
+        command: Awaitable,
+        timeout: float | None = None,
+        default: Any = None,  # noqa: ANN401
+    ) -> Any:  # noqa: ANN401
+        """Await a Redis command bounded by a timeout, recording its latency.
+
+        Args:
+            name (str): The name of the command, used as a metric label.
+            command (Awaitable): The pending Redis command.
+            timeout (float | None): The timeout in seconds. Defaults to `settings.redis.redis_command_timeout`.
+            default (Any): The value returned when the command times out or fails.
+
+        Returns:
+            Any: The result of the command, or `default` on failure.
+        """
+        start = time.perf_counter()
+        try:
+            async with asyncio.timeout(timeout or settings.redis.redis_command_timeout):
+                return await command
+        except (TimeoutError, RedisError) as e:
+            logger.warning(f"cache call failed > {e!r}")
+            REDIS_COMMAND_ERRORS.labels(name).inc()
+            return default
+        finally:
+            REDIS_COMMAND_DURATION.labels(name).observe(time.perf_counter() - start)
+
+    @classmethod
+    async def aget(cls: Type["Cache"], key: str, timeout: float | None = None) -> str | None:
+        """Get the value of a Redis key without blocking the event loop.
+
+        Args:
+            key (str): The key to lookup.
+            timeout (float | None): Per-call timeout in seconds.
+
+        Returns:
+            str | None: The value of the key, or None if the key does not exist or the call failed.
+        """
+        value = await cls._execute("get", cls._async_client.get(key), timeout)
+        CACHE_REQUESTS.labels("miss" if value is None else "hit").inc()
+        return value
+
+    @classmethod
+    async def aset(
+        cls: Type["Cache"],
+        key: str,
+        value: str | int | float,
+        ex: int | None = None,
+        timeout: float | None = None,
+    ) -> bool:
+        """Set a string value in Redis without blocking the event loop.
+
+        Args:
+            key (str): The key of the value.
+            value (str | int | float): The value to be stored.
+            ex (int | None): Expiration time in seconds. The key never expires if None.
+            timeout (float | None): Per-call timeout in seconds.
+
+        Returns:
+            bool: True if the value was stored, False otherwise.
+        """
+        return bool(await cls._execute("set", cls._async_client.set(key, value, ex=ex), timeout, default=False))
+
+    @classmethod
+    async def adelete(cls: Type["Cache"], *keys: str, timeout: float | None = None) -> int:
+        """Delete keys from Redis without blocking the event loop.
+
+        Args:
+            keys (str): The keys to be deleted.
+            timeout (float | None): Per-call timeout in seconds.
+
+        Returns:
+            int: The number of deleted keys.
+        """
+        return await cls._execute("delete", cls._async_client.delete(*keys), timeout, default=0)
+
+    @classmethod
+    async def ajson_set(cls: Type["Cache"], key: str, value: dict, timeout: float | None = None) -> None:
+        """Set a JSON value in Redis without blocking the event loop.
+
+        Args:
+            key (str): The key of the JSON value.
+            value (dict): The JSON value.
+            timeout (float | None): Per-call timeout in seconds.
+
+        Returns:
+            None: This function does not return anything.
+        """
+        await cls._execute("json.set", cls._async_client.json().set(key, Path.root_path(), value), timeout)
+
+    @classmethod
+    async def ajson_get(cls: Type["Cache"], key: str, timeout: float | None = None) -> dict | None:
+        """Get the value of a Redis JSON key without blocking the event loop.
+
+        Args:
+            key (str): The key to lookup.
+            timeout (float | None): Per-call timeout in seconds.
+
+        Returns:
+            dict or None: The value of the JSON key, or None if the key does not exist or the call failed.
+        """
+        value = await cls._execute("json.get", cls._async_client.json().get(key), timeout)
+        CACHE_REQUESTS.labels("miss" if value is None else "hit").inc()
+        return value
+
+    @classmethod
+    async def invalidate(cls: Type["Cache"], *keys: str) -> None:
+        """Evict keys from both cache tiers of every worker.
+
+        The keys are removed from the local tier of this worker and from Redis,
+        then published on the invalidation channel so that the other workers
+        drop them from their local tiers as well.
+
+        Args:
+            keys (str): The keys to be evicted.
+
+        Returns:
+            None: This function does not return anything.
+        """
+        local_cache.delete(*keys)
+        await cls.adelete(*keys)
+        await cls._execute(
+            "publish", cls._async_client.publish(settings.cache.cache_invalidation_channel, json.dumps(keys))
+        )
+
+    @classmethod
+    async def listen_invalidations(cls: Type["Cache"], poll_interval: float = 1.0) -> None:
+        """Evict keys published by `invalidate` from the local tier until cancelled.
+
+        The local tier is cleared whenever the subscription is lost, since
+        invalidations published in the meantime can not be replayed.
+
+        Args:
+            poll_interval (float): Seconds to wait for a message before polling again.
+
+        Returns:
+            None: This function does not return anything.
+        """
+        while True:
+            try:
+                async with cls._async_client.pubsub() as pubsub:
+                    await pubsub.subscribe(settings.cache.cache_invalidation_channel)
+                    while True:
+                        message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=poll_interval)
+                        if message is not None:
+                            local_cache.delete(*json.loads(message["data"]))
+            except (RedisError, OSError, ValueError) as e:
+                logger.warning(f"cache invalidation listener failed > {e!r}")
+                local_cache.clear()
+                await asyncio.sleep(poll_interval)
 
     @classmethod
     def set(cls: Type["Cache"], key: str, value: str | int | float) -> None:
@@ -43,7 +534,7 @@ class Cache:
             key (str): The key of the value.
             value (str | int | float): The value to be stored.
         """
-        cls._redis_client.set(key, value)
+        cls.get_redis_client().set(key, value)
 
     @classmethod
     def json_set(cls: Type["Cache"], key: str, value: dict) -> None:
@@ -57,7 +548,7 @@ class Cache:
         Returns:
             None: This function does not return anything.
         """
-        cls._redis_client.json().set(key, Path.root_path(), value)
+        cls.get_redis_client().json().set(key, Path.root_path(), value)
 
     @classmethod
     def json_get(cls: Type["Cache"], key: str) -> dict | None:
@@ -71,7 +562,7 @@ class Cache:
         Returns:
             dict or None: The value of the JSON key, or None if the key does not exist.
         """
-        return cls._redis_client.json().get(key)
+        return cls.get_redis_client().json().get(key)
 
     @classmethod
     def get(cls: Type["Cache"], key: str) -> str | int | float:
@@ -84,7 +575,7 @@ class Cache:
         Returns:
             str | int | float: The value of the key, or None if the key does not exist.
         """
-        return cls._redis_client.get(key)
+        return cls.get_redis_client().get(key)
 
     @classmethod
     def delete(cls: Type["Cache"], key: str) -> None:
@@ -97,7 +588,7 @@ class Cache:
         Returns:
             None: This function does not return anything.
         """
-        cls._redis_client.delete(key)
+        cls.get_redis_client().delete(key)
 
     @classmethod
     def get_all(
@@ -108,7 +599,7 @@ class Cache:
         Returns:
             dict: A dictionary containing all the key-value pairs.
         """
-        return cls._redis_client.hgetall()
+        return cls.get_redis_client().hgetall()
 
     @classmethod
     def get_redis_client(
@@ -1,3 +1,7 @@
+import argparse
+import asyncio
+from collections.abc import AsyncIterator
+
 import pytest
 import uvicorn
 
@@ -8,3 +12,113 @@ def dev() -> None:
 
 def test() -> None:
     pytest.main(["-v"])
+
+
+async def _read_chunks(path: str, chunk_size: int) -> AsyncIterator[bytes]:
+    with open(path, "rb") as f:
+        while chunk := await asyncio.to_thread(f.read, chunk_size):
+            yield chunk
+
+
+def import_users() -> None:
+    """Import users from a local CSV file through the same COPY path as `POST /users/import`."""
+    from src.repositories.users import UsersRepository
+    from src.schemas.users import SImportReport
+    from src.services.importer import UsersImporter
+
+    parser = argparse.ArgumentParser(prog="import-users", description="Import users from a CSV file.")
+    parser.add_argument("path", help="CSV file with name, email, username and hashed_password columns")
+    parser.add_argument("--batch-size", type=int, default=5000, help="rows loaded per COPY")
+    parser.add_argument("--chunk-size", type=int, default=1 << 20, help="bytes read from the file at once")
+    args = parser.parse_args()
+
+    def print_progress(report: SImportReport) -> None:
+        print(f"rows={report.rows} inserted={report.inserted} skipped={report.skipped} rejected={report.rejected}")
+
+    importer = UsersImporter(UsersRepository, batch_size=args.batch_size, on_progress=print_progress)
+    report = asyncio.run(importer.run(_read_chunks(args.path, args.chunk_size)))
+    for error in report.errors:
+        print(f"row {error.row}: {error.detail}")
+
+
+def email_worker() -> None:
+    """Deliver the emails queued in the outbox until SIGINT or SIGTERM."""
+    import signal
+
+    from src.repositories.outbox import OutboxRepository
+    from src.services.email import EmailService
+    from src.worker import OutboxWorker
+
+    async def main() -> None:
+        worker = OutboxWorker(OutboxRepository)
+        loop = asyncio.get_running_loop()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(signum, worker.stop)
+        try:
+            await worker.run()
+        finally:
+            await EmailService.close_pool()
+
+    asyncio.run(main())
+
+
+def rotate_jwt_key() -> None:
+    """Schedule a new JWT signing key in the key manifest."""
+    import datetime
+    import math
+    import os
+
+    from settings import settings
+    from src.utils.keys import SUPPORTED_ALGORITHMS, rotate_manifest
+
+    parser = argparse.ArgumentParser(prog="rotate-jwt-key", description="Schedule a new JWT signing key.")
+    parser.add_argument("manifest", nargs="?", default=settings.auth.jwt_keys_file, help="the key manifest")
+    parser.add_argument("--algorithm", choices=SUPPORTED_ALGORITHMS, default="ES256")
+    parser.add_argument(
+        "--activate-in",
+        type=int,
+        help="seconds before the key starts signing, by default long enough for the servers to reload the manifest "
+        "and for verifiers to refresh their cached key set twice",
+    )
+    args = parser.parse_args()
+    if not args.manifest:
+        parser.error("the manifest is required when JWT_KEYS_FILE is not set")
+    if args.activate_in is None:
+        delay = settings.auth.jwt_keys_reload_interval + 2 * settings.auth.jwks_max_age
+        args.activate_in = math.ceil(delay) if os.path.exists(args.manifest) else 0
+
+    not_before = datetime.datetime.now(datetime.timezone.utc) + datetime.timedelta(seconds=args.activate_in)
+    overlap = datetime.timedelta(minutes=settings.auth.refresh_token_expires_minutes)
+    kid = rotate_manifest(args.manifest, args.algorithm, not_before, overlap)
+    print(f"key {kid} signs from {not_before.isoformat()}")
+
+
+def loadtest() -> None:
+    """Drive a running server with load scenarios and print a JSON report."""
+    import json
+
+    from src.loadtest import SCENARIOS, run
+
+    parser = argparse.ArgumentParser(prog="loadtest", description="Load test a running server.")
+    parser.add_argument("scenarios", nargs="*", help=f"scenarios among {', '.join(SCENARIOS)}, by default all of them")
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds each scenario runs")
+    parser.add_argument("--concurrency", type=int, default=50, help="clients, or requests in flight with --rate")
+    parser.add_argument("--rate", type=float, help="requests started per second, by default back to back")
+    parser.add_argument("--users", type=int, default=1000, help="users created per scenario before it runs")
+    parser.add_argument("--hit-ratio", type=float, default=0.8, help="fraction of logins with cached credentials")
+    parser.add_argument("--output", help="file the report is written to, by default stdout")
+    args = parser.parse_args()
+    if unknown := set(args.scenarios) - SCENARIOS.keys():
+        parser.error(f"unknown scenarios: {', '.join(sorted(unknown))}")
+
+    scenarios = args.scenarios or list(SCENARIOS)
+    reports = asyncio.run(
+        run(args.base_url, scenarios, args.duration, args.concurrency, args.rate, args.users, args.hit_ratio)
+    )
+    report = json.dumps({"base_url": args.base_url, "scenarios": reports}, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(report + "\n")
+    else:
+        print(report)
@@ -1,10 +1,25 @@
-from collections.abc import Generator
+import asyncio
+import functools
+import re
+import time
+from collections import Counter
+from collections.abc import Generator, Sequence
+from contextvars import ContextVar
 
-from sqlalchemy import MetaData
+from sqlalchemy import Connection, Executable, MetaData, event, text
+from sqlalchemy.engine import ExecutionContext
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import DeclarativeBase
 
+from logger import get_logger
 from settings import settings
+from src.metrics import DB_SLOW_QUERIES
+
+logger = get_logger(__name__)
+
+WHITESPACE = re.compile(r"\s+")
+SQL_LITERAL = re.compile(r"'(?:[^']|'')*'|(?<![\w$])\d+(?:\.\d+)?\b")
+PARAMETER_LIST = re.compile(r"\((?:\s*(?:\$\d+|\?)\s*,)+\s*(?:\$\d+|\?)\s*\)")
 
 metadata = MetaData()
 
@@ -13,13 +28,169 @@ class Base(DeclarativeBase):
     metadata = metadata
 
 
-engine = create_async_engine(settings.db.pg_dsn, future=True, echo=False)
+engine = create_async_engine(
+    settings.db.pg_dsn,
+    future=True,
+    echo=False,
+    pool_size=settings.db.db_pool_size,
+    max_overflow=settings.db.db_max_overflow,
+    pool_timeout=settings.db.db_pool_timeout,
+    pool_recycle=settings.db.db_pool_recycle,
+    pool_pre_ping=settings.db.db_pool_pre_ping,
+    connect_args={
+        "statement_cache_size": settings.db.db_statement_cache_size,
+        "prepared_statement_cache_size": settings.db.db_prepared_statement_cache_size,
+    },
+)
 async_session = async_sessionmaker(engine, expire_on_commit=False)
 
 
+@functools.lru_cache(maxsize=1024)
+def normalize_sql(statement: str) -> str:
+    """Normalize a SQL statement, so statements differing only by their values compare equal.
+
+    Whitespace is collapsed, literals are replaced by `?` and lists of parameters by `(...)`.
+    Results are cached, as the engine executes the same compiled statements over and over.
+
+    Args:
+        statement (str): The SQL statement.
+
+    Returns:
+        str: The normalized statement.
+    """
+    statement = SQL_LITERAL.sub("?", WHITESPACE.sub(" ", statement).strip())
+    return PARAMETER_LIST.sub("(...)", statement)
+
+
+class QueryStats:
+    """
+    The SQL statements executed on behalf of a request.
+
+    Attributes:
+        count (int): The number of statements executed.
+        duration (float): Seconds spent executing them.
+        statements (Counter): The number of executions per normalized statement.
+    """
+
+    __slots__ = ("count", "duration", "statements")
+
+    def __init__(self: "QueryStats") -> None:
+        """Initialize empty statistics."""
+        self.count = 0
+        self.duration = 0.0
+        self.statements: Counter = Counter()
+
+    def record(self: "QueryStats", statement: str, duration: float) -> None:
+        """Record the execution of a statement.
+
+        Args:
+            statement (str): The SQL statement.
+            duration (float): Seconds the execution took.
+        """
+        self.count += 1
+        self.duration += duration
+        self.statements[normalize_sql(statement)] += 1
+
+    def repeated(self: "QueryStats", threshold: int) -> list[tuple[str, int]]:
+        """Find the statements executed at least `threshold` times, the sign of an N+1 query pattern.
+
+        Args:
+            threshold (int): The number of executions from which a statement is reported.
+
+        Returns:
+            list[tuple[str, int]]: The normalized statements and their number of executions.
+        """
+        return [(statement, count) for statement, count in self.statements.items() if count >= threshold]
+
+
+query_stats: ContextVar[QueryStats | None] = ContextVar("query_stats", default=None)
+
+
+def record_query(statement: str, duration: float) -> None:
+    """Attach the execution of a statement to the current request and log it if it is slow.
+
+    Args:
+        statement (str): The SQL statement.
+        duration (float): Seconds the execution took.
+    """
+    stats = query_stats.get()
+    if stats is not None:
+        stats.record(statement, duration)
+    if duration * 1000 >= settings.db.db_slow_query_ms:
+        DB_SLOW_QUERIES.inc()
+        normalized = normalize_sql(statement)
+        logger.warning(
+            "slow query > %.1f ms: %s",
+            duration * 1000,
+            normalized,
+            extra={"duration_ms": round(duration * 1000, 3), "statement": normalized},
+        )
+
+
+@event.listens_for(engine.sync_engine, "before_cursor_execute")
+def _start_query(
+    conn: Connection,
+    cursor: object,
+    statement: str,
+    parameters: object,
+    context: ExecutionContext | None,
+    executemany: bool,
+) -> None:
+    """Stamp the start of a statement on its execution context."""
+    if context is not None:
+        context.query_start = time.perf_counter()
+
+
+@event.listens_for(engine.sync_engine, "after_cursor_execute")
+def _end_query(
+    conn: Connection,
+    cursor: object,
+    statement: str,
+    parameters: object,
+    context: ExecutionContext | None,
+    executemany: bool,
+) -> None:
+    """Record a statement once its cursor has executed it."""
+    start = getattr(context, "query_start", None)
+    if start is not None:
+        record_query(statement, time.perf_counter() - start)
+
+
 async def get_session() -> Generator:
     try:
         session: AsyncSession = async_session()
         yield session
     finally:
         await session.close()
+
+
+async def warm_up(connections: int, statements: Sequence[Executable] = ()) -> int:
+    """Open pooled connections and prime their prepared statements.
+
+    The connections are opened concurrently and each one runs every statement
+    once, so the statements are compiled by SQLAlchemy and prepared by asyncpg
+    before the first request needs them. The connections then go back to the pool.
+
+    Args:
+        connections (int): The number of connections to open, capped at the pool size.
+        statements (Sequence[Executable]): The hot statements to prime, with placeholder parameters.
+
+    Returns:
+        int: The number of connections that were opened and primed.
+    """
+
+    async def prime() -> None:
+        async with engine.connect() as connection:
+            await connection.execute(text("SELECT 1"))
+            for statement in statements:
+                await connection.execute(statement)
+            await connection.rollback()
+
+    results = await asyncio.gather(
+        *(prime() for _ in range(min(connections, settings.db.db_pool_size))),
+        return_exceptions=True,
+    )
+    errors = [result for result in results if isinstance(result, BaseException)]
+    if errors:
+        logger.error(f"database warm-up failed on {len(errors)} connections. Error: {errors[0]!r}")
+    return len(results) - len(errors)
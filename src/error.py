@@ -34,3 +34,94 @@ class InternalServerError(HTTPException):
                 "detail": "Something went wrong",
             },
         )
+
+
+class ServiceUnavailableError(HTTPException):
+    """ServiceUnavailableError.
+
+    Args:
+        HTTPException (_type_): _description_
+    """
+
+    def __init__(self: "ServiceUnavailableError", retry_after: int = 1) -> None:
+        """Exception that indicates a saturated resource that can not accept more work right now.
+
+        Args:
+            retry_after (int): Seconds the client should wait before retrying.
+
+        Returns:
+            None
+
+        Raises:
+            ServiceUnavailableError: When a bounded resource is saturated.
+
+        """
+        super().__init__(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail={
+                "status": status.HTTP_503_SERVICE_UNAVAILABLE,
+                "data": None,
+                "detail": "Service is busy, try again later",
+            },
+            headers={"Retry-After": str(retry_after)},
+        )
+
+
+class NotFoundError(HTTPException):
+    """NotFoundError.
+
+    Args:
+        HTTPException (_type_): _description_
+    """
+
+    def __init__(self: "NotFoundError", detail: str = "Not found") -> None:
+        """Exception that indicates that the requested resource does not exist.
+
+        Args:
+            detail (str): The description of the missing resource.
+
+        Returns:
+            None
+
+        Raises:
+            NotFoundError: When the requested resource does not exist.
+
+        """
+        super().__init__(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail={
+                "status": status.HTTP_404_NOT_FOUND,
+                "data": None,
+                "detail": detail,
+            },
+        )
+
+
+class ForbiddenError(HTTPException):
+    """ForbiddenError.
+
+    Args:
+        HTTPException (_type_): _description_
+    """
+
+    def __init__(self: "ForbiddenError", detail: str = "Forbidden") -> None:
+        """Exception that indicates that the client is not allowed to access the resource.
+
+        Args:
+            detail (str): The reason of the refusal.
+
+        Returns:
+            None
+
+        Raises:
+            ForbiddenError: When the credentials of the client do not grant access.
+
+        """
+        super().__init__(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail={
+                "status": status.HTTP_403_FORBIDDEN,
+                "data": None,
+                "detail": detail,
+            },
+        )
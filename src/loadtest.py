@@ -0,0 +1,378 @@
+"""
+Load generation against a running server.
+
+Every scenario exercises one traffic pattern of the API and is driven either
+by a fixed number of concurrent clients issuing requests back to back, or by
+an arrival rate: requests are then started at exponentially distributed
+intervals whatever the latency of the server, and their latency is measured
+from their scheduled start, so a saturated server shows up as queueing time
+instead of as a lower request rate.
+
+Scenarios:
+    register: A registration burst of new users through `POST /users`.
+    login: A login storm through `POST /auth/login`, mixing users whose credentials
+        are cached by an earlier login with users logging in for the first time.
+    refresh: Token refresh churn, every client renewing its own token chain through `POST /auth/refresh`.
+    browse: Paginated reads of `GET /users`, following cursors, and user lookups through `GET /users/{id}/`.
+
+The report is a JSON document with, per scenario, the number of requests,
+the error rate, the status codes, the throughput and the latency percentiles.
+
+Attributes:
+    SCENARIOS (dict[str, type[Scenario]]): The scenarios, by name.
+"""
+
+import asyncio
+import functools
+import itertools
+import math
+import random
+import time
+import uuid
+from collections import Counter
+from collections.abc import Sequence
+
+import bcrypt
+import httpx
+
+PASSWORD = "loadtest-password"
+PERCENTILES = (50, 90, 99)
+
+
+def percentile(ordered: Sequence[float], q: float) -> float:
+    """Read a percentile from sorted values with the nearest-rank method.
+
+    Args:
+        ordered (Sequence[float]): The sorted values.
+        q (float): The percentile, between 0 and 100.
+
+    Returns:
+        float: The value of the percentile, or 0.0 without values.
+    """
+    if not ordered:
+        return 0.0
+    rank = max(1, math.ceil(q / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+class Stats:
+    """
+    The outcomes of the requests of a scenario.
+
+    Attributes:
+        latencies (list[float]): The latency of every completed request, in seconds.
+        statuses (Counter): The number of responses per status code, `error` for transport errors.
+        tags (Counter): The number of requests per scenario specific tag, e.g. `hit` and `miss`.
+    """
+
+    def __init__(self: "Stats") -> None:
+        """Initialize empty statistics."""
+        self.latencies: list[float] = []
+        self.statuses: Counter = Counter()
+        self.tags: Counter = Counter()
+
+    def record(self: "Stats", latency: float, status: int | None, tag: str | None = None) -> None:
+        """Record the outcome of a request.
+
+        Args:
+            latency (float): The latency of the request, in seconds.
+            status (int | None): The status code of the response, or None on a transport error.
+            tag (str | None): The scenario specific tag of the request.
+        """
+        self.latencies.append(latency)
+        self.statuses["error" if status is None else str(status)] += 1
+        if tag is not None:
+            self.tags[tag] += 1
+
+    def report(self: "Stats", elapsed: float) -> dict:
+        """Summarize the statistics.
+
+        Args:
+            elapsed (float): The duration of the scenario, in seconds.
+
+        Returns:
+            dict: The requests, error rate, status codes, throughput and latency percentiles in milliseconds.
+        """
+        requests = len(self.latencies)
+        errors = sum(count for status, count in self.statuses.items() if status == "error" or int(status) >= 400)
+        ordered = sorted(self.latencies)
+        latency = {f"p{q}": round(percentile(ordered, q) * 1000, 3) for q in PERCENTILES}
+        latency["max"] = round(ordered[-1] * 1000, 3) if ordered else 0.0
+        return {
+            "requests": requests,
+            "errors": errors,
+            "error_rate": round(errors / requests, 4) if requests else 0.0,
+            "statuses": dict(self.statuses),
+            "tags": dict(self.tags),
+            "duration_s": round(elapsed, 3),
+            "throughput_rps": round(requests / elapsed, 2) if elapsed else 0.0,
+            "latency_ms": latency,
+        }
+
+
+class Scenario:
+    """
+    A traffic pattern of the API.
+
+    Subclasses prepare their data in `setup` and issue one request per `step`.
+
+    Attributes:
+        name (str): The name of the scenario.
+        client (httpx.AsyncClient): The client of the server.
+        users (int): The number of users the scenario prepares.
+        hit_ratio (float): The fraction of logins of users whose credentials are cached.
+        run_id (str): A prefix making the users of this run unique.
+    """
+
+    name = ""
+
+    def __init__(self: "Scenario", client: httpx.AsyncClient, users: int = 100, hit_ratio: float = 0.8) -> None:
+        """Initialize a scenario.
+
+        Args:
+            client (httpx.AsyncClient): The client of the server.
+            users (int): The number of users the scenario prepares.
+            hit_ratio (float): The fraction of logins of users whose credentials are cached.
+        """
+        self.client = client
+        self.users = users
+        self.hit_ratio = hit_ratio
+        self.run_id = uuid.uuid4().hex[:8]
+        self._numbers = itertools.count()
+
+    @functools.cached_property
+    def hashed_password(self: "Scenario") -> str:
+        """The bcrypt hash of `PASSWORD`, computed once per scenario."""
+        return bcrypt.hashpw(PASSWORD.encode(), bcrypt.gensalt()).decode()
+
+    def new_user(self: "Scenario") -> dict:
+        """Build the body of a new user whose password is `PASSWORD`, unique to this run."""
+        number = next(self._numbers)
+        username = f"lt{self.run_id}n{number}"
+        return {
+            "name": "Load",
+            "email": f"{username}@loadtest.example.com",
+            "username": username,
+            "hashed_password": self.hashed_password,
+        }
+
+    async def seed(self: "Scenario", count: int, batch_size: int = 1000) -> list[dict]:
+        """Create users through `POST /users/bulk`.
+
+        Args:
+            count (int): The number of users.
+            batch_size (int): The number of users per bulk request.
+
+        Returns:
+            list[dict]: The created users.
+        """
+        created = []
+        while len(created) < count:
+            body = [self.new_user() for _ in range(min(batch_size, count - len(created)))]
+            response = await self.client.post("/users/bulk", json=body)
+            response.raise_for_status()
+            created.extend(response.json()["created"])
+        return created
+
+    async def login(self: "Scenario", username: str) -> httpx.Response:
+        """Log a user in."""
+        return await self.client.post("/auth/login", data={"username": username, "password": PASSWORD})
+
+    async def setup(self: "Scenario") -> None:
+        """Prepare the data of the scenario."""
+
+    async def step(self: "Scenario") -> tuple[httpx.Response, str | None]:
+        """Issue one request.
+
+        Returns:
+            tuple[httpx.Response, str | None]: The response and the tag of the request.
+        """
+        raise NotImplementedError
+
+
+class RegistrationBurst(Scenario):
+    """New users registering through `POST /users`."""
+
+    name = "register"
+
+    async def step(self: "RegistrationBurst") -> tuple[httpx.Response, str | None]:
+        """Register a new user."""
+        return await self.client.post("/users", json=self.new_user()), None
+
+
+class LoginStorm(Scenario):
+    """
+    Users logging in through `POST /auth/login`.
+
+    A `hit_ratio` fraction of the logins are made by a small set of users who
+    already logged in, so their credentials are cached. The other logins are
+    made by users logging in for the first time, until they run out, and are
+    tagged `miss`.
+    """
+
+    name = "login"
+
+    async def setup(self: "LoginStorm") -> None:
+        """Create the users and log the hot ones in once."""
+        users = [user["username"] for user in await self.seed(self.users)]
+        hot = max(1, len(users) // 10)
+        self.hot, self.cold = users[:hot], iter(users[hot:])
+        for username in self.hot:
+            await self.login(username)
+
+    async def step(self: "LoginStorm") -> tuple[httpx.Response, str | None]:
+        """Log a hot or a cold user in."""
+        if random.random() >= self.hit_ratio:
+            username = next(self.cold, None)
+            if username is not None:
+                return await self.login(username), "miss"
+        return await self.login(random.choice(self.hot)), "hit"
+
+
+class RefreshChurn(Scenario):
+    """Clients renewing their tokens through `POST /auth/refresh`, each one following its own chain."""
+
+    name = "refresh"
+
+    async def setup(self: "RefreshChurn") -> None:
+        """Create the users and log them in."""
+        self.tokens = []
+        for user in await self.seed(max(1, self.users // 10)):
+            response = await self.login(user["username"])
+            response.raise_for_status()
+            self.tokens.append(response.json()["refresh_token"])
+
+    async def step(self: "RefreshChurn") -> tuple[httpx.Response, str | None]:
+        """Renew the tokens of a client with its latest refresh token."""
+        index = random.randrange(len(self.tokens))
+        response = await self.client.post("/auth/refresh", json={"refresh_token": self.tokens[index]})
+        if response.status_code == 200:
+            self.tokens[index] = response.json()["refresh_token"]
+        return response, None
+
+
+class PaginatedReads(Scenario):
+    """Clients reading `GET /users` page by page and looking users up through `GET /users/{id}/`."""
+
+    name = "browse"
+    page_size = 50
+    max_pages = 10
+
+    async def setup(self: "PaginatedReads") -> None:
+        """Create the users to read."""
+        self.user_ids = [user["user_id"] for user in await self.seed(self.users)]
+        self.cursor = None
+        self.pages = 0
+
+    async def step(self: "PaginatedReads") -> tuple[httpx.Response, str | None]:
+        """Read the next page, or look a random user up every other request."""
+        if random.random() < 0.5:
+            return await self.client.get(f"/users/{random.choice(self.user_ids)}/"), "lookup"
+        params = {"limit": self.page_size}
+        if self.cursor:
+            params["cursor"] = self.cursor
+        response = await self.client.get("/users", params=params)
+        self.pages += 1
+        self.cursor = None
+        if response.status_code == 200 and self.pages < self.max_pages:
+            self.cursor = response.json()["next_cursor"]
+        if self.cursor is None:
+            self.pages = 0
+        return response, "page"
+
+
+SCENARIOS = {scenario.name: scenario for scenario in (RegistrationBurst, LoginStorm, RefreshChurn, PaginatedReads)}
+
+
+async def _timed(scenario: Scenario, stats: Stats, start: float) -> None:
+    """Issue one request and record its latency from `start`."""
+    try:
+        response, tag = await scenario.step()
+    except httpx.HTTPError:
+        stats.record(time.perf_counter() - start, None)
+        return
+    stats.record(time.perf_counter() - start, response.status_code, tag)
+
+
+async def run_scenario(
+    scenario: Scenario,
+    duration: float,
+    concurrency: int,
+    rate: float | None = None,
+) -> dict:
+    """Drive a scenario and summarize its requests.
+
+    Args:
+        scenario (Scenario): The scenario, set up already.
+        duration (float): Seconds during which requests are started.
+        concurrency (int): The number of clients, or the maximum number of requests in flight with a rate.
+        rate (float | None): The mean number of requests started per second, or None for back to back requests.
+
+    Returns:
+        dict: The report of `Stats.report`, with the settings of the run.
+    """
+    stats = Stats()
+    started = time.perf_counter()
+    deadline = started + duration
+
+    if rate is None:
+
+        async def client() -> None:
+            while time.perf_counter() < deadline:
+                await _timed(scenario, stats, time.perf_counter())
+
+        await asyncio.gather(*(client() for _ in range(concurrency)))
+    else:
+        slots = asyncio.Semaphore(concurrency)
+        pending = set()
+
+        async def arrival(scheduled: float) -> None:
+            async with slots:
+                await _timed(scenario, stats, scheduled)
+
+        scheduled = started
+        while True:
+            scheduled += random.expovariate(rate)
+            if scheduled >= deadline:
+                break
+            await asyncio.sleep(max(0.0, scheduled - time.perf_counter()))
+            task = asyncio.create_task(arrival(scheduled))
+            pending.add(task)
+            task.add_done_callback(pending.discard)
+        await asyncio.gather(*pending)
+
+    report = stats.report(time.perf_counter() - started)
+    return {"scenario": scenario.name, "concurrency": concurrency, "rate": rate, **report}
+
+
+async def run(
+    base_url: str,
+    scenarios: Sequence[str],
+    duration: float,
+    concurrency: int,
+    rate: float | None = None,
+    users: int = 100,
+    hit_ratio: float = 0.8,
+) -> list[dict]:
+    """Set up and drive scenarios one after the other against a server.
+
+    Args:
+        base_url (str): The URL of the server.
+        scenarios (Sequence[str]): The names of the scenarios.
+        duration (float): Seconds each scenario runs.
+        concurrency (int): The number of clients, or the maximum number of requests in flight with a rate.
+        rate (float | None): The mean number of requests started per second, or None for back to back requests.
+        users (int): The number of users each scenario prepares.
+        hit_ratio (float): The fraction of logins of users whose credentials are cached.
+
+    Returns:
+        list[dict]: The report of every scenario.
+    """
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    reports = []
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30.0) as client:
+        for name in scenarios:
+            scenario = SCENARIOS[name](client, users=users, hit_ratio=hit_ratio)
+            await scenario.setup()
+            reports.append(await run_scenario(scenario, duration, concurrency, rate))
+    return reports
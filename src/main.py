@@ -7,15 +7,26 @@ Attributes:
 
 """
 
+import asyncio
+from contextlib import suppress
 from typing import Generator
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from logger import get_logger
+from settings import settings
 from src.api.auth import router as auth_router
+from src.api.debug import router as debug_router
+from src.api.metrics import router as metrics_router
 from src.api.users import router as users_router
+from src.api.well_known import router as well_known_router
 from src.cache import Cache
+from src.database import engine, warm_up
+from src.middleware import MetricsMiddleware, ProfilerMiddleware
+from src.repositories.users import UsersRepository
+from src.services.email import EmailService
+from src.utils.hasher import Hasher
 
 logger = get_logger(__name__)
 
@@ -36,11 +47,24 @@ async def lifespan(app: FastAPI) -> Generator:
         Generator: A generator object that yields control.
 
     """
-    Cache.get_redis_client()
+    await Cache.connect()
+    await Cache.apply_memory_budget()
     logger.critical("redis has connected")
+    invalidation_listener = asyncio.create_task(Cache.listen_invalidations())
+    Hasher.start_pool()
+    if settings.db.db_backend == "postgres":
+        primed = await warm_up(settings.db.db_warmup_connections, UsersRepository.warmup_statements())
+        logger.info(f"database pool warmed up > {primed} connections")
     yield
+    Hasher.shutdown_pool()
+    await EmailService.close_pool()
+    invalidation_listener.cancel()
+    with suppress(asyncio.CancelledError):
+        await invalidation_listener
+    await Cache.disconnect()
     Cache.close_redis_client()
     logger.critical("redis has stopped")
+    await engine.dispose()
 
 
 app = FastAPI(title="Auth Simple Server", lifespan=lifespan)
@@ -59,5 +83,13 @@ app.add_middleware(
     ],
 )
 
+if settings.profile.profile_enabled:
+    app.add_middleware(ProfilerMiddleware)
+
+app.add_middleware(MetricsMiddleware)
+
 app.include_router(auth_router)
 app.include_router(users_router)
+app.include_router(well_known_router)
+app.include_router(metrics_router)
+app.include_router(debug_router)
@@ -0,0 +1,329 @@
+"""
+Lightweight metrics in the Prometheus text exposition format.
+
+Metrics are recorded on the event loop thread with plain arithmetic on
+preallocated children, so recording takes no lock and costs a dictionary
+lookup and an addition. Values that already live elsewhere, like pool usage,
+are not recorded at all: collectors read them when `/metrics` is scraped.
+
+Attributes:
+    registry (Registry): The registry rendered by `/metrics`.
+    REQUEST_DURATION (Histogram): The latency of HTTP requests per method, route and status.
+    REQUESTS_IN_FLIGHT (Gauge): The number of HTTP requests being handled per method and route.
+    REDIS_COMMAND_DURATION (Histogram): The latency of Redis commands per command.
+    REDIS_COMMAND_ERRORS (Counter): The number of failed or timed out Redis commands per command.
+    CACHE_REQUESTS (Counter): The number of Redis cache lookups per result.
+    REQUEST_DB_DURATION (Histogram): The time HTTP requests spend executing SQL statements per method and route.
+    REQUEST_DB_QUERIES (Histogram): The number of SQL statements HTTP requests execute per method and route.
+    DB_REPEATED_QUERIES (Counter): The number of statements repeated within one request, per method and route.
+    DB_SLOW_QUERIES (Counter): The number of SQL statements slower than the slow query threshold.
+
+"""
+
+import math
+from bisect import bisect_left
+from collections.abc import Callable, Iterable, Sequence
+
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _format_value(value: float) -> str:
+    """Format a sample value."""
+    if value == math.inf:
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    """Escape a label value."""
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    """Format a label set."""
+    if not names:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values)) + "}"
+
+
+class _Metric:
+    """Base class of the metric families.
+
+    Attributes:
+        name (str): The name of the metric.
+        documentation (str): The help text of the metric.
+        labelnames (tuple[str, ...]): The names of the labels.
+    """
+
+    kind = "untyped"
+
+    def __init__(self: "_Metric", name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        """Initialize a metric family without children.
+
+        Args:
+            name (str): The name of the metric.
+            documentation (str): The help text of the metric.
+            labelnames (Sequence[str]): The names of the labels.
+        """
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: dict[tuple, object] = {}
+        if not self.labelnames:
+            self._children[()] = self._new_child()
+
+    def _new_child(self: "_Metric") -> object:
+        raise NotImplementedError
+
+    def labels(self: "_Metric", *values: str) -> object:
+        """Get the child of a label set, creating it on first use.
+
+        Args:
+            values (str): The label values, in the order of `labelnames`.
+
+        Returns:
+            object: The child recording the values of the label set.
+        """
+        child = self._children.get(values)
+        if child is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}")
+            child = self._children[values] = self._new_child()
+        return child
+
+    def samples(self: "_Metric") -> Iterable[tuple[str, tuple, tuple, float]]:
+        """Yield the `(suffix, label names, label values, value)` of every sample."""
+        raise NotImplementedError
+
+    def render(self: "_Metric") -> list[str]:
+        """Render the metric family in the text exposition format.
+
+        Returns:
+            list[str]: The lines of the family.
+        """
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        for suffix, names, values, value in self.samples():
+            lines.append(f"{self.name}{suffix}{_format_labels(names, values)} {_format_value(value)}")
+        return lines
+
+
+class _Value:
+    """A single number recorded by a counter or a gauge child."""
+
+    __slots__ = ("value",)
+
+    def __init__(self: "_Value") -> None:
+        self.value = 0.0
+
+    def inc(self: "_Value", amount: float = 1.0) -> None:
+        """Increase the value."""
+        self.value += amount
+
+    def dec(self: "_Value", amount: float = 1.0) -> None:
+        """Decrease the value."""
+        self.value -= amount
+
+    def set(self: "_Value", value: float) -> None:
+        """Replace the value."""
+        self.value = value
+
+
+class Counter(_Metric):
+    """A monotonically increasing count, e.g. of requests or errors."""
+
+    kind = "counter"
+
+    def _new_child(self: "Counter") -> _Value:
+        return _Value()
+
+    def inc(self: "Counter", amount: float = 1.0) -> None:
+        """Increase the counter without labels."""
+        self._children[()].value += amount
+
+    def samples(self: "Counter") -> Iterable[tuple[str, tuple, tuple, float]]:
+        """Yield the value of every label set."""
+        for values, child in self._children.items():
+            yield "", self.labelnames, values, child.value
+
+
+class Gauge(Counter):
+    """A value that goes up and down, e.g. the number of requests in flight."""
+
+    kind = "gauge"
+
+    def set(self: "Gauge", value: float) -> None:
+        """Replace the value of the gauge without labels."""
+        self._children[()].value = value
+
+
+class _Buckets:
+    """The observations of a histogram child."""
+
+    __slots__ = ("bounds", "counts", "sum")
+
+    def __init__(self: "_Buckets", bounds: tuple[float, ...]) -> None:
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+
+    def observe(self: "_Buckets", value: float) -> None:
+        """Record one observation."""
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+
+
+class Histogram(_Metric):
+    """A distribution of observations, e.g. of request latencies in seconds.
+
+    Attributes:
+        buckets (tuple[float, ...]): The upper bounds of the buckets, without `+Inf`.
+    """
+
+    kind = "histogram"
+
+    def __init__(
+        self: "Histogram",
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> None:
+        """Initialize a histogram family without children.
+
+        Args:
+            name (str): The name of the metric.
+            documentation (str): The help text of the metric.
+            labelnames (Sequence[str]): The names of the labels.
+            buckets (Sequence[float]): The upper bounds of the buckets.
+        """
+        self.buckets = tuple(sorted(buckets))
+        super().__init__(name, documentation, labelnames)
+
+    def _new_child(self: "Histogram") -> _Buckets:
+        return _Buckets(self.buckets)
+
+    def observe(self: "Histogram", value: float) -> None:
+        """Record one observation without labels."""
+        self._children[()].observe(value)
+
+    def samples(self: "Histogram") -> Iterable[tuple[str, tuple, tuple, float]]:
+        """Yield the cumulative buckets, the sum and the count of every label set."""
+        names = self.labelnames + ("le",)
+        for values, child in self._children.items():
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), child.counts):
+                cumulative += count
+                yield "_bucket", names, values + (_format_value(bound),), cumulative
+            yield "_sum", self.labelnames, values, child.sum
+            yield "_count", self.labelnames, values, cumulative
+
+
+class Registry:
+    """
+    The `Registry` class holds the metric families and the collectors of an application.
+
+    A collector is called on every scrape and returns families describing the
+    current state of a component, so that state costs nothing between scrapes.
+    """
+
+    def __init__(self: "Registry") -> None:
+        """Initialize an empty registry."""
+        self._metrics: list[_Metric] = []
+        self._collectors: list[Callable[[], Iterable[_Metric]]] = []
+
+    def register(self: "Registry", metric: _Metric) -> _Metric:
+        """Register a metric family.
+
+        Args:
+            metric (_Metric): The metric family.
+
+        Returns:
+            _Metric: The registered family.
+        """
+        self._metrics.append(metric)
+        return metric
+
+    def register_collector(
+        self: "Registry",
+        collector: Callable[[], Iterable[_Metric]],
+    ) -> Callable[[], Iterable[_Metric]]:
+        """Register a function building metric families at scrape time.
+
+        Args:
+            collector (Callable[[], Iterable[_Metric]]): The function.
+
+        Returns:
+            Callable[[], Iterable[_Metric]]: The registered function, so this method can be used as a decorator.
+        """
+        self._collectors.append(collector)
+        return collector
+
+    def render(self: "Registry") -> str:
+        """Render every family in the text exposition format.
+
+        Returns:
+            str: The exposition.
+        """
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        for collector in self._collectors:
+            for metric in collector():
+                lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+REQUEST_DURATION = registry.register(
+    Histogram(
+        "http_request_duration_seconds",
+        "Latency of HTTP requests.",
+        ("method", "route", "status"),
+    ),
+)
+REQUESTS_IN_FLIGHT = registry.register(
+    Gauge("http_requests_in_flight", "HTTP requests being handled.", ("method", "route")),
+)
+REDIS_COMMAND_DURATION = registry.register(
+    Histogram(
+        "redis_command_duration_seconds",
+        "Latency of Redis commands.",
+        ("command",),
+        buckets=(0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0),
+    ),
+)
+REDIS_COMMAND_ERRORS = registry.register(
+    Counter("redis_command_errors_total", "Redis commands that failed or timed out.", ("command",)),
+)
+CACHE_REQUESTS = registry.register(
+    Counter("cache_requests_total", "Redis cache lookups.", ("result",)),
+)
+REQUEST_DB_DURATION = registry.register(
+    Histogram(
+        "http_request_db_duration_seconds",
+        "Time HTTP requests spend executing SQL statements.",
+        ("method", "route"),
+        buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5),
+    ),
+)
+REQUEST_DB_QUERIES = registry.register(
+    Histogram(
+        "http_request_db_queries",
+        "SQL statements executed per HTTP request.",
+        ("method", "route"),
+        buckets=(0, 1, 2, 5, 10, 20, 50, 100),
+    ),
+)
+DB_REPEATED_QUERIES = registry.register(
+    Counter(
+        "db_repeated_queries_total",
+        "SQL statements executed repeatedly within one HTTP request.",
+        ("method", "route"),
+    ),
+)
+DB_SLOW_QUERIES = registry.register(
+    Counter("db_slow_queries_total", "SQL statements slower than the slow query threshold."),
+)
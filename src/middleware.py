@@ -0,0 +1,209 @@
+"""ASGI middlewares of the application."""
+
+import random
+import secrets
+import time
+
+from starlette.routing import Match
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from logger import get_logger
+from settings import settings
+from src.database import QueryStats, query_stats
+from src.metrics import (
+    DB_REPEATED_QUERIES,
+    REQUEST_DB_DURATION,
+    REQUEST_DB_QUERIES,
+    REQUEST_DURATION,
+    REQUESTS_IN_FLIGHT,
+)
+from src.profiler import Profiler, profiler
+
+logger = get_logger(__name__)
+
+
+ROUTE_TEMPLATES_SIZE = 1024
+
+_route_templates: dict[str, str] = {}
+
+
+def route_template(scope: Scope) -> str:
+    """Find the path template of the route matching a request, `unmatched` if there is none.
+
+    Once the application handled a request, the template is read from the route
+    the router stored in `scope["route"]`. Before that, or when no route
+    matched, it is read from the templates of the last `ROUTE_TEMPLATES_SIZE`
+    paths, and the routes are only scanned for a path not seen recently.
+    """
+    path = scope["path"]
+    route = scope.get("route")
+    if route is not None:
+        template = route.path
+    elif (template := _route_templates.get(path)) is not None:
+        return template
+    else:
+        partial = None
+        for candidate in scope["app"].router.routes:
+            match, _ = candidate.matches(scope)
+            if match == Match.FULL:
+                template = candidate.path
+                break
+            if match == Match.PARTIAL and partial is None:
+                partial = candidate.path
+        else:
+            template = partial or "unmatched"
+    if _route_templates.get(path) != template:
+        if len(_route_templates) >= ROUTE_TEMPLATES_SIZE:
+            del _route_templates[next(iter(_route_templates))]
+        _route_templates[path] = template
+    return template
+
+
+class MetricsMiddleware:
+    """
+    Record the latency, the concurrency and the SQL statements of HTTP requests per route.
+
+    Requests are labelled with the path template of the matching route, e.g.
+    `/users/{user_id}/`, so path parameters do not create new series. Requests
+    matching no route share the `unmatched` label. The in-flight gauge is
+    labelled before the request is routed, by `route_template`, the other
+    metrics with the route the router matched.
+
+    Every request gets a `QueryStats` in `query_stats`, filled by the engine
+    events of `src.database`. Its statement count and time are recorded per
+    route, and statements repeated `db_repeated_query_threshold` times or
+    more are logged as a likely N+1 query pattern.
+
+    Attributes:
+        app (ASGIApp): The wrapped application.
+    """
+
+    def __init__(self: "MetricsMiddleware", app: ASGIApp) -> None:
+        """Wrap an application.
+
+        Args:
+            app (ASGIApp): The application to wrap.
+        """
+        self.app = app
+
+    async def __call__(self: "MetricsMiddleware", scope: Scope, receive: Receive, send: Send) -> None:
+        """Handle a request, recording its metrics when it is an HTTP request.
+
+        Args:
+            scope (Scope): The connection scope.
+            receive (Receive): The channel of incoming messages.
+            send (Send): The channel of outgoing messages.
+        """
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        in_flight = REQUESTS_IN_FLIGHT.labels(method, route_template(scope))
+        in_flight.value += 1
+        stats = QueryStats()
+        token = query_stats.set(stats)
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            in_flight.value -= 1
+            route = route_template(scope)
+            REQUEST_DURATION.labels(method, route, str(status)).observe(time.perf_counter() - start)
+            query_stats.reset(token)
+            self._record_queries(method, route, stats)
+
+    @staticmethod
+    def _record_queries(method: str, route: str, stats: QueryStats) -> None:
+        """Record the SQL statements of a request and report the repeated ones."""
+        REQUEST_DB_QUERIES.labels(method, route).observe(stats.count)
+        REQUEST_DB_DURATION.labels(method, route).observe(stats.duration)
+        for statement, count in stats.repeated(settings.db.db_repeated_query_threshold):
+            DB_REPEATED_QUERIES.labels(method, route).inc()
+            logger.warning(
+                "repeated query > %s %s ran %d times: %s",
+                method,
+                route,
+                count,
+                statement,
+                extra={"route": f"{method} {route}", "executions": count, "statement": statement},
+            )
+
+
+class ProfilerMiddleware:
+    """
+    Profile a sample of HTTP requests with the sampling profiler.
+
+    A request is profiled when a random draw falls below `sample_rate`, when
+    its route is in `routes`, or when it carries the profile token in its
+    `X-Profile-Token` header. Its samples are labelled with its method and
+    route. Requests that are not profiled only pay for the selection.
+
+    Attributes:
+        app (ASGIApp): The wrapped application.
+        profiler (Profiler): The profiler sampling the requests.
+        sample_rate (float): The fraction of requests profiled.
+        routes (frozenset[str]): The route templates whose requests are all profiled.
+        token (bytes): The token profiling a request sent with it, empty to disable.
+    """
+
+    def __init__(
+        self: "ProfilerMiddleware",
+        app: ASGIApp,
+        profiler: Profiler = profiler,
+        sample_rate: float | None = None,
+        routes: str | None = None,
+        token: str | None = None,
+    ) -> None:
+        """Wrap an application.
+
+        Args:
+            app (ASGIApp): The application to wrap.
+            profiler (Profiler): The profiler sampling the requests.
+            sample_rate (float | None): The fraction of requests profiled, by default `PROFILE_SAMPLE_RATE`.
+            routes (str | None): Route templates separated by commas, by default `PROFILE_ROUTES`.
+            token (str | None): The token profiling a request sent with it, by default `PROFILE_TOKEN`.
+        """
+        self.app = app
+        self.profiler = profiler
+        self.sample_rate = settings.profile.profile_sample_rate if sample_rate is None else sample_rate
+        routes = settings.profile.profile_routes if routes is None else routes
+        self.routes = frozenset(route.strip() for route in routes.split(",") if route.strip())
+        self.token = (settings.profile.profile_token if token is None else token).encode()
+
+    def _selected(self: "ProfilerMiddleware", scope: Scope) -> bool:
+        """Tell whether a request is profiled."""
+        if random.random() < self.sample_rate:
+            return True
+        if self.token:
+            for key, value in scope["headers"]:
+                if key == b"x-profile-token" and secrets.compare_digest(value, self.token):
+                    return True
+        return bool(self.routes) and route_template(scope) in self.routes
+
+    async def __call__(self: "ProfilerMiddleware", scope: Scope, receive: Receive, send: Send) -> None:
+        """Handle a request, profiling it when it is selected.
+
+        Args:
+            scope (Scope): The connection scope.
+            receive (Receive): The channel of incoming messages.
+            send (Send): The channel of outgoing messages.
+        """
+        if scope["type"] != "http" or not self._selected(scope):
+            await self.app(scope, receive, send)
+            return
+
+        coro = self.app(scope, receive, send)
+        key = self.profiler.register(f"{scope['method']} {route_template(scope)}", coro)
+        try:
+            await coro
+        finally:
+            self.profiler.unregister(key)
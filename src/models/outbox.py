@@ -0,0 +1,78 @@
+"""
+Module that contains the `OutboxOrm` model.
+
+Classes:
+    `OutboxOrm`: The model representing a message waiting for delivery in the outbox.
+
+Attributes:
+    VERIFICATION_EMAIL_TOPIC (str): The topic of messages delivering a verification email.
+
+"""
+
+import enum
+from uuid import uuid4
+
+from sqlalchemy import TIMESTAMP, Enum, Index, Integer, String, func
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+from sqlalchemy.orm import mapped_column
+
+from src.database import Base
+
+VERIFICATION_EMAIL_TOPIC = "verification_email"
+
+
+class OutboxStatus(enum.Enum):
+    """An enumeration of the delivery states of an outbox message.
+
+    Attributes:
+        PENDING (str): The message waits for (another) delivery attempt.
+        SENT (str): The message was delivered.
+        DEAD (str): The message exhausted its attempts and was dead-lettered.
+    """
+
+    PENDING = "PENDING"
+    SENT = "SENT"
+    DEAD = "DEAD"
+
+
+class OutboxOrm(Base):
+    """
+    The OutboxOrm model represents a message waiting for delivery in the outbox.
+
+    Rows are written in the same transaction as the change that produces them
+    and are delivered later by the outbox worker.
+
+    Attributes:
+        __tablename__ (str): The name of the table in the database.
+        __table_args__ (tuple): Table level options, including the index used to claim due messages.
+        id (UUID): The unique identifier of the message, also used as its idempotency key.
+        topic (str): The kind of message, which selects the delivery handler.
+        payload (dict): The data needed to deliver the message.
+        status (OutboxStatus): The delivery state of the message.
+        attempts (int): The number of failed delivery attempts.
+        available_at (datetime): The moment the message may be claimed for delivery.
+        created_at (datetime): The timestamp when the message was written.
+        sent_at (datetime): The timestamp when the message was delivered.
+        last_error (str): The error of the last failed attempt.
+    """
+
+    __tablename__ = "outbox"
+    __table_args__ = (Index("ix_outbox_status_available_at", "status", "available_at"),)
+
+    id = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid4)
+    topic = mapped_column(String, nullable=False)
+    payload = mapped_column(JSONB, nullable=False)
+    status = mapped_column(Enum(OutboxStatus), default=OutboxStatus.PENDING, nullable=False)
+    attempts = mapped_column(Integer, default=0, nullable=False)
+    available_at = mapped_column(
+        TIMESTAMP(timezone=True),
+        nullable=False,
+        server_default=func.now(),
+    )
+    created_at = mapped_column(
+        TIMESTAMP(timezone=True),
+        nullable=False,
+        server_default=func.now(),
+    )
+    sent_at = mapped_column(TIMESTAMP(timezone=True), nullable=True)
+    last_error = mapped_column(String, nullable=True)
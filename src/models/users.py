@@ -9,7 +9,7 @@ Classes:
 import enum
 from uuid import uuid4
 
-from sqlalchemy import TIMESTAMP, Boolean, Enum, String, text
+from sqlalchemy import TIMESTAMP, Boolean, Enum, Index, String, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import mapped_column
 
@@ -34,6 +34,7 @@ class UserOrm(Base):
 
     Attributes:
         __tablename__ (str): The name of the table in the database.
+        __table_args__ (tuple): Table level options, including the keyset pagination index.
         user_id (UUID): The unique identifier of the user.
         name (str): The name of the user.
         email (str): The email address of the user.
@@ -46,6 +47,7 @@ class UserOrm(Base):
     """
 
     __tablename__ = "user"
+    __table_args__ = (Index("ix_user_register_at_user_id", "register_at", "user_id"),)
 
     user_id = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid4)
     name = mapped_column(String, nullable=False, info={"validate": {"regex": r"^[а-яА-Яa-zA-Z\-]+$"}})
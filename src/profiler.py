@@ -0,0 +1,177 @@
+"""Sampling profiler of requests.
+
+A `Profiler` samples the stacks of the requests registered with it from a
+background thread, every `interval` seconds. A request running on the event
+loop contributes the frames of the loop thread above its coroutine; a
+suspended request contributes the chain of coroutines it is awaiting, ended by
+`[await]`, so time spent waiting on the database, Redis or the hashing pool
+shows up next to the CPU time spent in the request itself.
+
+Samples are aggregated as collapsed stacks, one `label;frame;...;frame count`
+line per stack, the input format of flamegraph tools. The label of a request
+is its method and route, e.g. `GET /users/{user_id}/`. Requests are
+registered by `ProfilerMiddleware`; the profile of this worker is served by
+`GET /debug/profile`.
+
+Attributes:
+    AWAIT (str): The leaf frame of the samples of a suspended request.
+    TRUNCATED (str): The frame replacing new stacks once `max_stacks` are recorded.
+    profiler (Profiler): The profiler of the application.
+"""
+
+import itertools
+import sys
+import threading
+import time
+from collections import Counter
+from collections.abc import Coroutine
+from types import FrameType
+
+from settings import settings
+
+AWAIT = "[await]"
+TRUNCATED = "[truncated]"
+
+
+def _frame_name(frame: FrameType) -> str:
+    """Name a frame after its module and function, e.g. `src.services.users:UsersService.get_auth_user`."""
+    return f"{frame.f_globals.get('__name__', '?')}:{frame.f_code.co_qualname}"
+
+
+class Profiler:
+    """
+    Sample the stacks of registered requests from a background thread.
+
+    The thread starts with the first registered request and sleeps while no
+    request is registered.
+
+    Attributes:
+        interval (float): Seconds between two samples.
+        max_stacks (int): The number of distinct stacks recorded before new ones are truncated.
+        stacks (Counter): The number of samples per collapsed stack.
+        samples (int): The number of samples taken.
+    """
+
+    def __init__(self: "Profiler", interval: float = 0.005, max_stacks: int = 10_000) -> None:
+        """Initialize a new instance of the `Profiler` class.
+
+        Args:
+            interval (float): Seconds between two samples.
+            max_stacks (int): The number of distinct stacks recorded before new ones are truncated.
+        """
+        self.interval = interval
+        self.max_stacks = max_stacks
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self._active: dict[int, tuple[str, Coroutine, int]] = {}
+        self._keys = itertools.count()
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def register(self: "Profiler", label: str, coro: Coroutine) -> int:
+        """Start sampling a request.
+
+        Args:
+            label (str): The label of the samples of the request.
+            coro (Coroutine): The coroutine handling the request, run by the calling thread.
+
+        Returns:
+            int: The key to unregister the request with.
+        """
+        key = next(self._keys)
+        self._active[key] = (label, coro, threading.get_ident())
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name="profiler", daemon=True)
+                    self._thread.start()
+        self._wake.set()
+        return key
+
+    def unregister(self: "Profiler", key: int) -> None:
+        """Stop sampling a request.
+
+        Args:
+            key (int): The key returned by `register`.
+        """
+        self._active.pop(key, None)
+
+    @staticmethod
+    def _running_stack(coro: Coroutine, frame: FrameType | None) -> list[str] | None:
+        """Read the frames above a running coroutine, outermost first, or None if it is not on the stack."""
+        names = []
+        while frame is not None:
+            names.append(_frame_name(frame))
+            if frame is coro.cr_frame:
+                names.reverse()
+                return names
+            frame = frame.f_back
+        return None
+
+    @staticmethod
+    def _awaiting_stack(coro: Coroutine) -> list[str]:
+        """Read the chain of coroutines a suspended coroutine awaits, outermost first."""
+        names = []
+        awaitable = coro
+        while awaitable is not None:
+            frame = getattr(awaitable, "cr_frame", None) or getattr(awaitable, "gi_frame", None)
+            if frame is None:
+                break
+            names.append(_frame_name(frame))
+            awaitable = getattr(awaitable, "cr_await", None) or getattr(awaitable, "gi_yieldfrom", None)
+        names.append(AWAIT)
+        return names
+
+    def sample(self: "Profiler") -> None:
+        """Record the stack of every registered request once."""
+        frames = sys._current_frames()
+        for label, coro, thread_id in list(self._active.values()):
+            if coro.cr_running:
+                stack = self._running_stack(coro, frames.get(thread_id))
+            elif coro.cr_frame is not None:
+                stack = self._awaiting_stack(coro)
+            else:
+                stack = None
+            if not stack:
+                continue
+            key = ";".join([label, *stack])
+            with self._lock:
+                if key not in self.stacks and len(self.stacks) >= self.max_stacks:
+                    key = f"{label};{TRUNCATED}"
+                self.stacks[key] += 1
+                self.samples += 1
+
+    def collapsed(self: "Profiler", label: str | None = None) -> str:
+        """Render the samples as collapsed stacks, the most frequent first.
+
+        Args:
+            label (str | None): Only render the stacks of this label, e.g. `POST /auth/login`.
+
+        Returns:
+            str: One `stack count` line per stack.
+        """
+        with self._lock:
+            stacks = self.stacks.most_common()
+        prefix = None if label is None else f"{label};"
+        return "".join(f"{stack} {count}\n" for stack, count in stacks if prefix is None or stack.startswith(prefix))
+
+    def reset(self: "Profiler") -> None:
+        """Forget the recorded samples."""
+        with self._lock:
+            self.stacks.clear()
+            self.samples = 0
+
+    def _run(self: "Profiler") -> None:
+        """Sample the registered requests every `interval`, sleeping while there are none."""
+        while True:
+            if not self._active:
+                self._wake.clear()
+                if not self._active:
+                    self._wake.wait()
+                continue
+            self.sample()
+            time.sleep(self.interval)
+
+
+profiler = Profiler(settings.profile.profile_interval, settings.profile.profile_max_stacks)
@@ -1,11 +1,18 @@
 """This module defines an abstract base class for Repository implementations."""
 
 from abc import ABC, abstractmethod
-from typing import Generic, TypeVar
+from collections.abc import AsyncIterator, Sequence
+from contextlib import asynccontextmanager
+from itertools import batched
+from typing import Generic, Type, TypeVar
 
-from sqlalchemy import insert, select, update
+from sqlalchemy import Executable, Row, bindparam, delete, func, insert, literal, select, tuple_, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.database import async_session
+from src.database import async_session, engine
+from src.utils.statements import statement_cache
+from src.utils.unitofwork import current_uow
 
 
 class AbstractRepository(ABC):
@@ -20,9 +27,16 @@ class AbstractRepository(ABC):
 
     Methods:
         add_one(): Add a new instance of the model to the database.
+        add_many(): Add many instances of the model in batches, skipping conflicting rows.
+        copy_many(): Bulk load rows through COPY into a staging table, skipping conflicting rows.
+        existing_values(): Retrieve which of the given values of a column are already stored.
         find_one(filter_by): Retrieve a single instance of the model from the database,
             filtered by the given attributes.
         find_all(): Retrieve all instances of the model from the database.
+        exists(filter_by): Check whether any instance of the model matches the given attributes.
+        count(filter_by): Count the instances of the model matching the given attributes.
+        find_page(): Retrieve one keyset-paginated page of instances of the model.
+        stream_rows(): Stream selected columns of all rows in batches through a server-side cursor.
         update_one(): Update a single instance of the model in the database.
         delete_one(): Delete a single instance of the model from the database.
     """
@@ -31,6 +45,18 @@ class AbstractRepository(ABC):
     async def add_one():
         raise NotImplementedError
 
+    @abstractmethod
+    async def add_many():
+        raise NotImplementedError
+
+    @abstractmethod
+    async def copy_many():
+        raise NotImplementedError
+
+    @abstractmethod
+    async def existing_values():
+        raise NotImplementedError
+
     @abstractmethod
     async def find_one():
         raise NotImplementedError
@@ -39,6 +65,22 @@ class AbstractRepository(ABC):
     async def find_all():
         raise NotImplementedError
 
+    @abstractmethod
+    async def exists():
+        raise NotImplementedError
+
+    @abstractmethod
+    async def count():
+        raise NotImplementedError
+
+    @abstractmethod
+    async def find_page():
+        raise NotImplementedError
+
+    @abstractmethod
+    async def stream_rows():
+        raise NotImplementedError
+
     @abstractmethod
     async def update_one():
         raise NotImplementedError
@@ -56,10 +98,88 @@ class SQLAlchemyRepository(AbstractRepository, Generic[T]):
 
     Attributes:
         model: A SQLAlchemy ORM model that this repository handles.
+
+    Inside a `UnitOfWork`, the methods run on its session and leave the commit
+    to it. Otherwise every method opens its own session and commits its writes.
+    Instances hold no state, so one instance can serve every request.
+
+    Updates and deletes are single `UPDATE ... RETURNING` and `DELETE ... RETURNING`
+    statements returning plain rows, so no instance is loaded or tracked beforehand.
+
+    Lookups, updates and deletes reuse statement templates with bound parameters
+    from `statement_cache`, keyed by the filtered and updated columns, so a
+    repeated call only binds its values.
     """
 
     model: T | None = None
 
+    @asynccontextmanager
+    async def _session(self: "SQLAlchemyRepository") -> AsyncIterator[AsyncSession]:
+        """Provide the session of the active unit of work, or a new session."""
+        uow = current_uow.get()
+        if uow is not None:
+            yield uow.session
+            return
+        async with async_session() as session:
+            yield session
+
+    @classmethod
+    def _statement(
+        cls: Type["SQLAlchemyRepository"],
+        kind: str,
+        filter_by: dict,
+        data: dict | None = None,
+    ) -> tuple[Executable, dict]:
+        """
+        Get the cached statement template of a call and the parameters to execute it with.
+
+        Filter values are bound as `filter_<column>` and updated values as
+        `value_<column>`. A None filter value is rendered as `IS NULL`, like
+        `filter_by` does, and is part of the shape of the statement.
+
+        Args:
+            kind (str): The kind of the statement: `find`, `exists`, `update` or `delete`.
+            filter_by (dict): A dictionary of attribute names and values to filter by.
+            data (dict | None): A dictionary containing the data to be updated.
+
+        Returns:
+            tuple[Executable, dict]: The statement template and its parameters.
+        """
+        data = data or {}
+        shape = tuple((name, value is None) for name, value in filter_by.items())
+        key = (cls.model, kind, shape, tuple(data))
+
+        def build() -> Executable:
+            attributes = [(getattr(cls.model, name), name, is_null) for name, is_null in shape]
+            where = [
+                attribute.is_(None) if is_null else attribute == bindparam(f"filter_{name}")
+                for attribute, name, is_null in attributes
+            ]
+            columns = cls.model.__table__.columns
+            if kind == "find":
+                return select(cls.model).where(*where)
+            if kind == "exists":
+                return select(select(literal(1)).select_from(cls.model).where(*where).exists())
+            if kind == "update":
+                values = {name: bindparam(f"value_{name}") for name in data}
+                return update(cls.model).where(*where).values(values).returning(*columns)
+            if kind == "delete":
+                return delete(cls.model).where(*where).returning(*columns)
+            raise ValueError(f"Unknown statement kind: {kind}")
+
+        params = {f"filter_{name}": value for name, value in filter_by.items() if value is not None}
+        params.update((f"value_{name}", value) for name, value in data.items())
+        return statement_cache.get(key, build), params
+
+    @staticmethod
+    async def _commit(session: AsyncSession) -> None:
+        """Commit a session opened by `_session`, or only flush it when it belongs to a unit of work."""
+        uow = current_uow.get()
+        if uow is not None and uow.session is session:
+            await session.flush()
+        else:
+            await session.commit()
+
     async def add_one(self: "SQLAlchemyRepository", data: dict) -> T:
         """
         Add a new instance of the model to the database.
@@ -70,13 +190,97 @@ class SQLAlchemyRepository(AbstractRepository, Generic[T]):
         Returns:
             T: The newly created instance of the model.
         """
-        async with async_session() as session:
+        async with self._session() as session:
             stmt = insert(self.model).values(**data).returning(self.model)
             res = await session.execute(stmt)
-            await session.commit()
+            await self._commit(session)
             model = res.scalar_one()
             return model
 
+    async def add_many(
+        self: "SQLAlchemyRepository",
+        data: Sequence[dict],
+        key: str,
+        batch_size: int = 500,
+    ) -> list[T | None]:
+        """
+        Add many instances of the model using batched multi-row INSERT ... RETURNING.
+
+        Each batch is a single `INSERT ... ON CONFLICT DO NOTHING RETURNING` statement
+        committed on its own, so a row violating a unique constraint is skipped
+        instead of aborting its batch. Inside a unit of work, all batches share its transaction.
+
+        Args:
+            data (Sequence[dict]): The rows to insert.
+            key (str): A unique column used to match returned instances to input rows.
+                Its values must be distinct across `data`.
+            batch_size (int): The number of rows per INSERT statement.
+
+        Returns:
+            list[T | None]: For every input row, the created instance, or None if the row conflicted.
+        """
+        results = []
+        async with self._session() as session:
+            for batch in batched(data, batch_size):
+                stmt = pg_insert(self.model).values(batch).on_conflict_do_nothing().returning(self.model)
+                res = await session.execute(stmt)
+                created = {getattr(model, key): model for model in res.scalars()}
+                await self._commit(session)
+                results.extend(created.get(row[key]) for row in batch)
+        return results
+
+    async def copy_many(self: "SQLAlchemyRepository", columns: Sequence[str], records: Sequence[tuple]) -> int:
+        """
+        Bulk load rows into the model's table through PostgreSQL COPY.
+
+        The records are streamed with asyncpg's binary COPY into a temporary staging
+        table shaped like the target table, then merged with a single
+        `INSERT ... SELECT ... ON CONFLICT DO NOTHING`. The staging table is dropped
+        when the transaction commits, so every call is independent.
+
+        Args:
+            columns (Sequence[str]): The names of the columns, in record order.
+            records (Sequence[tuple]): The rows to load. Columns without a server
+                default must be provided.
+
+        Returns:
+            int: The number of inserted rows. The other rows conflicted with existing ones.
+        """
+        table = self.model.__table__.name
+        staging = f"{table}_staging"
+        column_list = ", ".join(f'"{column}"' for column in columns)
+        async with engine.connect() as connection:
+            raw_connection = await connection.get_raw_connection()
+            driver_connection = raw_connection.driver_connection
+            async with driver_connection.transaction():
+                await driver_connection.execute(
+                    f'CREATE TEMP TABLE "{staging}" (LIKE "{table}" INCLUDING DEFAULTS) ON COMMIT DROP'
+                )
+                await driver_connection.copy_records_to_table(staging, records=records, columns=list(columns))
+                status = await driver_connection.execute(
+                    f'INSERT INTO "{table}" ({column_list}) '
+                    f'SELECT {column_list} FROM "{staging}" ON CONFLICT DO NOTHING'
+                )
+        return int(status.rsplit(" ", 1)[-1])
+
+    async def existing_values(self: "SQLAlchemyRepository", column: str, values: Sequence) -> set:
+        """
+        Retrieve which of the given values of a column are already stored.
+
+        Args:
+            column (str): The name of the column.
+            values (Sequence): The values to look for.
+
+        Returns:
+            set: The subset of `values` present in the column.
+        """
+        if not values:
+            return set()
+        attribute = getattr(self.model, column)
+        async with self._session() as session:
+            res = await session.execute(select(attribute).where(attribute.in_(values)))
+            return set(res.scalars().all())
+
     async def find_one(self: "SQLAlchemyRepository", filter_by: dict) -> T | None:
         """
         Retrieve a single instance of the model from the database, filtered by the given attributes.
@@ -87,10 +291,10 @@ class SQLAlchemyRepository(AbstractRepository, Generic[T]):
         Returns:
             T: The instance of the model that matches the given filter, or None if no match is found.
         """
-        async with async_session() as session:
-            query = select(self.model).filter_by(**filter_by)
-            res = await session.execute(query)
-            model = res.scalar_one()
+        async with self._session() as session:
+            query, params = self._statement("find", filter_by)
+            res = await session.execute(query, params)
+            model = res.scalar_one_or_none()
             return model
 
     async def find_all(self: "SQLAlchemyRepository") -> list[T] | None:
@@ -100,44 +304,156 @@ class SQLAlchemyRepository(AbstractRepository, Generic[T]):
         Returns:
             list[T] | None: A list of all instances of the model, or None if no instances are found.
         """
-        async with async_session() as session:
+        async with self._session() as session:
             query = select(self.model)
             res = await session.execute(query)
             models = res.scalars().all()
             return models
 
-    async def update_one(self: "SQLAlchemyRepository", filter_by: dict, data: dict) -> T | None:
+    async def exists(self: "SQLAlchemyRepository", filter_by: dict) -> bool:
         """
-        Update a single instance of the model in the database, filtered by the given attributes.
+        Check whether any instance of the model matches the given attributes.
 
         Args:
             filter_by (dict): A dictionary of attribute names and values to filter by.
-            data (dict): A dictionary containing the data to be updated.
 
         Returns:
-            T | None: The instance of the model that was updated, or None if no match is found.
+            bool: True if at least one instance matches the filter.
+        """
+        async with self._session() as session:
+            query, params = self._statement("exists", filter_by)
+            res = await session.execute(query, params)
+            return bool(res.scalar())
+
+    async def count(self: "SQLAlchemyRepository", filter_by: dict | None = None) -> int:
+        """
+        Count the instances of the model matching the given attributes.
+
+        Args:
+            filter_by (dict | None): A dictionary of attribute names and values to filter by.
+
+        Returns:
+            int: The number of matching instances.
+        """
+        async with self._session() as session:
+            query = select(func.count()).select_from(self.model).filter_by(**(filter_by or {}))
+            res = await session.execute(query)
+            return res.scalar_one()
+
+    async def find_page(
+        self: "SQLAlchemyRepository",
+        order_by: Sequence[str],
+        limit: int,
+        after: Sequence | None = None,
+        filter_by: dict | None = None,
+        columns: Sequence[str] | None = None,
+    ) -> tuple[list[T] | list[Row], tuple | None]:
+        """
+        Retrieve one page of instances of the model using keyset pagination.
+
+        Rows are ordered by the `order_by` columns, which together must be unique,
+        and the page starts right after the row whose key equals `after`. The
+        comparison is a row value comparison, so an index on the same columns
+        serves every page with a range scan regardless of its depth.
+
+        Args:
+            order_by (Sequence[str]): The names of the columns forming the sort key.
+            limit (int): The maximum number of instances in the page.
+            after (Sequence | None): The sort key of the last row of the previous page.
+            filter_by (dict | None): A dictionary of attribute names and values to filter by.
+            columns (Sequence[str] | None): The names of the columns to read into plain rows
+                instead of loading instances. The sort key columns are always read.
+
+        Returns:
+            tuple[list[T] | list[Row], tuple | None]: The instances or rows of the page and
+                the sort key to continue from, or None if this is the last page.
+        """
+        key = [getattr(self.model, name) for name in order_by]
+        entities = [self.model]
+        if columns is not None:
+            entities = [getattr(self.model, name) for name in dict.fromkeys([*columns, *order_by])]
+        async with self._session() as session:
+            query = select(*entities).filter_by(**(filter_by or {})).order_by(*key).limit(limit + 1)
+            if after is not None:
+                query = query.where(tuple_(*key) > tuple_(*after))
+            res = await session.execute(query)
+            models = list(res.all() if columns is not None else res.scalars().all())
+        if len(models) <= limit:
+            return models, None
+        models = models[:limit]
+        return models, tuple(getattr(models[-1], name) for name in order_by)
+
+    async def stream_rows(
+        self: "SQLAlchemyRepository",
+        columns: Sequence[str],
+        filter_by: dict | None = None,
+        batch_size: int = 1000,
+    ) -> AsyncIterator[Sequence]:
         """
+        Stream selected columns of the model's rows in batches.
+
+        The rows are read through a server-side cursor and are yielded as plain
+        row tuples, so no ORM instances are created and at most `batch_size` rows
+        are held in memory. The session stays open until the iteration ends, so it
+        never belongs to a unit of work, which may end while a response is still streamed.
+
+        Args:
+            columns (Sequence[str]): The names of the columns to select, in row order.
+            filter_by (dict | None): A dictionary of attribute names and values to filter by.
+            batch_size (int): The number of rows fetched from the cursor per batch.
+
+        Yields:
+            Sequence: A batch of row tuples.
+        """
+        query = (
+            select(*(getattr(self.model, name) for name in columns))
+            .filter_by(**(filter_by or {}))
+            .execution_options(yield_per=batch_size)
+        )
         async with async_session() as session:
-            stmt = update(self.model).filter_by(**filter_by).values(**data).returning(self.model)
-            result = await session.execute(stmt)
-            await session.commit()
-            model = result.scalar()
-            return model
+            result = await session.stream(query)
+            async for batch in result.partitions():
+                yield batch
+
+    async def update_one(self: "SQLAlchemyRepository", filter_by: dict, data: dict) -> Row | None:
+        """
+        Update a single instance of the model in the database, filtered by the given attributes.
 
-    async def delete_one(self: "SQLAlchemyRepository", filter_by: dict) -> T | None:
+        The update is one `UPDATE ... RETURNING` statement returning the columns
+        of the updated row, so the row is neither selected nor loaded first, and
+        the returned values are the new ones even when the session already holds
+        an instance of the row.
+
+        Args:
+            filter_by (dict): A dictionary of attribute names and values to filter by.
+            data (dict): A dictionary containing the data to be updated.
+
+        Returns:
+            Row | None: The updated row, whose columns are readable as attributes, or None if no match is found.
+        """
+        async with self._session() as session:
+            stmt, params = self._statement("update", filter_by, data)
+            result = await session.execute(stmt, params)
+            row = result.one_or_none()
+            await self._commit(session)
+            return row
+
+    async def delete_one(self: "SQLAlchemyRepository", filter_by: dict) -> Row | None:
         """
         Delete a single instance of the model from the database, filtered by the given attributes.
 
+        The deletion is one `DELETE ... RETURNING` statement returning the columns
+        of the deleted row, so the row is neither selected nor loaded first.
+
         Args:
             filter_by (dict): A dictionary of attribute names and values to filter by.
 
         Returns:
-            T | None: The instance of the model that was deleted, or None if no match is found.
+            Row | None: The deleted row, whose columns are readable as attributes, or None if no match is found.
         """
-        async with async_session() as session:
-            query = select(self.model).filter_by(**filter_by)
-            res = await session.execute(query)
-            model = res.scalar_one()
-            await session.delete(model)
-            await session.commit()
-            return model
+        async with self._session() as session:
+            stmt, params = self._statement("delete", filter_by)
+            result = await session.execute(stmt, params)
+            row = result.one_or_none()
+            await self._commit(session)
+            return row
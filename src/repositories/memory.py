@@ -0,0 +1,493 @@
+"""
+Defines in-memory repositories, for running the service layer without PostgreSQL.
+
+The rows of every table live in the process, in `MemoryTable` instances shared
+by all the repositories of the table. Unique columns are enforced like the
+database does, column defaults are applied on insert and server-side timestamp
+defaults are set to the current UTC time. Writes are applied immediately: a
+unit of work does not make them atomic and its rollback does not undo them.
+
+They are selected with `DB_BACKEND=memory` and meant for tests and benchmarks.
+
+Classes:
+    MemoryTable: The rows of one table and the indexes of its unique columns.
+    InMemoryRepository: An implementation of AbstractRepository storing rows in memory.
+    InMemoryUsersRepository: The in-memory counterpart of UsersRepository.
+    InMemoryOutboxRepository: The in-memory counterpart of OutboxRepository.
+
+Attributes:
+    tables (dict[str, MemoryTable]): The tables of the process, by table name.
+
+"""
+
+import datetime
+import uuid
+from collections.abc import AsyncIterator, Sequence
+from itertools import batched
+from typing import Generic, TypeVar
+
+from sqlalchemy import DateTime, Table
+from sqlalchemy.exc import IntegrityError
+
+from src.models.outbox import OutboxOrm, OutboxStatus
+from src.models.users import UserOrm
+from src.repositories.abstract import AbstractRepository
+from src.repositories.users import AuthRecord
+
+T = TypeVar("T")
+
+
+class MemoryTable:
+    """
+    The rows of one table, keyed by primary key, and the indexes of its unique columns.
+
+    Attributes:
+        table (Table): The table the rows belong to.
+        key (str): The name of the primary key column.
+        rows (dict): The rows as dictionaries of column values, by primary key.
+    """
+
+    def __init__(self: "MemoryTable", table: Table) -> None:
+        """Initialize an empty table.
+
+        Args:
+            table (Table): The table the rows belong to.
+        """
+        self.table = table
+        self.rows: dict = {}
+        self.key = next(iter(table.primary_key.columns)).name
+        self._unique = {column.name: {} for column in table.columns if column.unique and not column.primary_key}
+
+    def new_row(self: "MemoryTable", data: dict) -> dict:
+        """Complete the values of a row with the column defaults."""
+        row = {}
+        for column in self.table.columns:
+            if column.name in data:
+                row[column.name] = data[column.name]
+            elif column.default is not None and column.default.is_callable:
+                row[column.name] = column.default.arg(None)
+            elif column.default is not None and column.default.is_scalar:
+                row[column.name] = column.default.arg
+            elif column.server_default is not None and isinstance(column.type, DateTime):
+                row[column.name] = datetime.datetime.now(datetime.timezone.utc)
+            else:
+                row[column.name] = None
+        return row
+
+    def conflict(self: "MemoryTable", row: dict, key: object = None) -> str | None:
+        """Find the unique column whose value is taken by another row, if any."""
+        if key is None and row[self.key] in self.rows:
+            return self.key
+        for name, index in self._unique.items():
+            owner = index.get(row[name], key)
+            if row[name] is not None and owner != key:
+                return name
+        return None
+
+    def find(self: "MemoryTable", filter_by: dict | None) -> list[dict]:
+        """Find the rows whose values equal the given attributes, through an index when one applies."""
+        if not filter_by:
+            return list(self.rows.values())
+        if self.key in filter_by:
+            row = self.rows.get(filter_by[self.key])
+            candidates = [row] if row is not None else []
+        else:
+            name = next((name for name in filter_by if name in self._unique), None)
+            if name is not None:
+                key = self._unique[name].get(filter_by[name])
+                candidates = [self.rows[key]] if key is not None else []
+            else:
+                candidates = self.rows.values()
+        items = filter_by.items()
+        return [row for row in candidates if all(row[name] == value for name, value in items)]
+
+    def insert(self: "MemoryTable", row: dict) -> None:
+        """Store a new row."""
+        key = row[self.key]
+        self.rows[key] = row
+        for name, index in self._unique.items():
+            index[row[name]] = key
+
+    def update(self: "MemoryTable", row: dict, values: dict) -> None:
+        """Change the values of a stored row."""
+        key = row[self.key]
+        for name, index in self._unique.items():
+            if name in values:
+                index.pop(row[name], None)
+                index[values[name]] = key
+        row.update(values)
+
+    def delete(self: "MemoryTable", row: dict) -> None:
+        """Remove a stored row."""
+        del self.rows[row[self.key]]
+        for name, index in self._unique.items():
+            index.pop(row[name], None)
+
+    def clear(self: "MemoryTable") -> None:
+        """Remove every row."""
+        self.rows.clear()
+        for index in self._unique.values():
+            index.clear()
+
+
+tables: dict[str, MemoryTable] = {}
+
+
+class InMemoryRepository(AbstractRepository, Generic[T]):
+    """InMemoryRepository is an implementation of AbstractRepository storing rows in memory.
+
+    Attributes:
+        model: A SQLAlchemy ORM model that this repository handles.
+
+    The methods have the signatures and the results of `SQLAlchemyRepository`:
+    instances and rows are returned as detached instances of the model.
+    """
+
+    model: T | None = None
+
+    @property
+    def table(self: "InMemoryRepository") -> MemoryTable:
+        """The rows of the model's table."""
+        name = self.model.__tablename__
+        if name not in tables:
+            tables[name] = MemoryTable(self.model.__table__)
+        return tables[name]
+
+    def _instance(self: "InMemoryRepository", row: dict) -> T:
+        """Build a detached instance of the model from a row."""
+        return self.model(**row)
+
+    def _matches(self: "InMemoryRepository", filter_by: dict | None) -> list[dict]:
+        """Find the rows whose values equal the given attributes."""
+        return self.table.find(filter_by)
+
+    def _integrity_error(self: "InMemoryRepository", column: str) -> IntegrityError:
+        """Build the error the database raises on a unique violation."""
+        table = self.model.__tablename__
+        return IntegrityError(f"INSERT INTO {table}", None, ValueError(f"duplicate key value violates {column}"))
+
+    async def add_one(self: "InMemoryRepository", data: dict) -> T:
+        """
+        Add a new instance of the model.
+
+        Args:
+            data (dict): A dictionary containing the data to be inserted.
+
+        Returns:
+            T: The newly created instance of the model.
+
+        Raises:
+            IntegrityError: If a unique column value is already taken.
+        """
+        row = self.table.new_row(data)
+        column = self.table.conflict(row)
+        if column is not None:
+            raise self._integrity_error(column)
+        self.table.insert(row)
+        return self._instance(row)
+
+    async def add_many(
+        self: "InMemoryRepository",
+        data: Sequence[dict],
+        key: str,
+        batch_size: int = 500,
+    ) -> list[T | None]:
+        """
+        Add many instances of the model, skipping conflicting rows.
+
+        Args:
+            data (Sequence[dict]): The rows to insert.
+            key (str): A unique column used to match returned instances to input rows.
+            batch_size (int): Unused, kept for compatibility with `SQLAlchemyRepository`.
+
+        Returns:
+            list[T | None]: For every input row, the created instance, or None if the row conflicted.
+        """
+        results = []
+        for data_row in data:
+            row = self.table.new_row(data_row)
+            if self.table.conflict(row) is not None:
+                results.append(None)
+                continue
+            self.table.insert(row)
+            results.append(self._instance(row))
+        return results
+
+    async def copy_many(self: "InMemoryRepository", columns: Sequence[str], records: Sequence[tuple]) -> int:
+        """
+        Bulk load rows, skipping conflicting rows.
+
+        Args:
+            columns (Sequence[str]): The names of the columns, in record order.
+            records (Sequence[tuple]): The rows to load.
+
+        Returns:
+            int: The number of inserted rows.
+        """
+        created = await self.add_many([dict(zip(columns, record)) for record in records], key=columns[0])
+        return sum(instance is not None for instance in created)
+
+    async def existing_values(self: "InMemoryRepository", column: str, values: Sequence) -> set:
+        """
+        Retrieve which of the given values of a column are already stored.
+
+        Args:
+            column (str): The name of the column.
+            values (Sequence): The values to look for.
+
+        Returns:
+            set: The subset of `values` present in the column.
+        """
+        wanted = set(values)
+        return {row[column] for row in self.table.rows.values() if row[column] in wanted}
+
+    async def find_one(self: "InMemoryRepository", filter_by: dict) -> T | None:
+        """
+        Retrieve a single instance of the model, filtered by the given attributes.
+
+        Args:
+            filter_by (dict): A dictionary of attribute names and values to filter by.
+
+        Returns:
+            T | None: The matching instance, or None if no match is found.
+        """
+        rows = self._matches(filter_by)
+        return self._instance(rows[0]) if rows else None
+
+    async def find_all(self: "InMemoryRepository") -> list[T]:
+        """
+        Retrieve all instances of the model.
+
+        Returns:
+            list[T]: All instances of the model.
+        """
+        return [self._instance(row) for row in self.table.rows.values()]
+
+    async def exists(self: "InMemoryRepository", filter_by: dict) -> bool:
+        """
+        Check whether any instance of the model matches the given attributes.
+
+        Args:
+            filter_by (dict): A dictionary of attribute names and values to filter by.
+
+        Returns:
+            bool: True if at least one instance matches the filter.
+        """
+        return bool(self._matches(filter_by))
+
+    async def count(self: "InMemoryRepository", filter_by: dict | None = None) -> int:
+        """
+        Count the instances of the model matching the given attributes.
+
+        Args:
+            filter_by (dict | None): A dictionary of attribute names and values to filter by.
+
+        Returns:
+            int: The number of matching instances.
+        """
+        return len(self._matches(filter_by))
+
+    async def find_page(
+        self: "InMemoryRepository",
+        order_by: Sequence[str],
+        limit: int,
+        after: Sequence | None = None,
+        filter_by: dict | None = None,
+        columns: Sequence[str] | None = None,
+    ) -> tuple[list[T], tuple | None]:
+        """
+        Retrieve one page of instances of the model using keyset pagination.
+
+        Args:
+            order_by (Sequence[str]): The names of the columns forming the sort key.
+            limit (int): The maximum number of instances in the page.
+            after (Sequence | None): The sort key of the last row of the previous page.
+            filter_by (dict | None): A dictionary of attribute names and values to filter by.
+            columns (Sequence[str] | None): Unused, the instances hold every column.
+
+        Returns:
+            tuple[list[T], tuple | None]: The instances of the page and the sort key to
+                continue from, or None if this is the last page.
+        """
+
+        def sort_key(row: dict) -> tuple:
+            return tuple(row[name] for name in order_by)
+
+        rows = sorted(self._matches(filter_by), key=sort_key)
+        if after is not None:
+            after = tuple(after)
+            rows = [row for row in rows if sort_key(row) > after]
+        page = [self._instance(row) for row in rows[:limit]]
+        return page, sort_key(rows[limit - 1]) if len(rows) > limit else None
+
+    async def stream_rows(
+        self: "InMemoryRepository",
+        columns: Sequence[str],
+        filter_by: dict | None = None,
+        batch_size: int = 1000,
+    ) -> AsyncIterator[Sequence]:
+        """
+        Stream selected columns of the model's rows in batches.
+
+        Args:
+            columns (Sequence[str]): The names of the columns to select, in row order.
+            filter_by (dict | None): A dictionary of attribute names and values to filter by.
+            batch_size (int): The number of rows per batch.
+
+        Yields:
+            Sequence: A batch of row tuples.
+        """
+        rows = [tuple(row[name] for name in columns) for row in self._matches(filter_by)]
+        for batch in batched(rows, batch_size):
+            yield batch
+
+    async def update_one(self: "InMemoryRepository", filter_by: dict, data: dict) -> T | None:
+        """
+        Update a single instance of the model, filtered by the given attributes.
+
+        Args:
+            filter_by (dict): A dictionary of attribute names and values to filter by.
+            data (dict): A dictionary containing the data to be updated.
+
+        Returns:
+            T | None: The updated instance, or None if no match is found.
+
+        Raises:
+            IntegrityError: If a unique column value is already taken.
+        """
+        rows = self._matches(filter_by)
+        if not rows:
+            return None
+        row = rows[0]
+        column = self.table.conflict({**row, **data}, key=row[self.table.key])
+        if column is not None:
+            raise self._integrity_error(column)
+        self.table.update(row, data)
+        return self._instance(row)
+
+    async def delete_one(self: "InMemoryRepository", filter_by: dict) -> T | None:
+        """
+        Delete a single instance of the model, filtered by the given attributes.
+
+        Args:
+            filter_by (dict): A dictionary of attribute names and values to filter by.
+
+        Returns:
+            T | None: The deleted instance, or None if no match is found.
+        """
+        rows = self._matches(filter_by)
+        if not rows:
+            return None
+        self.table.delete(rows[0])
+        return self._instance(rows[0])
+
+
+class InMemoryUsersRepository(InMemoryRepository[UserOrm]):
+    """The in-memory counterpart of `UsersRepository`.
+
+    Attributes:
+        model (Type[UserOrm]): The model that this repository handles.
+    """
+
+    model = UserOrm
+
+    async def find_auth_record(self: "InMemoryUsersRepository", username: str) -> AuthRecord | None:
+        """
+        Retrieve the credentials of a user for the login.
+
+        Args:
+            username (str): The username of the user.
+
+        Returns:
+            AuthRecord | None: The credentials of the user, or None if no user has this username.
+        """
+        rows = self._matches({"username": username})
+        if not rows:
+            return None
+        row = rows[0]
+        return AuthRecord(row["user_id"], row["username"], row["hashed_password"], row["disabled"], row["role"])
+
+
+class InMemoryOutboxRepository(InMemoryRepository[OutboxOrm]):
+    """The in-memory counterpart of `OutboxRepository`.
+
+    Attributes:
+        model (Type[OutboxOrm]): The model that this repository handles.
+    """
+
+    model = OutboxOrm
+
+    @staticmethod
+    def _now() -> datetime.datetime:
+        """Return the current UTC time."""
+        return datetime.datetime.now(datetime.timezone.utc)
+
+    async def enqueue(self: "InMemoryOutboxRepository", topic: str, payloads: Sequence[dict]) -> None:
+        """
+        Write messages of one topic to the outbox.
+
+        Args:
+            topic (str): The kind of the messages.
+            payloads (Sequence[dict]): The payload of every message.
+        """
+        for payload in payloads:
+            self.table.insert(self.table.new_row({"topic": topic, "payload": payload}))
+
+    async def claim_batch(self: "InMemoryOutboxRepository", limit: int, lease_seconds: float) -> list[OutboxOrm]:
+        """
+        Claim due messages for delivery, pushing their `available_at` forward by the lease.
+
+        Args:
+            limit (int): The maximum number of messages to claim.
+            lease_seconds (float): How long the claimed messages stay invisible to other workers.
+
+        Returns:
+            list[OutboxOrm]: The claimed messages, oldest first.
+        """
+        now = self._now()
+        due = [
+            row
+            for row in self.table.rows.values()
+            if row["status"] == OutboxStatus.PENDING and row["available_at"] <= now
+        ]
+        due = sorted(due, key=lambda row: row["available_at"])[:limit]
+        for row in due:
+            row["available_at"] = now + datetime.timedelta(seconds=lease_seconds)
+        return [self._instance(row) for row in sorted(due, key=lambda row: row["created_at"])]
+
+    async def mark_sent(self: "InMemoryOutboxRepository", message_ids: Sequence[uuid.UUID]) -> None:
+        """
+        Record the delivery of messages.
+
+        Args:
+            message_ids (Sequence[uuid.UUID]): The identifiers of the delivered messages.
+        """
+        for message_id in message_ids:
+            row = self.table.rows.get(message_id)
+            if row is not None:
+                row.update(status=OutboxStatus.SENT, sent_at=self._now(), last_error=None)
+
+    async def mark_failed(
+        self: "InMemoryOutboxRepository",
+        message_id: uuid.UUID,
+        attempts: int,
+        error: str,
+        retry_in: float | None,
+    ) -> None:
+        """
+        Record a failed delivery attempt.
+
+        Args:
+            message_id (uuid.UUID): The identifier of the message.
+            attempts (int): The number of failed attempts including this one.
+            error (str): The error of this attempt.
+            retry_in (float | None): Seconds until the next attempt, or None to dead-letter the message.
+        """
+        row = self.table.rows.get(message_id)
+        if row is None:
+            return
+        row.update(attempts=attempts, last_error=error[:1000])
+        if retry_in is None:
+            row["status"] = OutboxStatus.DEAD
+        else:
+            row["available_at"] = self._now() + datetime.timedelta(seconds=retry_in)
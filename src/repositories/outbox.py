@@ -0,0 +1,123 @@
+"""
+Defines a repository for handling operations on outbox messages.
+
+Classes:
+    OutboxRepository: A subclass of SQLAlchemyRepository that handles operations on OutboxOrm model instances.
+
+Attributes:
+    model (Type[OutboxOrm]): The model that this repository handles.
+
+"""
+
+import datetime
+import uuid
+from collections.abc import Sequence
+
+from sqlalchemy import func, insert, select, update
+
+from src.models.outbox import OutboxOrm, OutboxStatus
+from src.repositories.abstract import SQLAlchemyRepository
+
+
+class OutboxRepository(SQLAlchemyRepository[OutboxOrm]):
+    """A repository for handling operations on outbox messages.
+
+    Attributes:
+        model (Type[OutboxOrm]): The model that this repository handles.
+
+    Besides the generic operations, this class claims due messages for delivery
+    and records the outcome of delivery attempts.
+    """
+
+    model = OutboxOrm
+
+    async def enqueue(self: "OutboxRepository", topic: str, payloads: Sequence[dict]) -> None:
+        """
+        Write messages of one topic to the outbox.
+
+        Args:
+            topic (str): The kind of the messages.
+            payloads (Sequence[dict]): The payload of every message.
+        """
+        if not payloads:
+            return
+        async with self._session() as session:
+            await session.execute(insert(self.model), [{"topic": topic, "payload": payload} for payload in payloads])
+            await self._commit(session)
+
+    async def claim_batch(self: "OutboxRepository", limit: int, lease_seconds: float) -> list[OutboxOrm]:
+        """
+        Claim due messages for delivery.
+
+        Due pending messages are locked with `FOR UPDATE SKIP LOCKED`, so concurrent
+        workers never claim the same message, and their `available_at` is pushed
+        forward by the lease. A worker that dies before recording the outcome
+        therefore releases its messages once the lease expires.
+
+        Args:
+            limit (int): The maximum number of messages to claim.
+            lease_seconds (float): How long the claimed messages stay invisible to other workers.
+
+        Returns:
+            list[OutboxOrm]: The claimed messages, oldest first.
+        """
+        due = (
+            select(self.model.id)
+            .where(self.model.status == OutboxStatus.PENDING, self.model.available_at <= func.now())
+            .order_by(self.model.available_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        stmt = (
+            update(self.model)
+            .where(self.model.id.in_(due.scalar_subquery()))
+            .values(available_at=func.now() + datetime.timedelta(seconds=lease_seconds))
+            .returning(self.model)
+        )
+        async with self._session() as session:
+            res = await session.execute(stmt)
+            await self._commit(session)
+            return sorted(res.scalars().all(), key=lambda message: message.created_at)
+
+    async def mark_sent(self: "OutboxRepository", message_ids: Sequence[uuid.UUID]) -> None:
+        """
+        Record the delivery of messages.
+
+        Args:
+            message_ids (Sequence[uuid.UUID]): The identifiers of the delivered messages.
+        """
+        if not message_ids:
+            return
+        stmt = (
+            update(self.model)
+            .where(self.model.id.in_(message_ids))
+            .values(status=OutboxStatus.SENT, sent_at=func.now(), last_error=None)
+        )
+        async with self._session() as session:
+            await session.execute(stmt)
+            await self._commit(session)
+
+    async def mark_failed(
+        self: "OutboxRepository",
+        message_id: uuid.UUID,
+        attempts: int,
+        error: str,
+        retry_in: float | None,
+    ) -> None:
+        """
+        Record a failed delivery attempt.
+
+        Args:
+            message_id (uuid.UUID): The identifier of the message.
+            attempts (int): The number of failed attempts including this one.
+            error (str): The error of this attempt.
+            retry_in (float | None): Seconds until the next attempt, or None to dead-letter the message.
+        """
+        values = {"attempts": attempts, "last_error": error[:1000]}
+        if retry_in is None:
+            values["status"] = OutboxStatus.DEAD
+        else:
+            values["available_at"] = func.now() + datetime.timedelta(seconds=retry_in)
+        async with self._session() as session:
+            await session.execute(update(self.model).where(self.model.id == message_id).values(**values))
+            await self._commit(session)
@@ -2,6 +2,10 @@
 
 Classes:
     SUser: Pydantic schema representing a user.
+    SUserPage: Pydantic schema representing a page of users.
+    SBulkCreateResult: Pydantic schema representing the outcome of a bulk creation.
+    SImportReport: Pydantic schema representing the progress of a CSV import.
+    SAuthUser: Pydantic schema holding the credentials of a user.
 
 Attributes:
     None
@@ -54,7 +58,8 @@ class SUser(BaseModelConfig):
     The User schema.
 
     This schema is used to serialize and deserialize the data
-    for a user.
+    for a user. Instances are frozen, so the in-process cache can
+    hand the same instance to every request.
 
     Attributes:
         user_id (UUID): The unique identifier of the user.
@@ -64,6 +69,8 @@ class SUser(BaseModelConfig):
         role (Role): The role of the user.
     """
 
+    model_config = ConfigDict(from_attributes=True, frozen=True)
+
     user_id: UUID
     name: str
     email: EmailStr
@@ -71,6 +78,87 @@ class SUser(BaseModelConfig):
     role: Role
 
 
+class SUserPage(BaseModelConfig):
+    """
+    The User page schema.
+
+    This schema is used to serialize one page of users
+    returned by keyset pagination.
+
+    Attributes:
+        items (list[SUser]): The users of the page.
+        next_cursor (str | None): The opaque cursor of the next page, or None if this is the last page.
+    """
+
+    items: list[SUser]
+    next_cursor: str | None = None
+
+
+class SBulkError(BaseModelConfig):
+    """
+    The bulk creation error schema.
+
+    This schema describes why one row of a bulk creation request
+    was not created.
+
+    Attributes:
+        index (int): The position of the row in the request.
+        field (str): The field that conflicted, `email` or `username`.
+        detail (str): A human readable description of the conflict.
+    """
+
+    index: int
+    field: str
+    detail: str
+
+
+class SBulkCreateResult(BaseModelConfig):
+    """
+    The bulk creation result schema.
+
+    Attributes:
+        created (list[SUser]): The users that were created, in request order.
+        errors (list[SBulkError]): The rows that were not created.
+    """
+
+    created: list[SUser]
+    errors: list[SBulkError]
+
+
+class SImportError(BaseModelConfig):
+    """
+    The import error schema.
+
+    Attributes:
+        row (int): The number of the rejected data row, starting at 1 after the header.
+        detail (str): Why the row was rejected.
+    """
+
+    row: int
+    detail: str
+
+
+class SImportReport(BaseModelConfig):
+    """
+    The import report schema.
+
+    This schema describes the progress or the outcome of a CSV user import.
+
+    Attributes:
+        rows (int): The number of data rows read so far.
+        inserted (int): The number of users created.
+        skipped (int): The number of valid rows skipped because the email or username already exists.
+        rejected (int): The number of rows that failed validation.
+        errors (list[SImportError]): The first rejected rows, up to the reporting limit.
+    """
+
+    rows: int = 0
+    inserted: int = 0
+    skipped: int = 0
+    rejected: int = 0
+    errors: list[SImportError] = []
+
+
 class SUpdateUser(BaseModelConfig):
     """
     UpdateUser schema.
@@ -88,3 +176,25 @@ class SUpdateUser(BaseModelConfig):
     name: constr(strip_whitespace=True, min_length=1) | None = None
     email: EmailStr | None = None
     hashed_password: constr(min_length=5) | None = None
+
+
+class SAuthUser(BaseModelConfig):
+    """
+    The authenticated User schema.
+
+    This schema holds the credentials needed to authenticate a user
+    and is what the login path keeps in the cache.
+
+    Attributes:
+        user_id (UUID): The unique identifier of the user.
+        username (str): The username of the user.
+        hashed_password (str): The hashed password of the user.
+        disabled (bool | None): Indicates if the user is disabled.
+        role (Role): The role of the user.
+    """
+
+    user_id: UUID
+    username: str
+    hashed_password: str
+    disabled: bool | None = None
+    role: Role
@@ -1,22 +1,121 @@
 """Email tasks module."""
 
-import smtplib
+import asyncio
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 from email.message import EmailMessage
 from typing import Type
 
+from aiosmtplib import SMTP, SMTPConnectError, SMTPException, SMTPServerDisconnected
+
 from logger import get_logger
 from settings import settings
 from src.utils.jwt import create_access_token
 
 logger = get_logger(__name__)
 
+EMAIL_DOMAIN = "example.com"
+
+
+class SmtpPool:
+    """
+    A bounded pool of long-lived authenticated SMTP connections.
+
+    Connections are opened on demand, logged in once and reused for every
+    following message, so a burst of emails pays the TCP, TLS and AUTH round
+    trips once per connection instead of once per message. The pool size also
+    caps the number of concurrent sends. A connection that turns out to be
+    dropped by the server is discarded and the message is retried on a fresh one.
+
+    Attributes:
+        size (int): The maximum number of open connections.
+    """
+
+    def __init__(self: "SmtpPool", size: int) -> None:
+        """Initialize an empty pool.
+
+        Args:
+            size (int): The maximum number of open connections.
+        """
+        self.size = size
+        self._semaphore = asyncio.Semaphore(size)
+        self._idle: list[SMTP] = []
+
+    async def _connect(self: "SmtpPool") -> SMTP:
+        """Open and authenticate a new connection to the configured server."""
+        smtp = SMTP(
+            hostname=settings.smtp.email_host,
+            port=settings.smtp.email_port,
+            username=settings.smtp.email_user or None,
+            password=settings.smtp.email_password or None,
+            use_tls=settings.smtp.email_use_tls,
+            start_tls=settings.smtp.email_start_tls,
+            timeout=settings.smtp.email_timeout,
+        )
+        await smtp.connect()
+        return smtp
+
+    @asynccontextmanager
+    async def connection(self: "SmtpPool") -> AsyncIterator[SMTP]:
+        """Borrow a connection, waiting while all of them are busy.
+
+        The connection goes back to the pool when the block succeeds and is
+        closed when the block raises, since its state is then unknown.
+
+        Yields:
+            SMTP: A connected and authenticated client.
+        """
+        async with self._semaphore:
+            smtp = self._idle.pop() if self._idle else None
+            if smtp is None or not smtp.is_connected:
+                smtp = await self._connect()
+            try:
+                yield smtp
+            except BaseException:
+                smtp.close()
+                raise
+            self._idle.append(smtp)
+
+    async def send(self: "SmtpPool", message: EmailMessage, retries: int = 1) -> None:
+        """Send a message, reconnecting when the server dropped the connection.
+
+        Args:
+            message (EmailMessage): The message to send.
+            retries (int): The number of retries on a fresh connection.
+
+        Raises:
+            SMTPException: If the message can not be sent.
+        """
+        for attempt in range(retries + 1):
+            try:
+                async with self.connection() as smtp:
+                    await smtp.send_message(message)
+                return
+            except (SMTPServerDisconnected, SMTPConnectError) as e:
+                if attempt == retries:
+                    raise
+                logger.warning(f"SMTP connection lost, reconnecting. Error: {e}")
+
+    async def close(self: "SmtpPool") -> None:
+        """Close all idle connections.
+
+        Returns:
+            None: This function does not return anything.
+        """
+        while self._idle:
+            smtp = self._idle.pop()
+            try:
+                await smtp.quit()
+            except SMTPException:
+                smtp.close()
+
 
 class EmailService:
     """
     The `EmailService` class provides a service layer for sending verification emails to users.
 
     Attributes:
-        None
+        pool (SmtpPool | None): The pool of SMTP connections, created on first use.
 
     Methods:
         get_verification_email_template: Generates a HTML email template for user verification.
@@ -24,6 +123,30 @@ class EmailService:
         send_email: Sends an email for user verification.
     """
 
+    pool: SmtpPool | None = None
+
+    @classmethod
+    def get_pool(cls: Type["EmailService"]) -> SmtpPool:
+        """Get the pool of SMTP connections, creating it if needed.
+
+        Returns:
+            SmtpPool: The pool of SMTP connections.
+        """
+        if cls.pool is None:
+            cls.pool = SmtpPool(size=settings.smtp.email_pool_size)
+        return cls.pool
+
+    @classmethod
+    async def close_pool(cls: Type["EmailService"]) -> None:
+        """Close the pool of SMTP connections if it is open.
+
+        Returns:
+            None: This function does not return anything.
+        """
+        if cls.pool is not None:
+            await cls.pool.close()
+            cls.pool = None
+
     @classmethod
     def get_verification_email_template(cls: Type["EmailService"], username: str, token: str) -> str:
         """Generate a HTML email template for user verification.
@@ -48,20 +171,29 @@ class EmailService:
         """
 
     @classmethod
-    def get_email_message(cls: Type["EmailService"], username: str, email: str) -> EmailMessage:
+    def get_email_message(
+        cls: Type["EmailService"],
+        username: str,
+        email: str,
+        message_id: str | None = None,
+    ) -> EmailMessage:
         """Generate an email message for user verification.
 
         Args:
             username (str): The username of the user.
             email (str): The email address of the user.
+            message_id (str | None): A stable identifier of the message. When given, it becomes
+                the `Message-ID` header, so a redelivered message can be recognized as a duplicate.
 
         Returns:
             email.message.EmailMessage: The email message with the verification link.
         """
         email_message = EmailMessage()
         email_message["Subject"] = "Подтверждение регистрации"
-        email_message["From"] = "verification_email_tempv@example.com"
+        email_message["From"] = f"verification_email_tempv@{EMAIL_DOMAIN}"
         email_message["To"] = email
+        if message_id is not None:
+            email_message["Message-ID"] = f"<{message_id}@{EMAIL_DOMAIN}>"
 
         token = create_access_token(data={"username": username, "email": email})
         template = EmailService.get_verification_email_template(username, token)
@@ -73,23 +205,27 @@ class EmailService:
         return email_message
 
     @classmethod
-    def send_email(cls: Type["EmailService"], username: str, email: str) -> None:
+    async def send_email(
+        cls: Type["EmailService"],
+        username: str,
+        email: str,
+        message_id: str | None = None,
+    ) -> None:
         """Send an email for user verification.
 
         Args:
             username (str): The username of the user.
             email (str): The email address of the user.
+            message_id (str | None): A stable identifier of the message, see `get_email_message`.
 
         Raises:
-            smtplib.SMTPException: If there is an error sending the email.
+            aiosmtplib.SMTPException: If there is an error sending the email.
             Exception: If there is an error in getting the email template or sending the email.
         """
         try:
-            email_message = EmailService.get_email_message(username, email)
-            with smtplib.SMTP_SSL(host=settings.smtp.email_host, port=settings.smtp.email_port) as server:
-                server.login(user=settings.smtp.email_user, password=settings.smtp.email_password)
-                server.send_message(email_message)
-        except smtplib.SMTPException as e:
+            email_message = EmailService.get_email_message(username, email, message_id)
+            await cls.get_pool().send(email_message)
+        except SMTPException as e:
             logger.error(f"Failed to send email to {email}. Error: {e}")
             raise e
         except Exception as e:
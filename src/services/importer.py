@@ -0,0 +1,154 @@
+"""The `UsersImporter` class loads users from a streamed CSV file."""
+
+import codecs
+import csv
+import uuid
+from collections.abc import AsyncIterator, Callable
+
+from pydantic import ValidationError
+
+from logger import get_logger
+from src.models.users import Role
+from src.repositories.users import UsersRepository
+from src.schemas.users import SCreateUser, SImportError, SImportReport
+
+logger = get_logger(__name__)
+
+
+class ImportHeaderError(ValueError):
+    """Raised when the CSV header lacks a required column."""
+
+
+COPY_COLUMNS = ("user_id", "name", "email", "username", "hashed_password", "role", "disabled", "email_verified")
+
+
+async def csv_records(chunks: AsyncIterator[bytes]) -> AsyncIterator[list[str]]:
+    """Parse CSV records from a stream of UTF-8 encoded chunks.
+
+    Only the current record is buffered, so the stream can be arbitrarily large.
+    Quoted fields may contain line breaks.
+
+    Args:
+        chunks (AsyncIterator[bytes]): The raw chunks of the file.
+
+    Yields:
+        list[str]: The fields of one record.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    tail = ""
+    record = ""
+    in_quotes = False
+    async for chunk in chunks:
+        lines = (tail + decoder.decode(chunk)).split("\n")
+        tail = lines.pop()
+        for line in lines:
+            record += line + "\n"
+            in_quotes ^= line.count('"') % 2 == 1
+            if not in_quotes:
+                if record.strip():
+                    yield next(csv.reader([record]))
+                record = ""
+    record += tail + decoder.decode(b"", final=True)
+    if record.strip():
+        yield next(csv.reader([record]))
+
+
+class UsersImporter:
+    """
+    The `UsersImporter` class loads users from a streamed CSV file.
+
+    The first record of the file is a header naming at least the `SCreateUser`
+    fields. Every data row is validated against `SCreateUser`; valid rows are
+    loaded in batches through COPY and rows whose email or username already
+    exists are skipped. Progress is reported after each batch.
+
+    Attributes:
+        users_repo (UsersRepository): An instance of `UsersRepository` for users.
+        batch_size (int): The number of valid rows loaded per COPY.
+        max_errors (int): The number of rejected rows detailed in the report.
+        on_progress (Callable[[SImportReport], None] | None): Called with the report after each batch.
+    """
+
+    def __init__(
+        self: "UsersImporter",
+        users_repo: UsersRepository,
+        batch_size: int = 5000,
+        max_errors: int = 100,
+        on_progress: Callable[[SImportReport], None] | None = None,
+    ) -> None:
+        """Initialize a new instance of the `UsersImporter` class.
+
+        Args:
+            users_repo (UsersRepository): The repository to use for interacting with the users.
+            batch_size (int): The number of valid rows loaded per COPY.
+            max_errors (int): The number of rejected rows detailed in the report.
+            on_progress (Callable[[SImportReport], None] | None): Called with the report after each batch.
+        """
+        self.users_repo: UsersRepository = users_repo()
+        self.batch_size = batch_size
+        self.max_errors = max_errors
+        self.on_progress = on_progress
+
+    def _reject(self: "UsersImporter", report: SImportReport, row: int, detail: str) -> None:
+        """Count a rejected row and detail it while the reporting limit allows."""
+        report.rejected += 1
+        if len(report.errors) < self.max_errors:
+            report.errors.append(SImportError(row=row, detail=detail))
+
+    async def _flush(self: "UsersImporter", report: SImportReport, batch: list[tuple]) -> None:
+        """Load a batch of valid rows and report progress."""
+        if batch:
+            inserted = await self.users_repo.copy_many(COPY_COLUMNS, batch)
+            report.inserted += inserted
+            report.skipped += len(batch) - inserted
+            batch.clear()
+        logger.info(f"users import > {report.model_dump(exclude={'errors'})}")
+        if self.on_progress:
+            self.on_progress(report)
+
+    async def run(self: "UsersImporter", chunks: AsyncIterator[bytes]) -> SImportReport:
+        """Import users from a CSV stream.
+
+        Args:
+            chunks (AsyncIterator[bytes]): The raw chunks of the CSV file.
+
+        Returns:
+            SImportReport: The outcome of the import.
+
+        Raises:
+            ImportHeaderError: If the header lacks a required column.
+        """
+        report = SImportReport()
+        records = csv_records(chunks)
+        header = [column.strip() for column in await anext(records, [])]
+        missing = [field for field in SCreateUser.model_fields if field not in header]
+        if missing:
+            raise ImportHeaderError(f"Missing columns: {', '.join(missing)}")
+
+        batch = []
+        async for record in records:
+            report.rows += 1
+            if len(record) != len(header):
+                self._reject(report, report.rows, f"Expected {len(header)} fields, got {len(record)}")
+                continue
+            try:
+                user = SCreateUser.model_validate(dict(zip(header, record)))
+            except ValidationError as e:
+                self._reject(report, report.rows, "; ".join(error["msg"] for error in e.errors()))
+                continue
+            batch.append(
+                (
+                    uuid.uuid4(),
+                    user.name,
+                    user.email,
+                    user.username,
+                    user.hashed_password,
+                    Role.USER.value,
+                    False,
+                    False,
+                ),
+            )
+            if len(batch) >= self.batch_size:
+                await self._flush(report, batch)
+        await self._flush(report, batch)
+        return report
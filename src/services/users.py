@@ -1,11 +1,27 @@
 """The `UsersService` class provides a service layer for handling user related operations."""
 
+import datetime
 import uuid
+from collections.abc import AsyncIterator, Sequence
 
+from sqlalchemy import Row
+
+from logger import get_logger
+from settings import settings
+from src.cache import Cache, local_cache
+from src.models.outbox import VERIFICATION_EMAIL_TOPIC
 from src.models.users import UserOrm
+from src.repositories.outbox import OutboxRepository
 from src.repositories.users import UsersRepository
-from src.schemas.users import SCreateUser, SUpdateUser
+from src.schemas.users import SAuthUser, SCreateUser, SUpdateUser, SUser
+from src.utils.export import csv_chunks, gzip_chunks, ndjson_chunks
 from src.utils.hasher import Hasher
+from src.utils.pagination import decode_cursor, encode_cursor
+from src.utils.unitofwork import UnitOfWork, after_commit
+
+logger = get_logger(__name__)
+
+VERIFICATION_EMAIL_FIELDS = ("username", "email")
 
 
 class UsersService:
@@ -14,39 +30,77 @@ class UsersService:
 
     Attributes:
         users_repo (UsersRepository): An instance of `UsersRepository` for users.
+        outbox_repo (OutboxRepository): An instance of `OutboxRepository` for outbox messages.
+
+    The service holds no request state, so one instance serves every request.
+    Writes run in the unit of work of the request when there is one.
 
     Methods:
         add_user(user: SCreateUser) -> UserOrm:
             Adds a new user.
 
-        get_user(filter_by: dict) -> UserOrm:
+        add_users(users: Sequence[SCreateUser]) -> dict:
+            Adds many users at once, reporting conflicting rows.
+
+        get_user(filter_by: dict) -> SUser:
             Retrieves a user based on the filter parameters.
 
-        get_auth_user(username: str, password: str) -> UserOrm:
+        get_auth_user(username: str, password: str) -> SAuthUser | None:
             Retrieves a user based on the provided credentials for authentication.
 
         get_all_users() -> list[UserOrm]:
             Retrieves all users.
 
-        delete_user(user_id: uuid.UUID) -> UserOrm:
+        get_users_page(limit: int, cursor: str | None, filter_by: dict | None) -> dict:
+            Retrieves one keyset-paginated page of users.
+
+        export_users(columns: Sequence[str], fmt: str, compress: bool) -> AsyncIterator[bytes]:
+            Streams all users as NDJSON or CSV.
+
+        delete_user(user_id: uuid.UUID) -> Row | None:
             Deletes a user specified by the `user_id` parameter.
 
-        update_user(filter_by: dict, data: SUpdateUser) -> UserOrm:
+        update_user(filter_by: dict, data: SUpdateUser) -> Row | None:
             Updates a user based on the provided filter and data.
     """
 
-    def __init__(self: "UsersService", users_repo: UsersRepository) -> None:
+    def __init__(
+        self: "UsersService",
+        users_repo: UsersRepository,
+        outbox_repo: OutboxRepository = OutboxRepository,
+    ) -> None:
         """Initialize a new instance of the `UsersService` class.
 
         Args:
             users_repo (UsersRepository): The repository to use for
                 interacting with the users.
+            outbox_repo (OutboxRepository): The repository to use for
+                queueing messages about the users.
         """
         self.users_repo: UsersRepository = users_repo()
+        self.outbox_repo: OutboxRepository = outbox_repo()
+
+    @staticmethod
+    async def _invalidate(user: UserOrm | Row) -> None:
+        """Evict every cache entry derived from a user once the change is committed.
+
+        Args:
+            user (UserOrm | Row): The user as stored after the change.
+        """
+        keys = (Cache.key("user", user.user_id), Cache.key("auth", user.username))
+        await after_commit(lambda: Cache.invalidate(*keys))
+
+    async def _enqueue_verification_emails(self: "UsersService", users: Sequence[UserOrm]) -> None:
+        """Queue a verification email for every user in the outbox."""
+        payloads = [{field: getattr(user, field) for field in VERIFICATION_EMAIL_FIELDS} for user in users]
+        await self.outbox_repo.enqueue(VERIFICATION_EMAIL_TOPIC, payloads)
 
     async def add_user(self: "UsersService", user: SCreateUser) -> UserOrm:
         """Add a new user.
 
+        A verification email is queued in the outbox in the same transaction
+        and delivered later by the outbox worker.
+
         Args:
             user (SCreateUser): The user to be added.
 
@@ -54,34 +108,129 @@ class UsersService:
             UserOrm: The created user.
         """
         user_dict = user.model_dump()
-        user = await self.users_repo.add_one(user_dict)
+        async with UnitOfWork() as uow:
+            user = await self.users_repo.add_one(user_dict)
+            await self._enqueue_verification_emails([user])
+            await uow.commit()
         return user
 
-    async def get_user(self: "UsersService", filter_by: dict) -> UserOrm:
+    async def add_users(self: "UsersService", users: Sequence[SCreateUser]) -> dict:
+        """Add many users at once.
+
+        Rows whose `email` or `username` repeats an earlier row of the request
+        or an existing user are reported instead of aborting the whole request.
+        A verification email is queued in the outbox for every created user.
+
+        Args:
+            users (Sequence[SCreateUser]): The users to be added.
+
+        Returns:
+            dict: The created users under `created` and the rejected rows under `errors`.
+        """
+        unique_fields = ("email", "username")
+        seen = {field: set() for field in unique_fields}
+        errors = []
+        accepted = []
+        for index, user in enumerate(users):
+            row = user.model_dump()
+            duplicate = next((field for field in unique_fields if row[field] in seen[field]), None)
+            if duplicate:
+                errors.append({"index": index, "field": duplicate, "detail": f"Duplicate {duplicate} in request"})
+                continue
+            for field in unique_fields:
+                seen[field].add(row[field])
+            accepted.append((index, row))
+
+        async with UnitOfWork() as uow:
+            created = await self.users_repo.add_many([row for _, row in accepted], key="username")
+            await self._enqueue_verification_emails([user for user in created if user is not None])
+            await uow.commit()
+        conflicted = [(index, row) for (index, row), user in zip(accepted, created) if user is None]
+        taken = {
+            field: await self.users_repo.existing_values(field, [row[field] for _, row in conflicted])
+            for field in unique_fields
+        }
+        for index, row in conflicted:
+            field = next((field for field in unique_fields if row[field] in taken[field]), "username")
+            errors.append({"index": index, "field": field, "detail": f"User with this {field} already exists"})
+
+        errors.sort(key=lambda error: error["index"])
+        return {"created": [user for user in created if user is not None], "errors": errors}
+
+    async def get_user(self: "UsersService", filter_by: dict) -> SUser:
         """Retrieve a user based on the filter parameters.
 
+        Lookups by `user_id` are read through two cache tiers: the in-process
+        cache of this worker first, then Redis, then the database. When a cache
+        invalidation reaches this worker during the lookup, the tiers are not
+        filled and a value just written to Redis is deleted again, so a
+        concurrent update can not leave the old user cached.
+
         Args:
             filter_by (dict): The filter parameters.
 
         Returns:
-            UserOrm: The user object matching the filter, or None if not found.
+            SUser: The user matching the filter, or None if not found.
         """
-        user = await self.users_repo.find_one(filter_by)
+        if filter_by.keys() != {"user_id"}:
+            user = await self.users_repo.find_one(filter_by)
+            return SUser.model_validate(user) if user is not None else None
+        key = Cache.key("user", filter_by["user_id"])
+        user = local_cache.get(key)
+        if user is not None:
+            return user
+        generation = local_cache.generation
+        user_from_cache = await Cache.aget(key)
+        if user_from_cache:
+            user = SUser.model_validate_json(user_from_cache)
+        else:
+            user_from_db = await self.users_repo.find_one(filter_by)
+            if user_from_db is None:
+                return None
+            user = SUser.model_validate(user_from_db)
+            if local_cache.generation != generation:
+                return user
+            await Cache.aset(key, user.model_dump_json(), ex=Cache.ttl(settings.cache.cache_user_ttl))
+        if local_cache.generation != generation:
+            await Cache.adelete(key)
+            return user
+        local_cache.set(key, user)
         return user
 
-    async def get_auth_user(self: "UsersService", username: str, password: str) -> UserOrm:
+    async def get_auth_user(self: "UsersService", username: str, password: str) -> SAuthUser | None:
         """Retrieve a user based on the provided credentials for authentication.
 
+        The credentials are read from the cache when possible and otherwise from
+        the database, through the ORM-free lookup of the repository. Disabled users
+        are rejected. The password is always verified, on the hashing process pool.
+
         Args:
             username (str): The username of the user.
             password (str): The password of the user.
 
         Returns:
-            UserOrm: The user object if the credentials are valid, else None.
+            SAuthUser | None: The user credentials if they are valid, else None.
+
+        Raises:
+            ServiceUnavailableError: If the hashing pool is saturated.
         """
-        user = await self.users_repo.find_one({"username": username})
-        if user is None or not Hasher.verify_password(password, user.hashed_password):
+        key = Cache.key("auth", username)
+        user_from_cache = await Cache.aget(key)
+        if user_from_cache:
+            logger.debug("user from cache > %s", username)
+            user = SAuthUser.model_validate_json(user_from_cache)
+        else:
+            record = await self.users_repo.find_auth_record(username)
+            if record is None:
+                return None
+            logger.debug("user from db > %s", username)
+            user = SAuthUser.model_construct(**record.as_dict())
+        if user.disabled:
+            return None
+        if not await Hasher.averify_password(password, user.hashed_password):
             return None
+        if not user_from_cache:
+            await Cache.aset(key, user.model_dump_json(), ex=Cache.ttl(settings.cache.cache_login_ttl))
         return user
 
     async def get_all_users(self: "UsersService") -> UserOrm:
@@ -93,19 +242,75 @@ class UsersService:
         users = await self.users_repo.find_all()
         return users
 
-    async def delete_user(self: "UsersService", user_id: uuid.UUID) -> UserOrm:
+    async def get_users_page(
+        self: "UsersService",
+        limit: int,
+        cursor: str | None = None,
+        filter_by: dict | None = None,
+    ) -> dict:
+        """Retrieve one page of users ordered by registration time.
+
+        The users are read as plain rows holding the fields of `SUser`.
+
+        Args:
+            limit (int): The maximum number of users in the page.
+            cursor (str | None): The cursor returned with the previous page, or None for the first page.
+            filter_by (dict | None): The filter parameters.
+
+        Returns:
+            dict: The user rows of the page under `items` and the cursor of the next page under `next_cursor`.
+
+        Raises:
+            InvalidCursorError: If the cursor is malformed.
+        """
+        after = decode_cursor(cursor, (datetime.datetime, uuid.UUID)) if cursor else None
+        users, next_key = await self.users_repo.find_page(
+            order_by=("register_at", "user_id"),
+            limit=limit,
+            after=after,
+            filter_by=filter_by,
+            columns=tuple(SUser.model_fields),
+        )
+        return {"items": users, "next_cursor": encode_cursor(next_key) if next_key else None}
+
+    def export_users(
+        self: "UsersService",
+        columns: Sequence[str],
+        fmt: str = "ndjson",
+        compress: bool = False,
+        batch_size: int = 1000,
+    ) -> AsyncIterator[bytes]:
+        """Stream all users as NDJSON or CSV.
+
+        Args:
+            columns (Sequence[str]): The user fields to export, in output order.
+            fmt (str): The output format, either `ndjson` or `csv`.
+            compress (bool): Whether to gzip the output.
+            batch_size (int): The number of rows read and flushed per chunk.
+
+        Returns:
+            AsyncIterator[bytes]: The chunks of the export.
+        """
+        batches = self.users_repo.stream_rows(columns, batch_size=batch_size)
+        encode = csv_chunks if fmt == "csv" else ndjson_chunks
+        chunks = encode(columns, batches)
+        return gzip_chunks(chunks) if compress else chunks
+
+    async def delete_user(self: "UsersService", user_id: uuid.UUID) -> Row | None:
         """Delete a user specified by the `user_id` parameter.
 
         Args:
             user_id (uuid.UUID): The UUID of the user to delete.
 
         Returns:
-            UserOrm: The deleted user object.
+            Row | None: The deleted user row, or None if no user has this id.
         """
         user = await self.users_repo.delete_one({"user_id": user_id})
+        if user is not None:
+            await self._invalidate(user)
         return user
 
-    async def update_user(self: "UsersService", filter_by: dict, data: SUpdateUser) -> UserOrm:
+    async def update_user(self: "UsersService", filter_by: dict, data: SUpdateUser) -> Row | None:
         """Update a user based on the provided filter and data.
 
         Args:
@@ -113,11 +318,12 @@ class UsersService:
             data (SUpdateUser): An object containing the data to update the user with.
 
         Returns:
-            UserOrm: The updated user object.
+            Row | None: The updated user row, or None if no user matches the filter.
         """
-        values = None
+        values = data
         if type(data) is not dict:
             values = data.model_dump(exclude_none=True)
-        values = data
         user = await self.users_repo.update_one(filter_by, values)
+        if user is not None:
+            await self._invalidate(user)
         return user
@@ -0,0 +1,101 @@
+"""
+Utility functions for streaming table exports.
+
+This module turns batches of database rows into chunks of NDJSON or CSV bytes,
+and optionally gzip-compresses the chunk stream. Every batch becomes one chunk,
+so memory use is bounded by the batch size and not by the size of the export.
+
+"""
+
+import csv
+import datetime
+import enum
+import io
+import json
+import uuid
+import zlib
+from collections.abc import AsyncIterator, Sequence
+
+EXPORT_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+
+def _to_json_value(value: object) -> object:
+    """Convert a column value into a JSON serializable value."""
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, datetime.datetime):
+        return value.isoformat()
+    return value
+
+
+def _to_csv_value(value: object) -> object:
+    """Convert a column value into a CSV cell."""
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return _to_json_value(value)
+
+
+async def ndjson_chunks(columns: Sequence[str], batches: AsyncIterator[Sequence]) -> AsyncIterator[bytes]:
+    """Encode batches of rows as newline delimited JSON.
+
+    Args:
+        columns (Sequence[str]): The names of the columns, in row order.
+        batches (AsyncIterator[Sequence]): The batches of rows.
+
+    Yields:
+        bytes: One chunk of JSON lines per batch.
+    """
+    async for batch in batches:
+        lines = [
+            json.dumps({column: _to_json_value(value) for column, value in zip(columns, row)}, ensure_ascii=False)
+            for row in batch
+        ]
+        yield ("\n".join(lines) + "\n").encode()
+
+
+async def csv_chunks(columns: Sequence[str], batches: AsyncIterator[Sequence]) -> AsyncIterator[bytes]:
+    """Encode batches of rows as CSV with a header line.
+
+    Args:
+        columns (Sequence[str]): The names of the columns, in row order.
+        batches (AsyncIterator[Sequence]): The batches of rows.
+
+    Yields:
+        bytes: The header followed by one chunk of CSV lines per batch.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    writer.writerow(columns)
+    yield buffer.getvalue().encode()
+    async for batch in batches:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows([_to_csv_value(value) for value in row] for row in batch)
+        yield buffer.getvalue().encode()
+
+
+async def gzip_chunks(chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    """Gzip-compress a stream of chunks.
+
+    Every chunk is sync-flushed, so the client can decompress the data
+    as soon as it arrives instead of waiting for the end of the stream.
+
+    Args:
+        chunks (AsyncIterator[bytes]): The uncompressed chunks.
+
+    Yields:
+        bytes: The compressed chunks.
+    """
+    compressor = zlib.compressobj(wbits=zlib.MAX_WBITS | 16)
+    async for chunk in chunks:
+        data = compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+        if data:
+            yield data
+    yield compressor.flush()
@@ -14,22 +14,56 @@ Methods:
 
 """
 
+import asyncio
+import multiprocessing
+import os
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Type
+
 from passlib.context import CryptContext
 
+from settings import settings
+from src.error import ServiceUnavailableError
+
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 
+def _hash(password: str) -> str:
+    """Hash a password inside a pool worker."""
+    return pwd_context.hash(password)
+
+
+def _verify(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password inside a pool worker."""
+    return pwd_context.verify(plain_password, hashed_password)
+
+
 class Hasher:
     """
     Hasher class that provides methods for generating and verifying password hashes.
 
+    The asynchronous methods run bcrypt on a dedicated process pool, so the CPU cost
+    of hashing never blocks the event loop. The number of jobs admitted to the pool
+    is bounded by `settings.hasher`; once it is reached new jobs are rejected
+    immediately with `ServiceUnavailableError` instead of queueing without limit.
+
     Methods:
         get_password_hash(password: str) -> str:
             Generate a hash of a given password.
         verify_password(plain_password: str, hashed_password: str) -> bool:
             Verify a given plain password against a hashed password.
+        aget_password_hash(password: str) -> str:
+            Generate a hash of a given password on the process pool.
+        averify_password(plain_password: str, hashed_password: str) -> bool:
+            Verify a given plain password against a hashed password on the process pool.
     """
 
+    _executor: ProcessPoolExecutor | None = None
+    _workers: int = 0
+    _in_flight: int = 0
+    _rejected: int = 0
+
     @staticmethod
     def get_password_hash(password: str) -> str:
         """Generate a hash of a given password.
@@ -54,3 +88,98 @@ class Hasher:
             bool: True if the plain password matches the hashed password, False otherwise.
         """
         return pwd_context.verify(plain_password, hashed_password)
+
+    @classmethod
+    def start_pool(cls: Type["Hasher"]) -> ProcessPoolExecutor:
+        """Create the hashing process pool if it is not running yet.
+
+        Returns:
+            ProcessPoolExecutor: The hashing process pool.
+        """
+        if cls._executor is None:
+            cls._workers = settings.hasher.hasher_workers or os.cpu_count() or 1
+            cls._executor = ProcessPoolExecutor(
+                max_workers=cls._workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return cls._executor
+
+    @classmethod
+    def shutdown_pool(cls: Type["Hasher"]) -> None:
+        """Shut down the hashing process pool and cancel jobs that have not started.
+
+        Returns:
+            None: This function does not return anything.
+        """
+        if cls._executor is not None:
+            cls._executor.shutdown(wait=True, cancel_futures=True)
+            cls._executor = None
+
+    @classmethod
+    def stats(cls: Type["Hasher"]) -> dict[str, int]:
+        """Return the load statistics of the hashing process pool.
+
+        Returns:
+            dict[str, int]: The worker count, jobs in flight, jobs waiting for a worker and rejected jobs.
+        """
+        return {
+            "workers": cls._workers,
+            "in_flight": cls._in_flight,
+            "queued": max(0, cls._in_flight - cls._workers),
+            "rejected": cls._rejected,
+        }
+
+    @classmethod
+    async def _submit(cls: Type["Hasher"], fn: Callable, *args: str) -> Any:  # noqa: ANN401
+        """Run a hashing function on the process pool under admission control.
+
+        Args:
+            fn (Callable): A module level function to run in a worker process.
+            args (str): The arguments of the function.
+
+        Returns:
+            Any: The result of the function.
+
+        Raises:
+            ServiceUnavailableError: If the pool and its queue are saturated.
+        """
+        executor = cls.start_pool()
+        if cls._in_flight >= cls._workers + settings.hasher.hasher_max_queue:
+            cls._rejected += 1
+            raise ServiceUnavailableError(retry_after=settings.hasher.hasher_retry_after)
+        cls._in_flight += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(executor, fn, *args)
+        finally:
+            cls._in_flight -= 1
+
+    @classmethod
+    async def aget_password_hash(cls: Type["Hasher"], password: str) -> str:
+        """Generate a hash of a given password on the process pool.
+
+        Args:
+            password (str): The plain password to hash.
+
+        Returns:
+            str: The hashed password.
+
+        Raises:
+            ServiceUnavailableError: If the pool and its queue are saturated.
+        """
+        return await cls._submit(_hash, password)
+
+    @classmethod
+    async def averify_password(cls: Type["Hasher"], plain_password: str, hashed_password: str) -> bool:
+        """Verify a given plain password against a hashed password on the process pool.
+
+        Args:
+            plain_password (str): The plain password to verify.
+            hashed_password (str): The hashed password to verify against.
+
+        Returns:
+            bool: True if the plain password matches the hashed password, False otherwise.
+
+        Raises:
+            ServiceUnavailableError: If the pool and its queue are saturated.
+        """
+        return await cls._submit(_verify, plain_password, hashed_password)
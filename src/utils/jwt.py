@@ -2,17 +2,273 @@
 Utility functions for handling JWT tokens.
 
 This module provides functions for encoding and decoding JWT tokens, as well as
-utilities for verifying and manipulating tokens.
+utilities for verifying and manipulating tokens. The work is done by a shared
+`TokenEngine`, built from the settings on first use.
 
 """
 
 import datetime
+import os
+import time
 from datetime import timedelta
+from typing import Type
 
-from jose import jwt
+from jose import ExpiredSignatureError, JWTError, jwk
+from jose import jwt as jose_jwt
 
+from logger import get_logger
 from settings import settings
+from src.cache import LocalCache
 from src.schemas.auth import SToken
+from src.utils.keys import KeyRing
+
+try:
+    import jwt as pyjwt
+except ImportError:  # pragma: no cover
+    pyjwt = None
+
+logger = get_logger(__name__)
+
+REFRESH_TOKEN_TYPE = "refresh"
+
+
+class TokenEngine:
+    """
+    The `TokenEngine` class signs and verifies JWT tokens with pre-built key material.
+
+    The signing key and the list of accepted algorithms are prepared once instead
+    of on every call. PyJWT is used when it is selected or, with the `auto`
+    backend, when it is installed, as it is noticeably faster than python-jose.
+    Both backends raise python-jose exceptions, so callers do not depend on
+    the backend.
+
+    With a key ring, tokens are signed with the active asymmetric key and carry
+    its `kid`, so other services can verify them with the published key set.
+    A key ring loaded from a manifest is reloaded when the modification time of
+    the manifest changes, checked at most every `reload_interval` seconds, so a
+    key scheduled by `rotate-jwt-key` reaches running servers.
+
+    Recently verified tokens are kept with their claims in a bounded LRU cache.
+    An entry never outlives the `exp` claim of its token, nor the trust in the
+    key that signed it, so an expired token or a token of a retired key is
+    always rejected.
+
+    Attributes:
+        algorithm (str): The algorithm used to sign and verify tokens.
+        backend (str): The library in use, either `jose` or `pyjwt`.
+        keyring (KeyRing | None): The asymmetric signing keys, or None to sign with the shared secret.
+        keys_file (str | None): The manifest the key ring is loaded from and reloaded when it changes.
+        reload_interval (float): The minimum number of seconds between two checks of the manifest.
+        cache (LocalCache | None): The verified tokens cache, or None when disabled.
+    """
+
+    def __init__(
+        self: "TokenEngine",
+        secret_key: str,
+        algorithm: str,
+        backend: str = "auto",
+        cache_size: int = 1024,
+        cache_ttl: float = 60.0,
+        keyring: KeyRing | None = None,
+        keys_file: str | None = None,
+        reload_interval: float = 5.0,
+    ) -> None:
+        """Initialize a new instance of the `TokenEngine` class.
+
+        Args:
+            secret_key (str): The key used to sign and verify tokens without a key ring.
+            algorithm (str): The algorithm used to sign and verify tokens without a key ring.
+            backend (str): The library to use: `jose`, `pyjwt`, or `auto`.
+            cache_size (int): The number of verified tokens kept in the cache. 0 disables the cache.
+            cache_ttl (float): The upper bound in seconds a verified token stays cached.
+            keyring (KeyRing | None): The asymmetric signing keys. When given, tokens are signed
+                with the active key, tagged with its `kid`, and verified with the key they name.
+            keys_file (str | None): A manifest to load the key ring from, and to reload it from when it changes.
+            reload_interval (float): The minimum number of seconds between two checks of the manifest.
+
+        Raises:
+            ValueError: If the backend is unknown, not installed, or does not support an algorithm of the key ring.
+        """
+        if backend == "auto":
+            backend = "pyjwt" if pyjwt is not None else "jose"
+        if backend not in ("jose", "pyjwt") or (backend == "pyjwt" and pyjwt is None):
+            raise ValueError(f"Unavailable JWT backend: {backend}")
+        self.algorithm = algorithm
+        self.backend = backend
+        self.keyring = None
+        self.keys_file = keys_file
+        self.reload_interval = reload_interval
+        self.cache = LocalCache(cache_size, cache_ttl) if cache_size > 0 else None
+        self._algorithms = [algorithm]
+        self._private_keys = {}
+        self._public_keys = {}
+        self._keys_mtime = None
+        self._next_reload_check = 0.0
+        if backend == "pyjwt":
+            self._jwt = pyjwt.PyJWT()
+        if keyring is None and keys_file:
+            self._keys_mtime = os.stat(keys_file).st_mtime_ns
+            keyring = KeyRing.from_manifest(keys_file)
+            self._next_reload_check = time.monotonic() + reload_interval
+        if keyring is not None:
+            self._use_keyring(keyring)
+        else:
+            self._key = self._prepare(secret_key, algorithm)
+
+    def _use_keyring(self: "TokenEngine", keyring: KeyRing) -> None:
+        """Prepare the keys of a key ring and swap them in.
+
+        Raises:
+            ValueError: If the backend does not support an algorithm of the key ring.
+        """
+        private_keys, public_keys = {}, {}
+        for key in keyring.keys:
+            if self.backend == "jose" and key.algorithm == "EdDSA":
+                raise ValueError("EdDSA keys require the pyjwt backend")
+            private_keys[key.kid] = self._prepare(key.private_key, key.algorithm)
+            public_keys[key.kid] = self._prepare(key.public_key, key.algorithm)
+        self.keyring, self._private_keys, self._public_keys = keyring, private_keys, public_keys
+
+    def _reload_keys(self: "TokenEngine") -> None:
+        """Reload the key ring if the manifest changed since it was loaded.
+
+        A manifest that can not be loaded is logged and the current keys stay in use.
+        """
+        if self.keys_file is None or time.monotonic() < self._next_reload_check:
+            return
+        self._next_reload_check = time.monotonic() + self.reload_interval
+        try:
+            mtime = os.stat(self.keys_file).st_mtime_ns
+            if mtime == self._keys_mtime:
+                return
+            self._use_keyring(KeyRing.from_manifest(self.keys_file))
+            self._keys_mtime = mtime
+            logger.info(f"signing keys reloaded > {', '.join(key.kid for key in self.keyring.keys)}")
+        except Exception as e:
+            logger.error(f"signing keys reload failed, keeping the current keys. Error: {e!r}")
+
+    def _prepare(self: "TokenEngine", key: object, algorithm: str) -> object:
+        """Turn key material into the key object of the backend."""
+        if self.backend == "pyjwt":
+            return pyjwt.get_algorithm_by_name(algorithm).prepare_key(key)
+        return jwk.construct(key, algorithm)
+
+    @classmethod
+    def from_settings(cls: Type["TokenEngine"]) -> "TokenEngine":
+        """Build an engine from the authentication settings.
+
+        Returns:
+            TokenEngine: The configured engine.
+        """
+        return cls(
+            secret_key=settings.auth.secret_key,
+            algorithm=settings.auth.algorithm,
+            backend=settings.auth.jwt_backend,
+            cache_size=settings.auth.jwt_cache_size,
+            cache_ttl=settings.auth.jwt_cache_ttl,
+            keys_file=settings.auth.jwt_keys_file,
+            reload_interval=settings.auth.jwt_keys_reload_interval,
+        )
+
+    def jwks(self: "TokenEngine") -> dict:
+        """Build the JSON Web Key Set of the public keys trusted to verify tokens.
+
+        Returns:
+            dict: The JSON Web Key Set, without keys when tokens are signed with a shared secret.
+        """
+        self._reload_keys()
+        return self.keyring.jwks() if self.keyring is not None else {"keys": []}
+
+    def encode(self: "TokenEngine", claims: dict) -> str:
+        """Sign claims into a token.
+
+        Args:
+            claims (dict): The claims of the token.
+
+        Returns:
+            str: The encoded token.
+        """
+        self._reload_keys()
+        if self.keyring is None:
+            key, algorithm, headers = self._key, self.algorithm, None
+        else:
+            signing_key = self.keyring.signing_key()
+            key, algorithm = self._private_keys[signing_key.kid], signing_key.algorithm
+            headers = {"kid": signing_key.kid}
+        if self.backend == "pyjwt":
+            return self._jwt.encode(claims, key, algorithm=algorithm, headers=headers)
+        return jose_jwt.encode(claims, key, algorithm=algorithm, headers=headers)
+
+    def _verification_key(self: "TokenEngine", header: dict) -> tuple[object, list[str], str | None]:
+        """Select the key, the algorithms accepted and the `kid` for a token header."""
+        if self.keyring is None:
+            return self._key, self._algorithms, None
+        kid = header.get("kid")
+        key = self.keyring.verification_key(kid) if isinstance(kid, str) else None
+        if key is None:
+            raise JWTError("Unknown signing key")
+        return self._public_keys[key.kid], [key.algorithm], key.kid
+
+    def _verify(self: "TokenEngine", token: str) -> tuple[dict, str | None]:
+        """Verify a token with the selected backend, returning its claims and the `kid` of its key."""
+        if self.backend == "jose":
+            header = jose_jwt.get_unverified_header(token) if self.keyring is not None else {}
+            key, algorithms, kid = self._verification_key(header)
+            return jose_jwt.decode(token, key, algorithms=algorithms), kid
+        try:
+            header = pyjwt.get_unverified_header(token) if self.keyring is not None else {}
+            key, algorithms, kid = self._verification_key(header)
+            return self._jwt.decode(token, key, algorithms=algorithms), kid
+        except pyjwt.ExpiredSignatureError as e:
+            raise ExpiredSignatureError(str(e)) from e
+        except pyjwt.InvalidTokenError as e:
+            raise JWTError(str(e)) from e
+
+    def decode(self: "TokenEngine", token: str) -> dict:
+        """Verify a token and return its claims.
+
+        Args:
+            token (str): The token to verify.
+
+        Returns:
+            dict: The claims of the token.
+
+        Raises:
+            jose.ExpiredSignatureError: If the token has expired.
+            jose.JWTError: If the token is invalid.
+        """
+        self._reload_keys()
+        if self.cache is None:
+            return self._verify(token)[0]
+        entry = self.cache.get(token)
+        if entry is None:
+            claims, kid = self._verify(token)
+            exp = claims.get("exp")
+            self.cache.set(token, (kid, claims), ttl=exp - time.time() if isinstance(exp, (int, float)) else None)
+            return dict(claims)
+        kid, claims = entry
+        if claims.get("exp", float("inf")) <= time.time():
+            self.cache.delete(token)
+            raise ExpiredSignatureError("Signature has expired.")
+        if kid is not None and (self.keyring is None or self.keyring.verification_key(kid) is None):
+            self.cache.delete(token)
+            raise JWTError("Unknown signing key")
+        return dict(claims)
+
+
+_token_engine: TokenEngine | None = None
+
+
+def get_token_engine() -> TokenEngine:
+    """Get the shared token engine, building it from the settings on first use.
+
+    Returns:
+        TokenEngine: The shared token engine.
+    """
+    global _token_engine
+    if _token_engine is None:
+        _token_engine = TokenEngine.from_settings()
+    return _token_engine
 
 
 def jwt_decode(token: str) -> dict:
@@ -28,7 +284,7 @@ def jwt_decode(token: str) -> dict:
         jose.jwt.ExpiredSignatureError: If the token has expired.
         jose.jwt.JWTError: If the token is invalid.
     """
-    return jwt.decode(token, settings.auth.secret_key, algorithms=[settings.auth.algorithm])
+    return get_token_engine().decode(token)
 
 
 def jwt_encode(data: dict) -> str:
@@ -36,12 +292,11 @@ def jwt_encode(data: dict) -> str:
 
     Args:
         data (dict): The data to be encoded into the token.
-        algorithm (str): The algorithm used to sign the token.
 
     Returns:
         str: The encoded JWT token.
     """
-    return jwt.encode(data, settings.auth.secret_key, algorithm=settings.auth.algorithm)
+    return get_token_engine().encode(data)
 
 
 def create_access_token(data: dict, expires_delta: timedelta | None = timedelta(minutes=20)) -> str:
@@ -56,8 +311,8 @@ def create_access_token(data: dict, expires_delta: timedelta | None = timedelta(
         str: The encoded JWT access token.
     """
     to_encode = data.copy()
-    expire = datetime.datetime.now() + expires_delta
-    to_encode.update({"exp": expire})
+    expire = datetime.datetime.now(datetime.timezone.utc) + expires_delta
+    to_encode.update({"exp": int(expire.timestamp())})
     encoded_jwt = jwt_encode(data=to_encode)
     return encoded_jwt
 
@@ -68,17 +323,17 @@ def get_tokens(username: str) -> SToken:
     Args:
         username (str): The username for which to generate tokens.
 
+    The refresh token carries a `typ` claim of `REFRESH_TOKEN_TYPE`, so no other
+    token signed by this server can be exchanged for new tokens.
+
     Returns:
         SToken: A dictionary containing the access and refresh tokens.
 
     """
-    access_token = create_access_token(
-        data={"sub": username},
-        expires_delta=timedelta(minutes=settings.auth.access_token_expires_minutes),
-    )
-    refresh_token = create_access_token(
-        data={"sub": username},
-        expires_delta=timedelta(minutes=settings.auth.refresh_token_expires_minutes),
+    now = int(time.time())
+    access_token = jwt_encode({"sub": username, "exp": now + settings.auth.access_token_expires_minutes * 60})
+    refresh_token = jwt_encode(
+        {"sub": username, "typ": REFRESH_TOKEN_TYPE, "exp": now + settings.auth.refresh_token_expires_minutes * 60},
     )
     return {
         "access_token": access_token,
@@ -0,0 +1,277 @@
+"""
+Asymmetric signing keys for JWT tokens.
+
+This module loads `kid`-tagged signing keys from a JSON manifest and selects
+the key used to sign and the keys trusted to verify at a given moment, so keys
+can be rotated with overlapping validity. The public halves are published as a
+JSON Web Key Set, which lets other services verify tokens locally.
+
+The manifest has the following format, paths being relative to the manifest::
+
+    {"keys": [{"kid": "2024-06", "algorithm": "ES256", "private_key_path": "2024-06.pem",
+               "not_before": "2024-06-01T00:00:00+00:00", "not_after": null}]}
+
+A key signs from its `not_before` until the `not_before` of the next key, and is
+trusted and published until its `not_after`. Keys are published before their
+`not_before`, so verifiers caching the key set already know a key when it starts signing.
+
+"""
+
+import base64
+import datetime
+import json
+import os
+import tempfile
+from dataclasses import dataclass
+from typing import Type
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519
+
+SUPPORTED_ALGORITHMS = ("ES256", "EdDSA")
+
+
+def _b64url(data: bytes) -> str:
+    """Encode bytes as unpadded base64url."""
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+
+def generate_private_key(algorithm: str) -> ec.EllipticCurvePrivateKey | ed25519.Ed25519PrivateKey:
+    """Generate a private key for an algorithm.
+
+    Args:
+        algorithm (str): The algorithm, either `ES256` or `EdDSA`.
+
+    Returns:
+        ec.EllipticCurvePrivateKey | ed25519.Ed25519PrivateKey: The new private key.
+
+    Raises:
+        ValueError: If the algorithm is not supported.
+    """
+    if algorithm == "ES256":
+        return ec.generate_private_key(ec.SECP256R1())
+    if algorithm == "EdDSA":
+        return ed25519.Ed25519PrivateKey.generate()
+    raise ValueError(f"Unsupported signing algorithm: {algorithm}")
+
+
+@dataclass(frozen=True)
+class SigningKey:
+    """A `kid`-tagged asymmetric key with its validity window.
+
+    Attributes:
+        kid (str): The key identifier written in the header of the tokens it signs.
+        algorithm (str): The signing algorithm, either `ES256` or `EdDSA`.
+        private_key (ec.EllipticCurvePrivateKey | ed25519.Ed25519PrivateKey): The private key.
+        not_before (datetime.datetime): The moment the key starts signing.
+        not_after (datetime.datetime | None): The moment the key is retired, or None while it is not scheduled.
+    """
+
+    kid: str
+    algorithm: str
+    private_key: ec.EllipticCurvePrivateKey | ed25519.Ed25519PrivateKey
+    not_before: datetime.datetime
+    not_after: datetime.datetime | None = None
+
+    @property
+    def public_key(self: "SigningKey") -> ec.EllipticCurvePublicKey | ed25519.Ed25519PublicKey:
+        """The public half of the key."""
+        return self.private_key.public_key()
+
+    def is_trusted(self: "SigningKey", now: datetime.datetime) -> bool:
+        """Whether tokens signed by the key are accepted at `now`."""
+        return self.not_after is None or now < self.not_after
+
+    def to_jwk(self: "SigningKey") -> dict:
+        """Describe the public half of the key as a JSON Web Key.
+
+        Returns:
+            dict: The JSON Web Key.
+        """
+        jwk = {"kid": self.kid, "alg": self.algorithm, "use": "sig"}
+        public_key = self.public_key
+        if isinstance(public_key, ed25519.Ed25519PublicKey):
+            raw = public_key.public_bytes(serialization.Encoding.Raw, serialization.PublicFormat.Raw)
+            return jwk | {"kty": "OKP", "crv": "Ed25519", "x": _b64url(raw)}
+        numbers = public_key.public_numbers()
+        return jwk | {
+            "kty": "EC",
+            "crv": "P-256",
+            "x": _b64url(numbers.x.to_bytes(32, "big")),
+            "y": _b64url(numbers.y.to_bytes(32, "big")),
+        }
+
+
+class KeyRing:
+    """
+    The `KeyRing` class holds the signing keys of the rotation schedule.
+
+    Attributes:
+        keys (list[SigningKey]): The keys ordered by `not_before`.
+    """
+
+    def __init__(self: "KeyRing", keys: list[SigningKey]) -> None:
+        """Initialize a new instance of the `KeyRing` class.
+
+        Args:
+            keys (list[SigningKey]): The keys of the schedule.
+
+        Raises:
+            ValueError: If the keys are empty, use an unsupported algorithm or repeat a `kid`.
+        """
+        if not keys:
+            raise ValueError("A key ring needs at least one key")
+        unsupported = {key.algorithm for key in keys} - set(SUPPORTED_ALGORITHMS)
+        if unsupported:
+            raise ValueError(f"Unsupported signing algorithms: {', '.join(sorted(unsupported))}")
+        if len({key.kid for key in keys}) != len(keys):
+            raise ValueError("Key ids must be unique")
+        self.keys = sorted(keys, key=lambda key: key.not_before)
+        self._by_kid = {key.kid: key for key in self.keys}
+
+    @classmethod
+    def from_manifest(cls: Type["KeyRing"], path: str) -> "KeyRing":
+        """Load a key ring from a JSON manifest.
+
+        Args:
+            path (str): The path of the manifest.
+
+        Returns:
+            KeyRing: The loaded key ring.
+        """
+        with open(path) as f:
+            manifest = json.load(f)
+        base = os.path.dirname(os.path.abspath(path))
+        keys = []
+        for entry in manifest["keys"]:
+            with open(os.path.join(base, entry["private_key_path"]), "rb") as f:
+                private_key = serialization.load_pem_private_key(f.read(), password=None)
+            not_after = entry.get("not_after")
+            keys.append(
+                SigningKey(
+                    kid=entry["kid"],
+                    algorithm=entry["algorithm"],
+                    private_key=private_key,
+                    not_before=datetime.datetime.fromisoformat(entry["not_before"]),
+                    not_after=datetime.datetime.fromisoformat(not_after) if not_after else None,
+                ),
+            )
+        return cls(keys)
+
+    def signing_key(self: "KeyRing", now: datetime.datetime | None = None) -> SigningKey:
+        """Get the key that signs new tokens at `now`.
+
+        Args:
+            now (datetime.datetime | None): The moment of signing. Defaults to the current time.
+
+        Returns:
+            SigningKey: The trusted key with the latest `not_before` that is already active.
+
+        Raises:
+            LookupError: If no key is active.
+        """
+        now = now or datetime.datetime.now(datetime.timezone.utc)
+        for key in reversed(self.keys):
+            if key.not_before <= now and key.is_trusted(now):
+                return key
+        raise LookupError("No active signing key")
+
+    def verification_key(self: "KeyRing", kid: str, now: datetime.datetime | None = None) -> SigningKey | None:
+        """Get the key trusted to verify tokens with a `kid`.
+
+        Args:
+            kid (str): The key identifier from the token header.
+            now (datetime.datetime | None): The moment of verification. Defaults to the current time.
+
+        Returns:
+            SigningKey | None: The key, or None if it is unknown or retired.
+        """
+        key = self._by_kid.get(kid)
+        if key is None or not key.is_trusted(now or datetime.datetime.now(datetime.timezone.utc)):
+            return None
+        return key
+
+    def jwks(self: "KeyRing", now: datetime.datetime | None = None) -> dict:
+        """Build the JSON Web Key Set of the keys trusted at `now`, including the upcoming ones.
+
+        Args:
+            now (datetime.datetime | None): The moment of publication. Defaults to the current time.
+
+        Returns:
+            dict: The JSON Web Key Set.
+        """
+        now = now or datetime.datetime.now(datetime.timezone.utc)
+        return {"keys": [key.to_jwk() for key in self.keys if key.is_trusted(now)]}
+
+
+def rotate_manifest(
+    path: str,
+    algorithm: str,
+    not_before: datetime.datetime,
+    overlap: datetime.timedelta,
+    kid: str | None = None,
+) -> str:
+    """Schedule a new signing key in a manifest, creating the manifest if needed.
+
+    The private key is written next to the manifest, in a new file. Every key
+    without a retirement date is scheduled to retire `overlap` after the new key
+    starts signing, so the tokens it signed stay valid until they expire. The
+    manifest is replaced atomically, so a server reloading it never reads a
+    partial file.
+
+    Args:
+        path (str): The path of the manifest.
+        algorithm (str): The algorithm of the new key, either `ES256` or `EdDSA`.
+        not_before (datetime.datetime): The moment the new key starts signing.
+        overlap (datetime.timedelta): How long the previous keys stay trusted after the new key starts signing.
+            It must be at least the lifetime of the longest lived token.
+        kid (str | None): The identifier of the new key. Defaults to its start time.
+
+    Returns:
+        str: The identifier of the new key.
+
+    Raises:
+        ValueError: If the manifest already has a key with this identifier.
+        FileExistsError: If the private key file of the identifier already exists.
+    """
+    manifest = {"keys": []}
+    if os.path.exists(path):
+        with open(path) as f:
+            manifest = json.load(f)
+    kid = kid or not_before.strftime("%Y%m%dT%H%M%SZ")
+    if any(entry["kid"] == kid for entry in manifest["keys"]):
+        raise ValueError(f"Key id already in the manifest: {kid}")
+    private_key = generate_private_key(algorithm)
+    pem = private_key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    )
+    base = os.path.dirname(os.path.abspath(path))
+    key_path = f"{kid}.pem"
+    fd = os.open(os.path.join(base, key_path), os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    with os.fdopen(fd, "wb") as f:
+        f.write(pem)
+    for entry in manifest["keys"]:
+        if not entry.get("not_after"):
+            entry["not_after"] = (not_before + overlap).isoformat()
+    manifest["keys"].append(
+        {
+            "kid": kid,
+            "algorithm": algorithm,
+            "private_key_path": key_path,
+            "not_before": not_before.isoformat(),
+            "not_after": None,
+        },
+    )
+    fd, temp_path = tempfile.mkstemp(prefix=".manifest-", suffix=".json", dir=base)
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(manifest, f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+    return kid
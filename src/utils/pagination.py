@@ -0,0 +1,67 @@
+"""
+Utility functions for keyset pagination.
+
+This module provides functions for encoding the sort key of the last row of a page
+into an opaque cursor and for decoding such a cursor back into typed values.
+
+"""
+
+import base64
+import binascii
+import datetime
+import json
+from collections.abc import Sequence
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a pagination cursor can not be decoded."""
+
+
+def _dump(value: object) -> str:
+    """Convert a sort key value into its JSON friendly string form."""
+    if isinstance(value, datetime.datetime):
+        return value.isoformat()
+    return str(value)
+
+
+def _load(value: str, type_: type) -> object:
+    """Convert a string back into a sort key value of the given type."""
+    if type_ is datetime.datetime:
+        return datetime.datetime.fromisoformat(value)
+    return type_(value)
+
+
+def encode_cursor(values: Sequence) -> str:
+    """Encode the sort key of a row into an opaque cursor.
+
+    Args:
+        values (Sequence): The sort key values, e.g. `(register_at, user_id)`.
+
+    Returns:
+        str: A URL safe cursor string.
+    """
+    raw = json.dumps([_dump(value) for value in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, types: Sequence[type]) -> tuple:
+    """Decode a cursor produced by `encode_cursor` back into a sort key.
+
+    Args:
+        cursor (str): The cursor string.
+        types (Sequence[type]): The type of every sort key value, e.g. `(datetime, UUID)`.
+
+    Returns:
+        tuple: The typed sort key values.
+
+    Raises:
+        InvalidCursorError: If the cursor is malformed.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw)
+        if not isinstance(values, list) or len(values) != len(types):
+            raise InvalidCursorError("Invalid cursor")
+        return tuple(_load(value, type_) for value, type_ in zip(values, types))
+    except (binascii.Error, UnicodeDecodeError, TypeError, ValueError) as e:
+        raise InvalidCursorError("Invalid cursor") from e
@@ -0,0 +1,80 @@
+"""
+A cache of statement templates keyed by their shape.
+
+Repositories build their statements with bound parameters instead of literal
+values, so two calls filtering on the same columns share one statement object.
+Reusing the object skips the statement construction and lets SQLAlchemy reuse
+its memoized cache key and compiled form.
+
+Attributes:
+    statement_cache (StatementCache): The statement cache shared by the repositories.
+
+"""
+
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+
+from sqlalchemy import Executable
+
+STATEMENT_CACHE_SIZE = 512
+
+
+class StatementCache:
+    """
+    StatementCache is a bounded LRU cache of statement templates.
+
+    Keys describe the shape of a statement, e.g. the model, the kind of the
+    statement and the names of the filtered columns, never parameter values,
+    so the number of entries is bounded by the code rather than by the data.
+
+    Attributes:
+        maxsize (int): The maximum number of entries.
+        hits (int): The number of lookups served from the cache.
+        misses (int): The number of lookups that built a new statement.
+
+    """
+
+    def __init__(self: "StatementCache", maxsize: int) -> None:
+        """Initialize an empty cache.
+
+        Args:
+            maxsize (int): The maximum number of entries.
+        """
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[Hashable, Executable] = OrderedDict()
+
+    def __len__(self: "StatementCache") -> int:
+        """Return the number of entries."""
+        return len(self._entries)
+
+    def get(self: "StatementCache", key: Hashable, build: Callable[[], Executable]) -> Executable:
+        """Get the statement of a shape, building and storing it on a miss.
+
+        Args:
+            key (Hashable): The shape of the statement.
+            build (Callable[[], Executable]): Builds the statement on a miss.
+
+        Returns:
+            Executable: The statement template.
+        """
+        statement = self._entries.get(key)
+        if statement is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return statement
+        self.misses += 1
+        statement = self._entries[key] = build()
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+        return statement
+
+    def clear(self: "StatementCache") -> None:
+        """Remove every entry and reset the statistics."""
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+statement_cache = StatementCache(STATEMENT_CACHE_SIZE)
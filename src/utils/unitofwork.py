@@ -0,0 +1,115 @@
+"""
+A request-scoped unit of work sharing one session across repository calls.
+
+While a `UnitOfWork` is active in the current context, every repository call
+runs on its session instead of opening its own, and writes are flushed instead
+of committed. The owner of the unit of work commits once, explicitly, so a
+request doing several operations checks out one connection and runs one transaction.
+
+A unit of work entered while another one is active joins it: its `commit`
+is left to the outermost unit of work, so a service can group its own writes
+without knowing whether the caller already did.
+
+Attributes:
+    current_uow (ContextVar[UnitOfWork | None]): The unit of work active in the current context.
+
+"""
+
+from collections.abc import Awaitable, Callable
+from contextvars import ContextVar
+from types import TracebackType
+from typing import Type
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.database import async_session
+
+current_uow: ContextVar["UnitOfWork | None"] = ContextVar("current_uow", default=None)
+
+
+class UnitOfWork:
+    """
+    The `UnitOfWork` class scopes one session and one transaction.
+
+    Leaving the block without committing rolls the transaction back.
+
+    Attributes:
+        session (AsyncSession | None): The session of the unit of work, set while it is active.
+    """
+
+    def __init__(self: "UnitOfWork", session_factory: Callable[[], AsyncSession] = async_session) -> None:
+        """Initialize a new instance of the `UnitOfWork` class.
+
+        Args:
+            session_factory (Callable[[], AsyncSession]): The factory of the session.
+        """
+        self.session_factory = session_factory
+        self.session: AsyncSession | None = None
+        self._outer: UnitOfWork | None = None
+        self._token = None
+        self._after_commit: list[Callable[[], Awaitable[None]]] = []
+
+    async def __aenter__(self: "UnitOfWork") -> "UnitOfWork":
+        """Open the session, or join the active unit of work."""
+        self._outer = current_uow.get()
+        if self._outer is not None:
+            self.session = self._outer.session
+            return self
+        self.session = self.session_factory()
+        self._token = current_uow.set(self)
+        return self
+
+    async def __aexit__(
+        self: "UnitOfWork",
+        exc_type: Type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        """Roll back what was not committed and close the session, unless this unit of work joined another one."""
+        if self._outer is not None:
+            return
+        current_uow.reset(self._token)
+        try:
+            await self.session.rollback()
+        finally:
+            await self.session.close()
+            self._after_commit.clear()
+
+    async def commit(self: "UnitOfWork") -> None:
+        """Commit the transaction and run the callbacks registered with `after_commit`.
+
+        A unit of work that joined another one leaves the commit to the outermost one.
+        """
+        if self._outer is not None:
+            return
+        await self.session.commit()
+        callbacks, self._after_commit = self._after_commit, []
+        for callback in callbacks:
+            await callback()
+
+    async def rollback(self: "UnitOfWork") -> None:
+        """Roll the transaction back and drop the callbacks registered with `after_commit`."""
+        root = self._outer or self
+        await root.session.rollback()
+        root._after_commit.clear()
+
+    def after_commit(self: "UnitOfWork", callback: Callable[[], Awaitable[None]]) -> None:
+        """Run a callback once the transaction is committed, e.g. to invalidate caches.
+
+        Args:
+            callback (Callable[[], Awaitable[None]]): The callback.
+        """
+        (self._outer or self)._after_commit.append(callback)
+
+
+async def after_commit(callback: Callable[[], Awaitable[None]]) -> None:
+    """Run a callback after the commit of the active unit of work, or right away without one.
+
+    Args:
+        callback (Callable[[], Awaitable[None]]): The callback.
+    """
+    uow = current_uow.get()
+    if uow is None:
+        await callback()
+    else:
+        uow.after_commit(callback)
@@ -0,0 +1,163 @@
+"""The `OutboxWorker` class delivers the messages queued in the outbox.
+
+The worker runs as a separate process (`email-worker`), so sending emails never
+competes with request handling. Messages are delivered at least once: a message
+is marked as sent only after its handler succeeded, and every handler receives
+the message id as an idempotency key.
+
+"""
+
+import asyncio
+import random
+import uuid
+from collections.abc import Awaitable, Callable
+
+from logger import get_logger
+from settings import settings
+from src.models.outbox import VERIFICATION_EMAIL_TOPIC, OutboxOrm
+from src.repositories.outbox import OutboxRepository
+from src.services.email import EmailService
+
+logger = get_logger(__name__)
+
+Handler = Callable[[uuid.UUID, dict], Awaitable[None]]
+
+
+async def send_verification_email(message_id: uuid.UUID, payload: dict) -> None:
+    """Deliver a verification email message.
+
+    Args:
+        message_id (uuid.UUID): The id of the outbox message, used as the `Message-ID` of the email.
+        payload (dict): The `username` and `email` of the user.
+    """
+    await EmailService.send_email(payload["username"], payload["email"], message_id=str(message_id))
+
+
+HANDLERS: dict[str, Handler] = {VERIFICATION_EMAIL_TOPIC: send_verification_email}
+
+
+class OutboxWorker:
+    """
+    The `OutboxWorker` class delivers the messages queued in the outbox.
+
+    Due messages are claimed in batches and delivered concurrently. A failed
+    message is retried with exponential backoff and jitter, and dead-lettered
+    once it exhausted its attempts or when no handler exists for its topic.
+
+    Attributes:
+        outbox_repo (OutboxRepository): An instance of `OutboxRepository` for outbox messages.
+        handlers (dict[str, Handler]): The delivery handler of every topic.
+        batch_size (int): The maximum number of messages claimed per poll.
+        max_attempts (int): The number of failed attempts after which a message is dead-lettered.
+        base_delay (float): Seconds before the first retry.
+        max_delay (float): The upper bound in seconds of the delay between two attempts.
+        poll_interval (float): Seconds to wait before polling again when the outbox is drained.
+        lease (float): Seconds a claimed message stays invisible to other workers.
+    """
+
+    def __init__(
+        self: "OutboxWorker",
+        outbox_repo: OutboxRepository,
+        handlers: dict[str, Handler] | None = None,
+        batch_size: int = settings.outbox.outbox_batch_size,
+        max_attempts: int = settings.outbox.outbox_max_attempts,
+        base_delay: float = settings.outbox.outbox_base_delay,
+        max_delay: float = settings.outbox.outbox_max_delay,
+        poll_interval: float = settings.outbox.outbox_poll_interval,
+        lease: float = settings.outbox.outbox_lease,
+    ) -> None:
+        """Initialize a new instance of the `OutboxWorker` class.
+
+        Args:
+            outbox_repo (OutboxRepository): The repository to use for interacting with the outbox.
+            handlers (dict[str, Handler] | None): The delivery handler of every topic. Defaults to `HANDLERS`.
+            batch_size (int): The maximum number of messages claimed per poll.
+            max_attempts (int): The number of failed attempts after which a message is dead-lettered.
+            base_delay (float): Seconds before the first retry.
+            max_delay (float): The upper bound in seconds of the delay between two attempts.
+            poll_interval (float): Seconds to wait before polling again when the outbox is drained.
+            lease (float): Seconds a claimed message stays invisible to other workers.
+        """
+        self.outbox_repo: OutboxRepository = outbox_repo()
+        self.handlers = HANDLERS if handlers is None else handlers
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.poll_interval = poll_interval
+        self.lease = lease
+        self._stopping = asyncio.Event()
+
+    def backoff(self: "OutboxWorker", attempts: int) -> float:
+        """Compute the delay before the next attempt.
+
+        The delay doubles with every failed attempt up to `max_delay`, and its
+        upper half is randomized so that messages failing together do not retry together.
+
+        Args:
+            attempts (int): The number of failed attempts so far.
+
+        Returns:
+            float: The delay in seconds.
+        """
+        delay = min(self.max_delay, self.base_delay * 2 ** (attempts - 1))
+        return delay / 2 + random.uniform(0, delay / 2)
+
+    async def _deliver(self: "OutboxWorker", message: OutboxOrm) -> bool:
+        """Deliver a message and record a failure.
+
+        Returns:
+            bool: Whether the message was delivered.
+        """
+        handler = self.handlers.get(message.topic)
+        attempts = message.attempts + 1
+        try:
+            if handler is None:
+                raise LookupError(f"No handler for topic {message.topic!r}")
+            await handler(message.id, message.payload)
+            return True
+        except Exception as e:
+            retry_in = self.backoff(attempts) if handler is not None and attempts < self.max_attempts else None
+            if retry_in is None:
+                logger.error(f"outbox message {message.id} dead-lettered after {attempts} attempts. Error: {e}")
+            else:
+                logger.warning(f"outbox message {message.id} failed, retrying in {retry_in:.1f}s. Error: {e}")
+            await self.outbox_repo.mark_failed(message.id, attempts, repr(e), retry_in)
+            return False
+
+    async def run_once(self: "OutboxWorker") -> int:
+        """Claim and deliver one batch of due messages.
+
+        Returns:
+            int: The number of claimed messages.
+        """
+        messages = await self.outbox_repo.claim_batch(self.batch_size, self.lease)
+        if not messages:
+            return 0
+        delivered = await asyncio.gather(*(self._deliver(message) for message in messages))
+        await self.outbox_repo.mark_sent([message.id for message, ok in zip(messages, delivered) if ok])
+        logger.info(f"outbox > claimed={len(messages)} sent={sum(delivered)}")
+        return len(messages)
+
+    async def run(self: "OutboxWorker") -> None:
+        """Deliver messages until `stop` is called.
+
+        Full batches are followed by the next poll right away, so a backlog is
+        drained as fast as possible. The batch in flight is always finished
+        before returning, so stopping never loses the outcome of a delivery.
+        """
+        while not self._stopping.is_set():
+            try:
+                claimed = await self.run_once()
+            except Exception as e:
+                logger.error(f"outbox poll failed. Error: {e}")
+                claimed = 0
+            if claimed < self.batch_size:
+                try:
+                    await asyncio.wait_for(self._stopping.wait(), self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+
+    def stop(self: "OutboxWorker") -> None:
+        """Ask `run` to return after the batch in flight."""
+        self._stopping.set()
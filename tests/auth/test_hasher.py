@@ -0,0 +1,33 @@
+import asyncio
+
+import pytest
+
+from settings import settings
+from src.error import ServiceUnavailableError
+from src.utils.hasher import Hasher
+
+
+@pytest.fixture
+def hasher_pool(monkeypatch):
+    monkeypatch.setattr(settings.hasher, "hasher_workers", 1)
+    monkeypatch.setattr(settings.hasher, "hasher_max_queue", 1)
+    Hasher.start_pool()
+    yield Hasher
+    Hasher.shutdown_pool()
+
+
+async def test_verify_password_on_pool(hasher_pool):
+    hashed = await hasher_pool.aget_password_hash("secret")
+    assert await hasher_pool.averify_password("secret", hashed)
+    assert not await hasher_pool.averify_password("wrong", hashed)
+    assert hasher_pool.stats()["in_flight"] == 0
+
+
+async def test_saturated_pool_rejects(hasher_pool):
+    hashed = Hasher.get_password_hash("secret")
+    jobs = [asyncio.ensure_future(hasher_pool.averify_password("secret", hashed)) for _ in range(3)]
+    results = await asyncio.gather(*jobs, return_exceptions=True)
+    rejected = [r for r in results if isinstance(r, ServiceUnavailableError)]
+    assert len(rejected) == 1
+    assert rejected[0].status_code == 503
+    assert rejected[0].headers["Retry-After"] == str(settings.hasher.hasher_retry_after)
@@ -0,0 +1,59 @@
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+from jose import ExpiredSignatureError, JWTError
+
+from src.main import app
+from src.utils import jwt
+from src.utils.jwt import TokenEngine, create_access_token, get_tokens, jwt_decode
+
+BACKENDS = ["jose"] + (["pyjwt"] if jwt.pyjwt is not None else [])
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_engine_round_trip(backend):
+    engine = TokenEngine("secret", "HS256", backend=backend)
+    token = engine.encode({"sub": "misha", "exp": int(time.time()) + 60})
+    assert engine.decode(token)["sub"] == "misha"
+    with pytest.raises(JWTError):
+        TokenEngine("other", "HS256", backend=backend).decode(token)
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_engine_rejects_expired_token(backend):
+    engine = TokenEngine("secret", "HS256", backend=backend)
+    with pytest.raises(ExpiredSignatureError):
+        engine.decode(engine.encode({"sub": "misha", "exp": int(time.time()) - 1}))
+
+
+def test_cached_claims_do_not_outlive_exp(monkeypatch):
+    engine = TokenEngine("secret", "HS256", backend="jose")
+    token = engine.encode({"sub": "misha", "exp": int(time.time()) + 60})
+    engine.decode(token)["sub"] = "mutated"
+    assert engine.decode(token)["sub"] == "misha"
+    assert engine.cache.hits == 1
+
+    later = time.time() + 61
+    monkeypatch.setattr(time, "time", lambda: later)
+    with pytest.raises(ExpiredSignatureError):
+        engine.decode(token)
+
+
+def test_refresh_only_accepts_refresh_tokens():
+    client = TestClient(app)
+    tokens = get_tokens("misha")
+    email_token = create_access_token({"username": "misha", "email": "misha@test.com"})
+
+    for token in (tokens["access_token"], email_token):
+        assert client.post("/auth/refresh", json={"refresh_token": token}).status_code == 401
+
+    response = client.post("/auth/refresh", json={"refresh_token": tokens["refresh_token"]})
+    assert response.status_code == 200
+    assert jwt_decode(response.json()["refresh_token"])["sub"] == "misha"
+
+
+def test_refresh_still_accepts_a_whole_token_pair():
+    client = TestClient(app)
+    response = client.post("/auth/refresh", json=get_tokens("misha"))
+    assert response.status_code == 200
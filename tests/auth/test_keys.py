@@ -0,0 +1,102 @@
+import datetime
+import json
+import os
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+from jose import JWTError, jwt
+
+from src.main import app
+from src.utils import jwt as jwt_utils
+from src.utils.jwt import TokenEngine
+from src.utils.keys import KeyRing, rotate_manifest
+
+client = TestClient(app)
+
+NOW = datetime.datetime.now(datetime.timezone.utc)
+
+
+@pytest.fixture
+def manifest(tmp_path):
+    path = str(tmp_path / "keys.json")
+    day, hour = datetime.timedelta(days=1), datetime.timedelta(hours=1)
+    old = rotate_manifest(path, "ES256", NOW - 2 * day, day, kid="old")
+    current = rotate_manifest(path, "ES256", NOW - day, hour, kid="cur")
+    upcoming = rotate_manifest(path, "ES256", NOW + hour, day, kid="new")
+    assert (old, current, upcoming) == ("old", "cur", "new")
+    return path
+
+
+def test_key_ring_follows_rotation_schedule(manifest):
+    ring = KeyRing.from_manifest(manifest)
+    assert ring.signing_key(NOW).kid == "cur"
+    assert ring.signing_key(NOW + datetime.timedelta(hours=2)).kid == "new"
+    assert ring.verification_key("old", NOW) is None
+    assert [key["kid"] for key in ring.jwks(NOW)["keys"]] == ["cur", "new"]
+
+
+def test_tokens_verify_locally_with_published_keys(manifest, monkeypatch):
+    engine = TokenEngine("", "", backend="jose", keyring=KeyRing.from_manifest(manifest))
+    monkeypatch.setattr(jwt_utils, "_token_engine", engine)
+    token = engine.encode({"sub": "misha", "exp": int(time.time()) + 60})
+    assert jwt.get_unverified_header(token)["kid"] == "cur"
+
+    response = client.get("/.well-known/jwks.json")
+    assert response.status_code == 200
+    assert response.headers["cache-control"] == "public, max-age=300"
+    assert jwt.decode(token, response.json(), algorithms=["ES256"])["sub"] == "misha"
+
+    revalidated = client.get("/.well-known/jwks.json", headers={"If-None-Match": response.headers["etag"]})
+    assert revalidated.status_code == 304
+
+
+def test_token_with_unknown_kid_is_rejected(manifest):
+    engine = TokenEngine("", "", backend="jose", keyring=KeyRing.from_manifest(manifest))
+    forged = jwt.encode({"sub": "misha"}, "secret", algorithm="HS256", headers={"kid": "old"})
+    with pytest.raises(JWTError):
+        engine.decode(forged)
+
+
+def test_engine_reloads_the_manifest_when_it_changes(manifest):
+    engine = TokenEngine("", "", backend="jose", keys_file=manifest, reload_interval=0)
+    token = engine.encode({"sub": "misha", "exp": int(time.time()) + 60})
+    assert engine.decode(token)["sub"] == "misha"
+
+    rotate_manifest(manifest, "ES256", NOW - datetime.timedelta(minutes=1), datetime.timedelta(0), kid="next")
+    with open(manifest) as f:
+        keys = json.load(f)
+    for entry in keys["keys"]:
+        if entry["kid"] == "cur":
+            entry["not_after"] = (NOW - datetime.timedelta(seconds=1)).isoformat()
+    with open(manifest, "w") as f:
+        json.dump(keys, f)
+    os.utime(manifest, ns=(time.time_ns(), time.time_ns() + 1_000_000_000))
+
+    assert jwt.get_unverified_header(engine.encode({"sub": "misha"}))["kid"] == "next"
+    assert "cur" not in [key["kid"] for key in engine.jwks()["keys"]]
+    with pytest.raises(JWTError):
+        engine.decode(token)
+
+
+def test_rotation_refuses_to_reuse_a_kid(manifest, tmp_path):
+    with open(manifest) as f:
+        before = f.read()
+    pem = (tmp_path / "cur.pem").read_bytes()
+
+    with pytest.raises(ValueError):
+        rotate_manifest(manifest, "ES256", NOW, datetime.timedelta(hours=1), kid="cur")
+    (tmp_path / "orphan.pem").write_bytes(b"")
+    with pytest.raises(FileExistsError):
+        rotate_manifest(manifest, "ES256", NOW, datetime.timedelta(hours=1), kid="orphan")
+
+    with open(manifest) as f:
+        assert f.read() == before
+    assert (tmp_path / "cur.pem").read_bytes() == pem
+    assert sorted(path.name for path in tmp_path.iterdir()) == [
+        "cur.pem",
+        "keys.json",
+        "new.pem",
+        "old.pem",
+        "orphan.pem",
+    ]
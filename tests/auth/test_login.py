@@ -0,0 +1,63 @@
+import uuid
+
+import pytest
+
+from src.cache import Cache
+from src.models.users import Role
+from src.repositories.users import AUTH_QUERY, AuthRecord
+from src.services.users import UsersService
+from src.utils.hasher import Hasher
+
+
+class StubUsersRepository:
+    records = {}
+
+    async def find_auth_record(self, username):
+        return self.records.get(username)
+
+
+@pytest.fixture
+def service(monkeypatch):
+    store = {}
+
+    async def aget(key, timeout=None):
+        return store.get(key)
+
+    async def aset(key, value, ex=None, timeout=None):
+        store[key] = value
+        return True
+
+    async def averify_password(plain_password, hashed_password):
+        return plain_password == hashed_password
+
+    monkeypatch.setattr(Cache, "aget", aget)
+    monkeypatch.setattr(Cache, "aset", aset)
+    monkeypatch.setattr(Hasher, "averify_password", averify_password)
+    StubUsersRepository.records = {
+        name: AuthRecord(uuid.uuid4(), name, "secret", disabled, Role.USER)
+        for name, disabled in (("misha", False), ("anna", True))
+    }
+    yield UsersService(StubUsersRepository), store
+
+
+def test_auth_query_reads_only_the_login_columns():
+    assert AUTH_QUERY == 'SELECT user_id, username, hashed_password, disabled, role FROM "user" WHERE username = $1'
+    assert not hasattr(AuthRecord(*[None] * 5), "__dict__")
+
+
+async def test_login_reads_the_record_and_caches_it(service):
+    service, store = service
+    user = await service.get_auth_user("misha", "secret")
+    assert user.username == "misha" and user.role is Role.USER
+    assert await service.get_auth_user("misha", "wrong") is None
+    assert await service.get_auth_user("nobody", "secret") is None
+
+    StubUsersRepository.records.clear()
+    assert Cache.key("auth", "misha") in store
+    assert (await service.get_auth_user("misha", "secret")).user_id == user.user_id
+
+
+async def test_disabled_users_can_not_log_in(service):
+    service, store = service
+    assert await service.get_auth_user("anna", "secret") is None
+    assert store == {}
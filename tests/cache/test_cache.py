@@ -0,0 +1,52 @@
+import asyncio
+
+from settings import settings
+from src.cache import Cache, LocalCache
+
+
+async def test_connect_configures_pool():
+    await Cache.connect()
+    try:
+        stats = Cache.pool_stats()
+        assert stats["max_connections"] == settings.redis.redis_max_connections
+        assert stats["in_use"] == 0
+    finally:
+        await Cache.disconnect()
+    assert Cache.pool_stats()["max_connections"] == 0
+
+
+async def test_execute_timeout_is_a_miss():
+    result = await Cache._execute("sleep", asyncio.sleep(1, result="late"), timeout=0.01, default="miss")
+    assert result == "miss"
+
+
+def test_local_cache_evicts_least_recently_used():
+    cache = LocalCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert (cache.hits, cache.misses) == (3, 1)
+
+
+def test_local_cache_expires_entries():
+    cache = LocalCache(maxsize=2, ttl=0)
+    cache.set("a", 1)
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_key_is_namespaced_and_versioned():
+    key = Cache.key("user", "42")
+    assert key == f"{settings.cache.cache_prefix}:v{settings.cache.cache_version}:user:42"
+
+
+def test_ttl_jitter_stays_in_bounds():
+    ttls = {Cache.ttl(100) for _ in range(200)}
+    jitter = 100 * settings.cache.cache_ttl_jitter
+    assert all(100 - jitter <= ttl <= 100 + jitter for ttl in ttls)
+    assert len(ttls) > 1
+    assert Cache.ttl(0) == 1
@@ -0,0 +1,77 @@
+import asyncio
+
+import pytest
+from sqlalchemy.exc import IntegrityError
+
+from src.cache import MemoryRedis
+from src.models.outbox import OutboxStatus
+from src.models.users import Role
+from src.repositories.memory import InMemoryOutboxRepository, InMemoryUsersRepository, tables
+
+
+def make_user(name, email=None):
+    return {"name": name, "email": email or f"{name}@test.com", "username": name, "hashed_password": "hash"}
+
+
+@pytest.fixture
+def repo():
+    for table in tables.values():
+        table.clear()
+    return InMemoryUsersRepository()
+
+
+async def test_rows_get_defaults_and_unique_columns_are_enforced(repo):
+    user = await repo.add_one(make_user("misha"))
+    assert user.role is Role.USER and user.disabled is False and user.register_at is not None
+    with pytest.raises(IntegrityError):
+        await repo.add_one(make_user("misha", "other@test.com"))
+    created = await repo.add_many([make_user("anna"), make_user("boris", "misha@test.com")], key="username")
+    assert [user and user.username for user in created] == ["anna", None]
+    assert await repo.existing_values("email", ["misha@test.com", "new@test.com"]) == {"misha@test.com"}
+    assert await repo.count() == 2 and await repo.exists({"username": "anna"})
+
+
+async def test_update_delete_and_pages(repo):
+    for name in ("anna", "boris", "misha"):
+        await repo.add_one(make_user(name))
+    with pytest.raises(IntegrityError):
+        await repo.update_one({"username": "anna"}, {"email": "boris@test.com"})
+    updated = await repo.update_one({"username": "anna"}, {"email": "anna@new.com"})
+    assert updated.email == "anna@new.com"
+    assert await repo.find_one({"email": "anna@test.com"}) is None
+    assert (await repo.find_auth_record("anna")).hashed_password == "hash"
+
+    first, cursor = await repo.find_page(order_by=("username",), limit=2)
+    second, last = await repo.find_page(order_by=("username",), limit=2, after=cursor)
+    assert [user.username for user in first + second] == ["anna", "boris", "misha"] and last is None
+
+    deleted = await repo.delete_one({"user_id": first[0].user_id})
+    assert deleted.username == "anna" and await repo.delete_one({"username": "anna"}) is None
+    assert [batch async for batch in repo.stream_rows(["username"], batch_size=1)] == [(("boris",),), (("misha",),)]
+
+
+async def test_outbox_messages_are_claimed_once(repo):
+    outbox = InMemoryOutboxRepository()
+    await outbox.enqueue("topic", [{"n": 1}, {"n": 2}])
+    claimed = await outbox.claim_batch(limit=10, lease_seconds=60)
+    assert [message.payload for message in claimed] == [{"n": 1}, {"n": 2}]
+    assert await outbox.claim_batch(limit=10, lease_seconds=60) == []
+    await outbox.mark_sent([claimed[0].id])
+    await outbox.mark_failed(claimed[1].id, attempts=8, error="boom", retry_in=None)
+    statuses = {row["payload"]["n"]: row["status"] for row in outbox.table.rows.values()}
+    assert statuses == {1: OutboxStatus.SENT, 2: OutboxStatus.DEAD}
+
+
+async def test_memory_redis_expires_and_publishes():
+    client = MemoryRedis()
+    await client.set("key", 1, ex=60)
+    await client.set("gone", "x", ex=-1)
+    assert await client.get("key") == "1" and await client.get("gone") is None
+    assert await client.delete("key", "missing") == 1
+
+    async with client.pubsub() as pubsub:
+        await pubsub.subscribe("channel")
+        assert await client.publish("channel", "hello") == 1
+        message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=1)
+        assert message["data"] == "hello"
+        assert await asyncio.wait_for(pubsub.get_message(timeout=0.01), 1) is None
@@ -0,0 +1,77 @@
+import logging
+from types import SimpleNamespace
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from settings import settings
+from src.database import QueryStats, _end_query, _start_query, engine, normalize_sql, query_stats, record_query
+from src.metrics import registry
+from src.middleware import MetricsMiddleware
+
+
+def test_normalize_sql_replaces_values():
+    statement = """
+        SELECT users.user_id FROM users
+        WHERE users.username = 'anna' AND users.user_id IN ($1, $2, $3) LIMIT 50 OFFSET $4
+    """
+
+    assert normalize_sql(statement) == (
+        "SELECT users.user_id FROM users WHERE users.username = ? AND users.user_id IN (...) LIMIT ? OFFSET $4"
+    )
+
+
+def test_engine_events_attach_statements_to_the_current_request():
+    assert event.contains(engine.sync_engine, "before_cursor_execute", _start_query)
+    assert event.contains(engine.sync_engine, "after_cursor_execute", _end_query)
+
+    stats = QueryStats()
+    token = query_stats.set(stats)
+    try:
+        for _ in range(2):
+            context = SimpleNamespace()
+            _start_query(None, None, "SELECT users.name FROM users", {}, context, False)
+            _end_query(None, None, "SELECT users.name FROM users", {}, context, False)
+    finally:
+        query_stats.reset(token)
+
+    assert stats.count == 2
+    assert stats.duration > 0
+    assert stats.statements == {"SELECT users.name FROM users": 2}
+
+
+def test_slow_queries_are_logged_normalized(monkeypatch, caplog):
+    monkeypatch.setattr(settings.db, "db_slow_query_ms", 100)
+
+    with caplog.at_level(logging.WARNING, logger="src.database"):
+        record_query("SELECT * FROM users WHERE username = 'anna'", 0.05)
+        record_query("SELECT * FROM users WHERE username = 'anna'", 0.25)
+
+    assert [record.statement for record in caplog.records] == ["SELECT * FROM users WHERE username = ?"]
+    assert caplog.records[0].duration_ms == 250.0
+
+
+def test_middleware_records_db_time_and_repeated_queries(monkeypatch, caplog):
+    monkeypatch.setattr(settings.db, "db_repeated_query_threshold", 3)
+    api = FastAPI()
+
+    @api.get("/teams/{team_id}")
+    async def team(team_id: int):
+        record_query("SELECT * FROM teams WHERE team_id = $1", 0.001)
+        for member_id in range(4):
+            record_query(f"SELECT * FROM users WHERE user_id = {member_id}", 0.001)
+        return {}
+
+    api.add_middleware(MetricsMiddleware)
+    with caplog.at_level(logging.WARNING, logger="src.middleware"):
+        TestClient(api).get("/teams/1")
+
+    body = registry.render()
+    assert 'http_request_db_queries_count{method="GET",route="/teams/{team_id}"} 1' in body
+    assert 'http_request_db_queries_sum{method="GET",route="/teams/{team_id}"} 5' in body
+    assert 'http_request_db_duration_seconds_count{method="GET",route="/teams/{team_id}"} 1' in body
+    assert 'db_repeated_queries_total{method="GET",route="/teams/{team_id}"}' in body
+    assert [(record.statement, record.executions) for record in caplog.records] == [
+        ("SELECT * FROM users WHERE user_id = ?", 4)
+    ]
@@ -0,0 +1,143 @@
+import datetime
+import uuid
+
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Session
+
+from src.api.dependencies import users_service
+from src.main import app
+from src.models.users import UserOrm
+from src.repositories.users import UsersRepository
+from src.services.users import UsersService
+from src.utils.unitofwork import UnitOfWork
+
+client = TestClient(app)
+
+
+class FakeSession:
+    def __init__(self, row=None):
+        self.row = row
+        self.statements = []
+
+    async def execute(self, statement, params=None):
+        self.statements.append(str(statement.compile(dialect=postgresql.dialect())))
+        return FakeResult(self.row)
+
+    async def flush(self):
+        pass
+
+    async def rollback(self):
+        pass
+
+    async def close(self):
+        pass
+
+
+class FakeResult:
+    def __init__(self, row):
+        self.row = row
+
+    def one_or_none(self):
+        return self.row
+
+    def scalar(self):
+        return self.row is not None
+
+
+async def test_delete_one_is_a_single_returning_statement():
+    session = FakeSession()
+    async with UnitOfWork(lambda: session):
+        assert await UsersRepository().delete_one({"user_id": uuid.uuid4()}) is None
+    assert len(session.statements) == 1
+    assert session.statements[0].startswith('DELETE FROM "user" WHERE')
+    assert 'RETURNING "user".user_id' in session.statements[0]
+
+
+async def test_update_one_and_exists_are_single_statements():
+    session = FakeSession(row="user")
+    async with UnitOfWork(lambda: session):
+        repo = UsersRepository()
+        assert await repo.update_one({"username": "misha"}, {"disabled": True}) == "user"
+        assert await repo.exists({"username": "misha"}) is True
+    update, exists = session.statements
+    assert update.startswith('UPDATE "user" SET disabled=') and "RETURNING" in update
+    assert exists.startswith("SELECT EXISTS (SELECT")
+
+
+async def test_missing_id_is_none_on_update_and_delete():
+    session = FakeSession()
+    async with UnitOfWork(lambda: session):
+        repo = UsersRepository()
+        assert await repo.update_one({"user_id": uuid.uuid4()}, {"name": "Anna"}) is None
+        assert await repo.delete_one({"user_id": uuid.uuid4()}) is None
+        service = UsersService(UsersRepository)
+        assert await service.update_user({"user_id": uuid.uuid4()}, {"name": "Anna"}) is None
+        assert await service.delete_user(uuid.uuid4()) is None
+    assert len(session.statements) == 4
+    assert all('RETURNING "user".user_id' in statement for statement in session.statements)
+
+
+class SQLiteSession:
+    def __init__(self):
+        engine = create_engine("sqlite://")
+        UserOrm.__table__.create(engine)
+        self.session = Session(engine)
+
+    async def execute(self, statement, params=None):
+        return self.session.execute(statement, params)
+
+    async def flush(self):
+        self.session.flush()
+
+    async def rollback(self):
+        self.session.rollback()
+
+    async def close(self):
+        self.session.close()
+
+
+async def test_update_returns_the_new_values_of_a_row_loaded_in_the_unit_of_work():
+    session = SQLiteSession()
+    user_id = uuid.uuid4()
+    session.session.add(
+        UserOrm(
+            user_id=user_id,
+            name="Anna",
+            email="anna@test.com",
+            username="anna",
+            hashed_password="x",
+            register_at=datetime.datetime.now(datetime.UTC),
+        )
+    )
+    session.session.flush()
+    async with UnitOfWork(lambda: session):
+        repo = UsersRepository()
+        loaded = await repo.find_one({"user_id": user_id})
+        updated = await repo.update_one({"user_id": user_id}, {"name": "Boris"})
+        assert updated is not loaded
+        assert (updated.user_id, updated.name, updated.username) == (user_id, "Boris", "anna")
+        deleted = await repo.delete_one({"user_id": user_id})
+        assert deleted.name == "Boris"
+        assert await repo.find_one({"user_id": user_id}) is None
+
+
+def test_missing_user_is_not_found():
+    class StubUsersRepository:
+        async def delete_one(self, filter_by):
+            return None
+
+        async def update_one(self, filter_by, data):
+            return None
+
+    app.dependency_overrides[users_service] = lambda: UsersService(StubUsersRepository)
+    try:
+        user_id = uuid.uuid4()
+        deleted = client.delete(f"/users/{user_id}/")
+        updated = client.patch(f"/users/{user_id}/", json={"name": "Anna"})
+    finally:
+        del app.dependency_overrides[users_service]
+    assert deleted.status_code == 404
+    assert updated.status_code == 404
+    assert deleted.json()["detail"]["detail"] == "User not found"
@@ -0,0 +1,39 @@
+import uuid
+
+from fastapi.testclient import TestClient
+
+from src.main import app
+from src.repositories.users import UsersRepository
+from src.utils.statements import StatementCache, statement_cache
+
+
+def test_statements_are_cached_per_shape():
+    statement_cache.clear()
+    first, params = UsersRepository._statement("find", {"user_id": uuid.UUID(int=1)})
+    second, _ = UsersRepository._statement("find", {"user_id": uuid.UUID(int=2)})
+    other, _ = UsersRepository._statement("find", {"username": "misha"})
+    assert first is second and first is not other
+    assert params == {"filter_user_id": uuid.UUID(int=1)}
+    assert (statement_cache.hits, statement_cache.misses) == (1, 2)
+
+
+def test_null_filters_and_updated_columns_are_part_of_the_shape():
+    is_null, params = UsersRepository._statement("find", {"role": None})
+    assert "IS NULL" in str(is_null) and params == {}
+    update, params = UsersRepository._statement("update", {"email": "a@test.com"}, {"email": "b@test.com"})
+    assert params == {"filter_email": "a@test.com", "value_email": "b@test.com"}
+    assert update is not UsersRepository._statement("update", {"email": "a@test.com"}, {"name": "Anna"})[0]
+
+
+def test_least_recently_used_statement_is_evicted():
+    cache = StatementCache(maxsize=2)
+    built = []
+    for key in ("a", "b", "a", "c", "b"):
+        cache.get(key, lambda: built.append(key) or object())
+    assert built == ["a", "b", "c", "b"]
+    assert len(cache) == 2
+
+
+def test_statement_cache_is_exported():
+    body = TestClient(app).get("/metrics").text
+    assert 'statement_cache_requests_total{result="hit"}' in body
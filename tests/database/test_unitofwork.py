@@ -0,0 +1,60 @@
+from src.repositories.users import UsersRepository
+from src.utils.unitofwork import UnitOfWork, after_commit, current_uow
+
+
+class FakeSession:
+    def __init__(self):
+        self.calls = []
+
+    async def execute(self, statement, params=None):
+        self.calls.append("execute")
+        return FakeResult()
+
+    async def flush(self):
+        self.calls.append("flush")
+
+    async def commit(self):
+        self.calls.append("commit")
+
+    async def rollback(self):
+        self.calls.append("rollback")
+
+    async def close(self):
+        self.calls.append("close")
+
+
+class FakeResult:
+    def one_or_none(self):
+        return "user"
+
+
+def recorder(calls, name):
+    async def callback():
+        calls.append(name)
+
+    return callback
+
+
+async def test_repositories_share_the_session_and_leave_the_commit():
+    invalidated = []
+    async with UnitOfWork(FakeSession) as uow:
+        repo = UsersRepository()
+        async with UnitOfWork() as inner:
+            assert await repo.update_one({"username": "misha"}, {"disabled": True}) == "user"
+            await after_commit(recorder(invalidated, "misha"))
+            await inner.commit()
+        await repo.update_one({"username": "anna"}, {"disabled": True})
+        assert uow.session.calls == ["execute", "flush", "execute", "flush"]
+        assert invalidated == []
+        await uow.commit()
+        assert invalidated == ["misha"]
+    assert uow.session.calls[-3:] == ["commit", "rollback", "close"]
+    assert current_uow.get() is None
+
+
+async def test_uncommitted_work_is_rolled_back():
+    invalidated = []
+    async with UnitOfWork(FakeSession) as uow:
+        await after_commit(recorder(invalidated, "misha"))
+    assert uow.session.calls == ["rollback", "close"]
+    assert invalidated == []
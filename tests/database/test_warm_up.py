@@ -0,0 +1,41 @@
+from contextlib import asynccontextmanager
+
+from src import database
+from src.repositories.users import UsersRepository
+
+
+class FakeConnection:
+    def __init__(self, executed):
+        self.executed = executed
+
+    async def execute(self, statement):
+        self.executed.append(str(statement))
+
+    async def rollback(self):
+        pass
+
+
+class FakeEngine:
+    def __init__(self, fail_after):
+        self.opened = 0
+        self.fail_after = fail_after
+        self.executed = []
+
+    @asynccontextmanager
+    async def connect(self):
+        self.opened += 1
+        if self.opened > self.fail_after:
+            raise ConnectionError("database is down")
+        yield FakeConnection(self.executed)
+
+
+async def test_warm_up_primes_hot_statements(monkeypatch):
+    engine = FakeEngine(fail_after=2)
+    monkeypatch.setattr(database, "engine", engine)
+    monkeypatch.setattr(database.settings.db, "db_pool_size", 3)
+    statements = UsersRepository.warmup_statements()
+
+    assert await database.warm_up(10, statements) == 2
+    assert engine.opened == 3
+    assert len(engine.executed) == 2 * (len(statements) + 1)
+    assert any('WHERE "user".username = ' in sql for sql in engine.executed)
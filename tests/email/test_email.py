@@ -0,0 +1,60 @@
+import asyncio
+import socket
+
+import pytest
+from aiosmtpd.controller import Controller
+
+from settings import settings
+from src.services.email import EmailService
+
+
+class RecordingHandler:
+    def __init__(self):
+        self.messages = []
+        self.peers = set()
+
+    async def handle_DATA(self, server, session, envelope):
+        self.messages.append(envelope)
+        self.peers.add(session.peer)
+        return "250 OK"
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@pytest.fixture
+async def smtp_server(monkeypatch):
+    handler = RecordingHandler()
+    controller = Controller(handler, hostname="127.0.0.1", port=free_port())
+    controller.start()
+    monkeypatch.setattr(settings.smtp, "email_host", controller.hostname)
+    monkeypatch.setattr(settings.smtp, "email_port", controller.port)
+    monkeypatch.setattr(settings.smtp, "email_use_tls", False)
+    monkeypatch.setattr(settings.smtp, "email_pool_size", 2)
+    yield handler
+    await EmailService.close_pool()
+    controller.stop()
+
+
+async def test_send_email_reuses_pooled_connections(smtp_server):
+    await asyncio.gather(*(EmailService.send_email(f"user{i}", f"user{i}@test.com") for i in range(10)))
+    assert sorted(envelope.rcpt_tos[0] for envelope in smtp_server.messages) == sorted(
+        f"user{i}@test.com" for i in range(10)
+    )
+    assert len(smtp_server.peers) <= 2
+
+
+async def test_send_email_reconnects_after_disconnect(smtp_server):
+    await EmailService.send_email("misha", "misha@test.com")
+    for smtp in EmailService.get_pool()._idle:
+        smtp.transport.close()
+    await EmailService.send_email("anna", "anna@test.com")
+    assert [envelope.rcpt_tos for envelope in smtp_server.messages] == [["misha@test.com"], ["anna@test.com"]]
+
+
+async def test_send_email_sets_stable_message_id(smtp_server):
+    await EmailService.send_email("misha", "misha@test.com", message_id="42")
+    assert b"Message-ID: <42@example.com>" in smtp_server.messages[0].content
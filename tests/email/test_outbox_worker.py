@@ -0,0 +1,80 @@
+import uuid
+from types import SimpleNamespace
+
+import pytest
+
+from src.worker import OutboxWorker
+
+
+def make_message(topic="verification_email", attempts=0):
+    return SimpleNamespace(id=uuid.uuid4(), topic=topic, payload={"username": "misha"}, attempts=attempts)
+
+
+class StubOutboxRepository:
+    def __init__(self):
+        self.due = []
+        self.sent = []
+        self.failed = []
+
+    async def claim_batch(self, limit, lease_seconds):
+        batch, self.due = self.due[:limit], self.due[limit:]
+        return batch
+
+    async def mark_sent(self, message_ids):
+        self.sent.extend(message_ids)
+
+    async def mark_failed(self, message_id, attempts, error, retry_in):
+        self.failed.append((message_id, attempts, retry_in))
+
+
+@pytest.fixture
+def delivered():
+    return []
+
+
+@pytest.fixture
+def worker(delivered):
+    async def deliver(message_id, payload):
+        if payload.get("fail"):
+            raise ConnectionError("smtp down")
+        delivered.append(message_id)
+
+    return OutboxWorker(
+        StubOutboxRepository,
+        handlers={"verification_email": deliver},
+        batch_size=10,
+        max_attempts=3,
+        base_delay=10,
+        max_delay=30,
+    )
+
+
+async def test_run_once_marks_delivered_messages_sent(worker, delivered):
+    messages = [make_message() for _ in range(3)]
+    worker.outbox_repo.due = list(messages)
+    assert await worker.run_once() == 3
+    assert delivered == worker.outbox_repo.sent == [message.id for message in messages]
+
+
+async def test_failed_message_is_retried_with_backoff(worker):
+    message = make_message(attempts=1)
+    message.payload["fail"] = True
+    worker.outbox_repo.due = [message]
+    await worker.run_once()
+    [(message_id, attempts, retry_in)] = worker.outbox_repo.failed
+    assert (message_id, attempts) == (message.id, 2)
+    assert 10 <= retry_in <= 20
+    assert worker.outbox_repo.sent == []
+
+
+async def test_message_is_dead_lettered(worker):
+    exhausted = make_message(attempts=2)
+    exhausted.payload["fail"] = True
+    unknown = make_message(topic="unknown")
+    worker.outbox_repo.due = [exhausted, unknown]
+    await worker.run_once()
+    assert worker.outbox_repo.failed == [(exhausted.id, 3, None), (unknown.id, 1, None)]
+
+
+def test_backoff_is_capped(worker):
+    assert all(15 <= worker.backoff(attempts) <= 30 for attempts in range(3, 20))
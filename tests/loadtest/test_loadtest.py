@@ -0,0 +1,114 @@
+import asyncio
+import itertools
+import json
+import uuid
+
+import httpx
+import pytest
+
+from src.loadtest import LoginStorm, PaginatedReads, RefreshChurn, Scenario, percentile, run_scenario
+
+
+class FakeServer:
+    """Answer the load test requests like the API would, failing every `fail_every`th request."""
+
+    def __init__(self, fail_every=0):
+        self.fail_every = fail_every
+        self.requests = itertools.count(1)
+        self.users = []
+        self.logins = []
+
+    def __call__(self, request):
+        if self.fail_every and next(self.requests) % self.fail_every == 0:
+            return httpx.Response(500, json={"detail": "Internal Server Error"})
+        path = request.url.path
+        if path == "/users/bulk":
+            created = [{**user, "user_id": str(uuid.uuid4())} for user in json.loads(request.content)]
+            self.users.extend(created)
+            return httpx.Response(200, json={"created": created, "errors": []})
+        if path == "/auth/login":
+            self.logins.append(dict(httpx.QueryParams(request.content.decode()))["username"])
+            return httpx.Response(200, json={"access_token": "a", "refresh_token": str(uuid.uuid4())})
+        if path == "/auth/refresh":
+            return httpx.Response(200, json={"access_token": "a", "refresh_token": str(uuid.uuid4())})
+        if path == "/users":
+            cursor = request.url.params.get("cursor")
+            return httpx.Response(200, json={"items": [], "next_cursor": None if cursor else "next"})
+        return httpx.Response(200, json={})
+
+
+class Ping(Scenario):
+    name = "ping"
+
+    async def step(self):
+        return await self.client.get("/ping"), None
+
+
+def client(server):
+    return httpx.AsyncClient(transport=httpx.MockTransport(server), base_url="http://loadtest")
+
+
+def test_percentile():
+    values = [float(value) for value in range(1, 101)]
+
+    assert percentile(values, 50) == 50.0
+    assert percentile(values, 99) == 99.0
+    assert percentile(values, 100) == 100.0
+    assert percentile([], 50) == 0.0
+
+
+def test_back_to_back_requests_report_errors():
+    async def main():
+        async with client(FakeServer(fail_every=4)) as http:
+            return await run_scenario(Ping(http), duration=0.2, concurrency=4)
+
+    report = asyncio.run(main())
+
+    assert report["scenario"] == "ping"
+    assert report["requests"] > 0
+    assert report["errors"] == report["statuses"].get("500", 0) > 0
+    assert report["error_rate"] == pytest.approx(0.25, abs=0.01)
+    assert report["latency_ms"]["p50"] <= report["latency_ms"]["p99"] <= report["latency_ms"]["max"]
+
+
+def test_arrival_rate_starts_requests_at_the_rate():
+    async def main():
+        async with client(FakeServer()) as http:
+            return await run_scenario(Ping(http), duration=0.5, concurrency=10, rate=200)
+
+    report = asyncio.run(main())
+
+    assert 50 < report["requests"] < 150
+    assert report["errors"] == 0
+    assert report["rate"] == 200
+
+
+def test_login_storm_mixes_cached_and_first_logins():
+    server = FakeServer()
+
+    async def main():
+        async with client(server) as http:
+            scenario = LoginStorm(http, users=20, hit_ratio=0.5)
+            await scenario.setup()
+            return await run_scenario(scenario, duration=0.2, concurrency=2)
+
+    report = asyncio.run(main())
+
+    assert len(server.users) == 20
+    assert report["tags"]["hit"] > 0
+    assert report["tags"]["miss"] == 18
+    assert set(server.logins[:2]) == {user["username"] for user in server.users[:2]}
+
+
+def test_refresh_and_browse_scenarios():
+    async def main():
+        async with client(FakeServer()) as http:
+            refresh, browse = RefreshChurn(http, users=20), PaginatedReads(http, users=10)
+            await refresh.setup()
+            await browse.setup()
+            return await run_scenario(refresh, 0.1, 2), await run_scenario(browse, 0.1, 2)
+
+    refresh, browse = asyncio.run(main())
+
+    assert refresh["errors"] == browse["errors"] == 0
+    assert {"page", "lookup"} <= browse["tags"].keys()
@@ -0,0 +1,84 @@
+import json
+import logging
+import sys
+
+import pytest
+
+import logger
+from logger import DebugSampler, JsonFormatter, StructuredQueueHandler, setup_logging, shutdown_logging
+
+
+def record(level=logging.DEBUG, lineno=1, msg="message %s", args=("arg",), **extra):
+    record = logging.LogRecord("src.test", level, __file__, lineno, msg, args, None)
+    record.__dict__.update(extra)
+    return record
+
+
+def test_json_formatter_includes_extra_attributes():
+    entry = json.loads(JsonFormatter().format(record(level=logging.INFO, user_id="42")))
+
+    assert entry["level"] == "INFO"
+    assert entry["logger"] == "src.test"
+    assert entry["message"] == "message arg"
+    assert entry["user_id"] == "42"
+    assert "args" not in entry
+
+
+def test_debug_sampler_keeps_one_record_per_call_site_out_of_every():
+    sampler = DebugSampler(every=3)
+
+    kept = [sampler.filter(record(lineno=1)) for _ in range(6)]
+
+    assert kept == [True, False, False, True, False, False]
+    assert sampler.filter(record(lineno=2))
+    assert all(sampler.filter(record(level=logging.INFO)) for _ in range(3))
+
+
+def test_queue_handler_keeps_exception_apart_from_message():
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        prepared = StructuredQueueHandler(None).prepare(
+            logging.makeLogRecord({"msg": "failed", "exc_info": sys.exc_info()})
+        )
+
+    assert prepared.getMessage() == "failed"
+    assert prepared.exc_info is None
+    assert "ValueError: boom" in prepared.exc_text
+
+
+@pytest.fixture
+def fresh_logging(monkeypatch):
+    root = logging.getLogger()
+    handlers, level = root.handlers[:], root.level
+    shutdown_logging()
+    yield
+    shutdown_logging()
+    root.handlers[:] = handlers
+    root.setLevel(level)
+
+
+def test_setup_logging_writes_json_lines_through_the_listener(tmp_path, monkeypatch, fresh_logging):
+    monkeypatch.setattr(logger.settings.log, "log_levels", "src.test=DEBUG")
+    path = tmp_path / "app.log"
+    config = {
+        "version": 1,
+        "disable_existing_loggers": False,
+        "formatters": {"json": {"()": "logger.JsonFormatter"}},
+        "handlers": {
+            "file": {"class": "logging.FileHandler", "formatter": "json", "filename": str(path)},
+            "queue": {"class": "logger.StructuredQueueHandler", "handlers": ["file"]},
+        },
+        "loggers": {"src.test": {"handlers": ["queue"], "propagate": False}},
+    }
+
+    listeners = setup_logging(config)
+    assert len(listeners) == 1
+    assert setup_logging() is listeners
+    logging.getLogger("src.test").debug("user %s", "anna", extra={"request_id": "r1"})
+    shutdown_logging()
+
+    entry = json.loads(path.read_text())
+    assert entry["message"] == "user anna"
+    assert entry["request_id"] == "r1"
+    assert entry["level"] == "DEBUG"
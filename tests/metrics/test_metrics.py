@@ -0,0 +1,47 @@
+from types import SimpleNamespace
+
+from fastapi.testclient import TestClient
+
+from src.main import app
+from src.metrics import Counter, Histogram, Registry
+from src.middleware import _route_templates, route_template
+
+client = TestClient(app)
+
+
+def test_registry_renders_text_format():
+    registry = Registry()
+    latency = registry.register(Histogram("latency_seconds", "Latency.", ("route",), buckets=(0.1, 1)))
+    errors = registry.register(Counter("errors_total", "Errors."))
+    latency.labels('/a"b').observe(0.5)
+    latency.labels('/a"b').observe(5)
+    errors.inc()
+    assert registry.render().splitlines() == [
+        "# HELP latency_seconds Latency.",
+        "# TYPE latency_seconds histogram",
+        'latency_seconds_bucket{route="/a\\"b",le="0.1"} 0',
+        'latency_seconds_bucket{route="/a\\"b",le="1"} 1',
+        'latency_seconds_bucket{route="/a\\"b",le="+Inf"} 2',
+        'latency_seconds_sum{route="/a\\"b"} 5.5',
+        'latency_seconds_count{route="/a\\"b"} 2',
+        "# HELP errors_total Errors.",
+        "# TYPE errors_total counter",
+        "errors_total 1",
+    ]
+
+
+def test_metrics_endpoint_labels_requests_by_route():
+    client.get("/users/not-a-uuid/")
+    body = client.get("/metrics").text
+    assert 'http_request_duration_seconds_count{method="GET",route="/users/{user_id}/",status="422"}' in body
+    assert 'db_pool_connections{state="checked_out"} 0' in body
+    assert 'hasher_jobs{state="queued"} 0' in body
+
+
+def test_route_template_reads_the_matched_route_and_remembers_it():
+    client.get("/users/not-a-uuid/")
+    assert _route_templates["/users/not-a-uuid/"] == "/users/{user_id}/"
+
+    route = SimpleNamespace(path="/users/{user_id}/")
+    assert route_template({"path": "/users/another/", "route": route}) == "/users/{user_id}/"
+    assert route_template({"path": "/users/another/"}) == "/users/{user_id}/"
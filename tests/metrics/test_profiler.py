@@ -0,0 +1,90 @@
+import asyncio
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from settings import settings
+from src.main import app
+from src.middleware import ProfilerMiddleware
+from src.profiler import AWAIT, Profiler, profiler
+
+
+async def inner(event):
+    await event.wait()
+
+
+async def outer(event):
+    await inner(event)
+
+
+def test_profiler_samples_awaiting_and_running_requests():
+    sampler = Profiler(interval=3600)
+
+    async def running():
+        sampler.sample()
+
+    async def main():
+        event = asyncio.Event()
+        waiting = outer(event)
+        task = asyncio.ensure_future(waiting)
+        await asyncio.sleep(0)
+        key = sampler.register("GET /wait", waiting)
+        sampler.sample()
+        sampler.unregister(key)
+        event.set()
+        await task
+
+        coro = running()
+        key = sampler.register("GET /run", coro)
+        await coro
+        sampler.unregister(key)
+
+    asyncio.run(main())
+    stacks = sampler.collapsed().splitlines()
+
+    assert f"GET /wait;{__name__}:outer;{__name__}:inner;asyncio.locks:Event.wait;{AWAIT} 1" in stacks
+    assert any(
+        line.startswith(f"GET /run;{__name__}:test_profiler_samples_awaiting_and_running_requests.<locals>.running;")
+        for line in stacks
+    )
+
+
+def test_middleware_profiles_selected_routes():
+    sampler = Profiler(interval=0.001)
+    api = FastAPI()
+
+    @api.get("/slow")
+    async def slow():
+        await asyncio.sleep(0.05)
+        return {}
+
+    @api.get("/fast")
+    async def fast():
+        await asyncio.sleep(0.05)
+        return {}
+
+    api.add_middleware(ProfilerMiddleware, profiler=sampler, sample_rate=0, routes="/slow", token="secret")
+    with TestClient(api) as client:
+        client.get("/slow")
+        client.get("/fast", headers={"X-Profile-Token": "wrong"})
+    assert sampler.collapsed("GET /slow")
+    assert not sampler.collapsed("GET /fast")
+
+    with TestClient(api) as client:
+        client.get("/fast", headers={"X-Profile-Token": "secret"})
+    assert f";{AWAIT}" in sampler.collapsed("GET /fast")
+
+
+def test_profile_endpoint_requires_the_token(monkeypatch):
+    client = TestClient(app)
+    profiler.stacks["GET /users;src.api.users:get_users;[await]"] = 3
+
+    assert client.get("/debug/profile").status_code == 404
+
+    monkeypatch.setattr(settings.profile, "profile_token", "secret")
+    assert client.get("/debug/profile", headers={"X-Profile-Token": "wrong"}).status_code == 403
+
+    response = client.get("/debug/profile", params={"reset": True}, headers={"X-Profile-Token": "secret"})
+    assert response.status_code == 200
+    assert "GET /users;src.api.users:get_users;[await] 3\n" in response.text
+    assert not profiler.stacks
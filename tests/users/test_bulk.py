@@ -0,0 +1,67 @@
+import uuid
+from types import SimpleNamespace
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.api.dependencies import users_service
+from src.main import app
+from src.models.users import Role
+from src.services.users import UsersService
+
+client = TestClient(app)
+
+
+def make_user(name, email=None):
+    return {"name": name, "email": email or f"{name}@test.com", "username": name, "hashed_password": "password"}
+
+
+@pytest.fixture
+def stub_users_repo():
+    class StubUsersRepository:
+        stored = {"email": {"taken@test.com"}, "username": {"taken"}}
+
+        async def add_many(self, data, key, batch_size=500):
+            created = []
+            for row in data:
+                if any(row[field] in self.stored[field] for field in self.stored):
+                    created.append(None)
+                else:
+                    created.append(SimpleNamespace(user_id=uuid.uuid4(), role=Role.USER, **row))
+            return created
+
+        async def existing_values(self, column, values):
+            return {value for value in values if value in self.stored[column]}
+
+    class StubOutboxRepository:
+        queued = []
+
+        async def enqueue(self, topic, payloads):
+            self.queued.extend((topic, payload) for payload in payloads)
+
+    app.dependency_overrides[users_service] = lambda: UsersService(StubUsersRepository, StubOutboxRepository)
+    yield StubOutboxRepository.queued
+    app.dependency_overrides.pop(users_service)
+
+
+def test_bulk_create_reports_conflicts(stub_users_repo):
+    body = [
+        make_user("anna"),
+        make_user("taken", "fresh@test.com"),
+        make_user("boris", "taken@test.com"),
+        make_user("anna"),
+    ]
+    response = client.post("/users/bulk", json=body)
+    assert response.status_code == 200
+    data = response.json()
+    assert [user["username"] for user in data["created"]] == ["anna"]
+    assert [(error["index"], error["field"]) for error in data["errors"]] == [
+        (1, "username"),
+        (2, "email"),
+        (3, "email"),
+    ]
+    assert stub_users_repo == [("verification_email", {"username": "anna", "email": "anna@test.com"})]
+
+
+def test_bulk_create_requires_rows(stub_users_repo):
+    assert client.post("/users/bulk", json=[]).status_code == 422
@@ -0,0 +1,53 @@
+import json
+import uuid
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.api.dependencies import users_service
+from src.main import app
+from src.models.users import Role
+from src.services.users import UsersService
+
+client = TestClient(app)
+
+USER_ID = uuid.uuid4()
+
+
+@pytest.fixture
+def stub_users_repo():
+    class StubUsersRepository:
+        async def stream_rows(self, columns, filter_by=None, batch_size=1000):
+            row = {
+                "user_id": USER_ID,
+                "name": "Misha",
+                "email": "misha@test.com",
+                "username": "misha",
+                "role": Role.USER,
+            }
+            yield [tuple(row[column] for column in columns)]
+            yield [tuple(row[column] for column in columns)]
+
+    app.dependency_overrides[users_service] = lambda: UsersService(StubUsersRepository)
+    yield
+    app.dependency_overrides.pop(users_service)
+
+
+def test_export_ndjson(stub_users_repo):
+    response = client.get("/users/export", params={"columns": "user_id,role"})
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    lines = response.text.splitlines()
+    assert [json.loads(line) for line in lines] == [{"user_id": str(USER_ID), "role": "USER"}] * 2
+
+
+def test_export_csv_gzip(stub_users_repo):
+    response = client.get("/users/export", params={"format": "csv", "columns": "username,email", "gzip": True})
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.text.splitlines() == ["username,email", "misha,misha@test.com", "misha,misha@test.com"]
+
+
+def test_export_rejects_unknown_column(stub_users_repo):
+    response = client.get("/users/export", params={"columns": "hashed_password"})
+    assert response.status_code == 400
@@ -0,0 +1,47 @@
+import pytest
+
+from src.services.importer import ImportHeaderError, UsersImporter, csv_records
+
+
+async def stream(data, size):
+    for start in range(0, len(data), size):
+        yield data[start : start + size]
+
+
+class StubUsersRepository:
+    existing = {"taken"}
+    batches = []
+
+    async def copy_many(self, columns, records):
+        self.batches.append(list(records))
+        return sum(record[columns.index("username")] not in self.existing for record in records)
+
+
+async def test_csv_records_split_across_chunks():
+    data = 'name,note\r\n"Misha","multi\nline, ""quoted"""\r\nAnna,plain\n'.encode()
+    records = [record async for record in csv_records(stream(data, 3))]
+    assert records == [["name", "note"], ["Misha", 'multi\nline, "quoted"'], ["Anna", "plain"]]
+
+
+async def test_import_validates_and_batches():
+    rows = [
+        "name,email,username,hashed_password",
+        "Misha,misha@test.com,misha,hash",
+        "Anna,not-an-email,anna,hash",
+        "Boris,boris@test.com,taken,hash",
+        "Short,row",
+        "Vera,vera@test.com,vera,hash",
+    ]
+    progress = []
+    StubUsersRepository.batches = []
+    importer = UsersImporter(StubUsersRepository, batch_size=2, on_progress=lambda r: progress.append(r.inserted))
+    report = await importer.run(stream("\n".join(rows).encode(), 7))
+    assert (report.rows, report.inserted, report.skipped, report.rejected) == (5, 2, 1, 2)
+    assert [error.row for error in report.errors] == [2, 4]
+    assert [len(batch) for batch in StubUsersRepository.batches] == [2, 1]
+    assert progress == [1, 2]
+
+
+async def test_import_requires_header_columns():
+    with pytest.raises(ImportHeaderError):
+        await UsersImporter(StubUsersRepository).run(stream(b"name,email\n", 4))
@@ -0,0 +1,78 @@
+import uuid
+from types import SimpleNamespace
+
+import msgpack
+import pytest
+from fastapi.testclient import TestClient
+
+from src.api.dependencies import users_service
+from src.api.negotiation import MSGPACK, accepts_msgpack
+from src.cache import Cache
+from src.main import app
+from src.models.users import Role
+from src.services.users import UsersService
+
+client = TestClient(app)
+
+
+@pytest.fixture
+def stub_service(monkeypatch):
+    class StubUsersRepository:
+        async def add_one(self, data):
+            return SimpleNamespace(user_id=uuid.UUID(int=1), role=Role.USER, **data)
+
+        async def update_one(self, filter_by, data):
+            return SimpleNamespace(
+                user_id=filter_by["user_id"], name=data["name"], email="anna@test.com", username="anna", role=Role.USER
+            )
+
+    class StubOutboxRepository:
+        async def enqueue(self, topic, payloads):
+            pass
+
+    async def invalidate(*keys):
+        pass
+
+    monkeypatch.setattr(Cache, "invalidate", invalidate)
+    app.dependency_overrides[users_service] = lambda: UsersService(StubUsersRepository, StubOutboxRepository)
+    yield
+    app.dependency_overrides.pop(users_service)
+
+
+def test_msgpack_request_and_response(stub_service):
+    body = {"name": "Anna", "email": "anna@test.com", "username": "anna", "hashed_password": "password"}
+    response = client.post(
+        "/users",
+        content=msgpack.packb(body),
+        headers={"Content-Type": MSGPACK, "Accept": f"{MSGPACK}, application/json;q=0.5"},
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"] == MSGPACK
+    assert response.headers["vary"] == "Accept"
+    assert msgpack.unpackb(response.content) == {
+        "user_id": str(uuid.UUID(int=1)),
+        "name": "Anna",
+        "email": "anna@test.com",
+        "username": "anna",
+        "role": "USER",
+    }
+
+
+def test_json_remains_the_default(stub_service):
+    user_id = uuid.uuid4()
+    response = client.patch(f"/users/{user_id}/", json={"name": "Masha"})
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
+    assert response.json()["name"] == "Masha"
+
+    invalid = client.patch(f"/users/{user_id}/", content=msgpack.packb({"name": ""}), headers={"Content-Type": MSGPACK})
+    assert invalid.status_code == 422
+    assert client.post("/auth/refresh", content=b"\xc1", headers={"Content-Type": MSGPACK}).status_code == 400
+
+
+@pytest.mark.parametrize(
+    "accept, expected",
+    [("application/msgpack", True), ("application/json", False), ("application/msgpack;q=0", False), ("", False)],
+)
+def test_accepts_msgpack(accept, expected):
+    assert accepts_msgpack(accept) is expected
@@ -0,0 +1,55 @@
+import datetime
+import uuid
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.api.dependencies import users_service
+from src.main import app
+from src.models.users import Role
+from src.services.users import UsersService
+from src.utils.pagination import InvalidCursorError, decode_cursor, encode_cursor
+
+client = TestClient(app)
+
+
+def test_cursor_round_trip():
+    key = (datetime.datetime(2024, 4, 6, 19, 34, 42, 300283, tzinfo=datetime.timezone.utc), uuid.uuid4())
+    cursor = encode_cursor(key)
+    assert "=" not in cursor
+    assert decode_cursor(cursor, (datetime.datetime, uuid.UUID)) == key
+
+
+@pytest.mark.parametrize("cursor", ["not-a-cursor", encode_cursor(["x"]), encode_cursor(["x", "y"])])
+def test_invalid_cursor(cursor):
+    with pytest.raises(InvalidCursorError):
+        decode_cursor(cursor, (datetime.datetime, uuid.UUID))
+
+
+@pytest.fixture
+def stub_users_repo():
+    class StubUsersRepository:
+        calls = []
+
+        async def find_page(self, **kwargs):
+            self.calls.append(kwargs)
+            return [], None
+
+    app.dependency_overrides[users_service] = lambda: UsersService(StubUsersRepository)
+    yield StubUsersRepository
+    app.dependency_overrides.pop(users_service)
+
+
+def test_get_users_page_filters(stub_users_repo):
+    response = client.get("/users", params={"limit": 10, "role": "ADMIN", "disabled": "false"})
+    assert response.status_code == 200
+    assert response.json() == {"items": [], "next_cursor": None}
+    call = stub_users_repo.calls[-1]
+    assert call["limit"] == 10
+    assert call["after"] is None
+    assert call["filter_by"] == {"role": Role.ADMIN, "disabled": False}
+
+
+def test_get_users_page_rejects_bad_cursor(stub_users_repo):
+    assert client.get("/users", params={"cursor": "garbage"}).status_code == 400
+    assert client.get("/users", params={"limit": 10_000}).status_code == 422
@@ -0,0 +1,42 @@
+import uuid
+from types import SimpleNamespace
+
+from fastapi.responses import ORJSONResponse
+from fastapi.testclient import TestClient
+
+from src.api.dependencies import users_service
+from src.main import app
+from src.models.users import Role, UserOrm
+from src.schemas.users import SUser
+from src.services.users import UsersService
+from src.utils.responses import trusted
+
+client = TestClient(app)
+
+
+def test_trusted_response_matches_the_validated_one():
+    user = UserOrm(user_id=uuid.uuid4(), name="Misha", email="misha@test.com", username="misha", role=Role.ADMIN)
+    validated = SUser.model_validate(user).model_dump_json()
+    assert ORJSONResponse(trusted(SUser, user)).body == validated.encode()
+
+
+def test_users_page_is_built_from_rows():
+    row = SimpleNamespace(user_id=uuid.uuid4(), name="Anna", email="anna@test.com", username="anna", role=Role.USER)
+
+    class StubUsersRepository:
+        async def find_page(self, columns, **kwargs):
+            assert columns == tuple(SUser.model_fields)
+            return [row], None
+
+    app.dependency_overrides[users_service] = lambda: UsersService(StubUsersRepository)
+    try:
+        response = client.get("/users")
+    finally:
+        del app.dependency_overrides[users_service]
+    assert response.status_code == 200
+    assert response.json() == {
+        "items": [
+            {"user_id": str(row.user_id), "name": "Anna", "email": "anna@test.com", "username": "anna", "role": "USER"}
+        ],
+        "next_cursor": None,
+    }
@@ -0,0 +1,108 @@
+import uuid
+
+import pytest
+from pydantic import ValidationError
+
+from src.cache import Cache, local_cache
+from src.models.users import Role
+from src.services.users import UsersService
+
+USER = {"user_id": uuid.uuid4(), "name": "Misha", "email": "misha@test.com", "username": "misha", "role": Role.USER}
+
+
+class StubUsersRepository:
+    finds = 0
+
+    async def find_one(self, filter_by):
+        StubUsersRepository.finds += 1
+        return USER
+
+    async def update_one(self, filter_by, data):
+        return type("Row", (), USER)
+
+
+@pytest.fixture
+def redis_tier(monkeypatch):
+    store = {}
+    invalidated = []
+
+    async def aget(key, timeout=None):
+        return store.get(key)
+
+    async def aset(key, value, ex=None, timeout=None):
+        store[key] = value
+        return True
+
+    async def adelete(*keys, timeout=None):
+        return sum(store.pop(key, None) is not None for key in keys)
+
+    async def invalidate(*keys):
+        invalidated.extend(keys)
+        local_cache.delete(*keys)
+        for key in keys:
+            store.pop(key, None)
+
+    monkeypatch.setattr(Cache, "aget", aget)
+    monkeypatch.setattr(Cache, "aset", aset)
+    monkeypatch.setattr(Cache, "adelete", adelete)
+    monkeypatch.setattr(Cache, "invalidate", invalidate)
+    StubUsersRepository.finds = 0
+    local_cache.clear()
+    yield store, invalidated
+    local_cache.clear()
+
+
+async def test_get_user_reads_through_both_tiers(redis_tier):
+    store, _ = redis_tier
+    service = UsersService(StubUsersRepository)
+    first = await service.get_user({"user_id": USER["user_id"]})
+    second = await service.get_user({"user_id": USER["user_id"]})
+    assert first is second
+    assert StubUsersRepository.finds == 1
+    with pytest.raises(ValidationError):
+        first.name = "Boris"
+    assert Cache.key("user", USER["user_id"]) in store
+
+    local_cache.clear()
+    third = await service.get_user({"user_id": USER["user_id"]})
+    assert third == first
+    assert StubUsersRepository.finds == 1
+
+
+async def test_update_user_invalidates(redis_tier):
+    _, invalidated = redis_tier
+    service = UsersService(StubUsersRepository)
+    await service.get_user({"user_id": USER["user_id"]})
+    await service.update_user({"user_id": USER["user_id"]}, {"name": "Masha"})
+    assert invalidated == [Cache.key("user", USER["user_id"]), Cache.key("auth", "misha")]
+    await service.get_user({"user_id": USER["user_id"]})
+    assert StubUsersRepository.finds == 2
+
+
+async def test_invalidation_during_the_lookup_is_not_overwritten(redis_tier, monkeypatch):
+    store, _ = redis_tier
+    key = Cache.key("user", USER["user_id"])
+    service = UsersService(StubUsersRepository)
+
+    async def find_one_then_invalidate(filter_by):
+        StubUsersRepository.finds += 1
+        await Cache.invalidate(key)
+        return USER
+
+    monkeypatch.setattr(service.users_repo, "find_one", find_one_then_invalidate)
+    assert (await service.get_user({"user_id": USER["user_id"]})).name == "Misha"
+    assert key not in store
+    assert local_cache.get(key) is None
+
+    aset = Cache.aset
+
+    async def aset_after_invalidate(key, value, ex=None, timeout=None):
+        await Cache.invalidate(key)
+        return await aset(key, value, ex=ex)
+
+    monkeypatch.setattr(Cache, "aset", aset_after_invalidate)
+    monkeypatch.setattr(service.users_repo, "find_one", StubUsersRepository().find_one)
+    await service.get_user({"user_id": USER["user_id"]})
+    assert key not in store
+    assert local_cache.get(key) is None
+    assert StubUsersRepository.finds == 2